@@ -0,0 +1,87 @@
+"""
+기사 단위 추출 요약 (lead 문장 + 요약)
+
+수집 시점에 기사마다 한 번만 계산해 마크다운(`**요약**:` 줄)과 JSONL(`lead`, `summary` 필드)에
+저장합니다. 챗봇은 본문 중간 조각(청크) 대신 이 요약과 질문에 맞는 청크 문장만으로 프롬프트를
+만들어 입력 토큰을 줄입니다.
+
+요약 방식 (LLM 호출 없음)
+    - 문장 점수 = 제목 bigram 겹침 × 2 + 본문 중심성(문장 bigram의 기사 내 평균 빈도) + 위치 가중치
+    - 상위 문장을 원문 순서대로 SUMMARY_MAX_CHARS 안에서 이어 붙임
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Set
+
+SUMMARY_MAX_CHARS = 160
+LEAD_MAX_CHARS = 120
+SUMMARY_MAX_SENTENCES = 2
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+# 기자 서명·이메일·사진 설명 등 요약에 쓰지 않을 문장
+NOISE_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+|기자\s*=|^\[.*\]$|^\(.*\)$|무단\s*전재|재배포\s*금지|사진\s*제공")
+# 문장 앞 "[서울경제]", "[속보]" 같은 말머리
+LEADING_TAG_RE = re.compile(r"^(?:\[[^\]]{1,20}\]\s*)+")
+MIN_SENTENCE_CHARS = 15
+
+
+def split_sentences(text: str) -> List[str]:
+    """본문을 문장 단위로 나눕니다. 너무 짧거나 서명·저작권 문구인 문장은 제외합니다."""
+    sentences = []
+    for sentence in SENTENCE_SPLIT_RE.split(text or ""):
+        sentence = LEADING_TAG_RE.sub("", sentence.strip())
+        if len(sentence) >= MIN_SENTENCE_CHARS and not NOISE_RE.search(sentence):
+            sentences.append(sentence)
+    return sentences
+
+
+def _bigrams(text: str) -> Set[str]:
+    terms = set()
+    for word in text.lower().split():
+        word = "".join(ch for ch in word if ch.isalnum())
+        terms.update(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def _clip(text: str, max_chars: int) -> str:
+    return text if len(text) <= max_chars else text[:max_chars - 1].rstrip() + "…"
+
+
+def summarize_article(title: str, content: str) -> Dict[str, str]:
+    """기사 제목·본문으로 {"lead": 첫 문장, "summary": 추출 요약}을 만듭니다."""
+    sentences = split_sentences(content)
+    if not sentences:
+        return {"lead": "", "summary": ""}
+
+    lead = _clip(sentences[0], LEAD_MAX_CHARS)
+
+    title_terms = _bigrams(title)
+    sentence_terms = [_bigrams(sentence) for sentence in sentences]
+    frequency: Counter = Counter()
+    for terms in sentence_terms:
+        frequency.update(terms)
+    max_frequency = max(frequency.values()) if frequency else 1
+
+    scored = []
+    for position, (sentence, terms) in enumerate(zip(sentences, sentence_terms)):
+        if not terms:
+            continue
+        title_overlap = len(terms & title_terms) / len(title_terms) if title_terms else 0.0
+        centrality = sum(frequency[term] for term in terms) / (len(terms) * max_frequency)
+        position_weight = 1.0 / (1 + position)
+        scored.append((2 * title_overlap + centrality + position_weight, position))
+
+    chosen: List[int] = []
+    length = 0
+    for _, position in sorted(scored, reverse=True):
+        sentence_length = len(sentences[position]) + (1 if chosen else 0)
+        if chosen and length + sentence_length > SUMMARY_MAX_CHARS:
+            continue
+        chosen.append(position)
+        length += sentence_length
+        if len(chosen) >= SUMMARY_MAX_SENTENCES:
+            break
+
+    summary = " ".join(sentences[position] for position in sorted(chosen))
+    return {"lead": lead, "summary": _clip(summary, SUMMARY_MAX_CHARS)}
@@ -0,0 +1,166 @@
+"""
+S3 스트리밍 아티팩트 작성기
+
+기사를 하나씩 인코딩해 재사용하는 버퍼에 쌓고, 버퍼가 파트 크기(ARTIFACT_PART_SIZE_MB)에 도달하면
+S3 멀티파트 업로드의 파트로 올린 뒤 비웁니다. 파일 전체를 문자열로 이어 붙인 다음 다시 bytes로
+인코딩해 한 번에 올리던 방식과 달리 메모리에는 파트 하나 크기만 유지됩니다.
+
+버퍼(bytearray)는 복사하지 않고 그대로 요청 본문으로 넘긴 뒤 비워 다시 사용합니다.
+파트 크기에 도달하지 않은 작은 파일은 멀티파트 업로드 없이 put_object 한 번으로 올립니다.
+S3 멀티파트의 파트(마지막 제외)는 최소 5MB여야 하므로 파트 크기는 5MB 미만으로 내려가지 않습니다.
+
+쓰는 동안 내용의 SHA-256을 함께 계산합니다. previous_sha256(ArtifactManifest에 기록된 이전 업로드의 해시)과
+같으면 객체를 올리지 않고(이미 시작한 멀티파트 업로드는 취소) skipped로 표시합니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger()
+
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+ARTIFACT_PART_SIZE = max(S3_MIN_PART_SIZE, int(os.environ.get('ARTIFACT_PART_SIZE_MB', '8')) * 1024 * 1024)
+
+
+class S3StreamingWriter:
+    """
+    S3 객체 하나를 조각 단위로 쓰는 작성기. with 블록에서 예외가 나면 멀티파트 업로드를 취소합니다.
+
+        with S3StreamingWriter(s3_client, bucket, key, 'text/markdown; charset=utf-8') as writer:
+            writer.write(header)
+            for article in articles:
+                writer.write(render(article))
+    """
+
+    def __init__(self, s3_client, bucket: str, key: str, content_type: str,
+                 metadata: Optional[Dict[str, str]] = None, part_size: int = ARTIFACT_PART_SIZE,
+                 previous_sha256: Optional[str] = None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.metadata = metadata or {}
+        self.part_size = max(S3_MIN_PART_SIZE, part_size)
+        self.previous_sha256 = previous_sha256
+        self.bytes_written = 0
+        self.sha256: Optional[str] = None
+        self.skipped = False
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict[str, Any]] = []
+
+    def write(self, text: str) -> None:
+        self.write_bytes(text.encode('utf-8'))
+
+    def write_bytes(self, data: bytes) -> None:
+        self._buffer += data
+        self._hash.update(data)
+        self.bytes_written += len(data)
+        if len(self._buffer) >= self.part_size:
+            self._flush_part()
+
+    def _flush_part(self) -> None:
+        if self._upload_id is None:
+            self._upload_id = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type, Metadata=self.metadata
+            )['UploadId']
+        part_number = len(self._parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+            PartNumber=part_number, Body=self._buffer
+        )
+        self._parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+        del self._buffer[:]
+
+    def close(self) -> None:
+        """남은 버퍼를 올리고 객체를 완성합니다. 내용이 이전 업로드와 같으면 올리지 않습니다."""
+        self.sha256 = self._hash.hexdigest()
+        if self.sha256 == self.previous_sha256:
+            self.skipped = True
+            self.abort()
+            return
+        if self._upload_id is None:
+            self.s3_client.put_object(
+                Bucket=self.bucket, Key=self.key, Body=self._buffer,
+                ContentType=self.content_type, Metadata=self.metadata
+            )
+        else:
+            if self._buffer:
+                self._flush_part()
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts}
+            )
+        del self._buffer[:]
+
+    def abort(self) -> None:
+        del self._buffer[:]
+        if self._upload_id is not None:
+            try:
+                self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            except Exception as e:
+                logger.error(f"Failed to abort multipart upload for {self.key}: {str(e)}")
+            self._upload_id = None
+
+    def __enter__(self) -> "S3StreamingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ArtifactManifest:
+    """
+    업로드한 아티팩트의 키별 SHA-256, 미뤄 둔 KB 동기화 여부, 완료되면 데이터 버전으로 게시할
+    수집 작업 ID를 S3 JSON 파일 하나로 관리합니다.
+
+        {"artifacts": {키: sha256}, "ingestion_pending": bool, "version_job_id": str | null}
+    """
+
+    def __init__(self, artifacts: Optional[Dict[str, str]] = None, ingestion_pending: bool = False,
+                 version_job_id: Optional[str] = None):
+        self.artifacts = artifacts or {}
+        self.ingestion_pending = ingestion_pending
+        self.version_job_id = version_job_id
+        self.changed_keys: List[str] = []
+
+    @classmethod
+    def load(cls, s3_client, bucket: str, key: str) -> "ArtifactManifest":
+        """매니페스트를 불러옵니다. 없거나 읽을 수 없으면 빈 매니페스트(모든 파일을 새로 올림)."""
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=key)
+            data = json.loads(response['Body'].read())
+            return cls(data.get('artifacts', {}), data.get('ingestion_pending', False), data.get('version_job_id'))
+        except s3_client.exceptions.NoSuchKey:
+            return cls()
+        except Exception as e:
+            logger.warning(f"Failed to load artifact manifest, uploading all artifacts: {str(e)}")
+            return cls()
+
+    def get(self, key: str) -> Optional[str]:
+        return self.artifacts.get(key)
+
+    def record(self, writer: S3StreamingWriter) -> None:
+        """닫힌 작성기의 결과를 기록합니다."""
+        self.artifacts[writer.key] = writer.sha256
+        if not writer.skipped:
+            self.changed_keys.append(writer.key)
+
+    def save(self, s3_client, bucket: str, key: str) -> None:
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=json.dumps({
+                'artifacts': self.artifacts,
+                'ingestion_pending': self.ingestion_pending,
+                'version_job_id': self.version_job_id
+            }, ensure_ascii=False, indent=2).encode('utf-8'),
+            ContentType='application/json; charset=utf-8'
+        )
@@ -0,0 +1,116 @@
+"""
+근접 중복 기사 탐지 (MinHash + LSH 밴딩)
+
+BigKinds는 같은 기사를 여러 번 돌려줍니다 (수정 송고본, 카테고리별 사본, 통신 기사 재작성).
+사본마다 청킹·임베딩·색인되면 KB가 커지고 검색 상위 결과가 같은 기사로 채워지므로,
+청킹·업로드 전에 본문이 거의 같은 기사를 묶어 대표 기사 하나만 남깁니다.
+
+탐지 방식 (외부 라이브러리 없음)
+    - 본문에서 공백·문장부호를 뺀 문자열의 SHINGLE_CHARS 글자 shingle마다 CRC32를 구함
+    - one-permutation MinHash: 해시를 NUM_BINS개 구간으로 나눠 구간별 최솟값을 서명으로 사용
+      (기사당 shingle 해시 한 번, 빈 구간은 오른쪽 구간 값으로 채움)
+    - LSH 밴딩: 서명을 BANDS개 밴드로 나눠 밴드가 하나라도 같은 기사 쌍만 비교
+    - 서명 일치 비율(자카드 유사도 추정치)이 threshold 이상인 쌍을 같은 클러스터로 묶음
+    - 클러스터 대표는 rank가 가장 큰 기사 (호출하는 쪽에서 정함, 예: 최신 발행 → 긴 본문)
+
+본문이 MIN_TEXT_CHARS 글자보다 짧은 기사(사진 설명, 속보 한 줄 등)는 비교하지 않습니다.
+"""
+
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEDUP_THRESHOLD = 0.7
+SHINGLE_CHARS = 4
+NUM_BINS = 64
+BANDS = 16  # 밴드당 4행: 유사도 0.7인 쌍은 98.8%, 0.3인 쌍은 약 12%만 비교 후보가 됨
+MIN_TEXT_CHARS = 50
+
+NON_WORD_RE = re.compile(r"[\W_]+")
+_EMPTY = 1 << 32
+_ROWS = NUM_BINS // BANDS
+_BIN_BITS = NUM_BINS.bit_length() - 1  # NUM_BINS는 2의 거듭제곱
+_BIN_MASK = NUM_BINS - 1
+
+
+def minhash_signature(text: str) -> Optional[Tuple[int, ...]]:
+    """본문의 MinHash 서명을 반환합니다. 너무 짧으면 None (비교하지 않음)."""
+    text = NON_WORD_RE.sub("", text or "")
+    if len(text) < MIN_TEXT_CHARS:
+        return None
+
+    # 구간 = 해시 하위 비트, 값 = 나머지 비트
+    bins = [_EMPTY] * NUM_BINS
+    for shingle in {text[i:i + SHINGLE_CHARS] for i in range(len(text) - SHINGLE_CHARS + 1)}:
+        h = zlib.crc32(shingle.encode("utf-8"))
+        b = h & _BIN_MASK
+        v = h >> _BIN_BITS
+        if v < bins[b]:
+            bins[b] = v
+
+    signature = list(bins)
+    for i in range(NUM_BINS):
+        if bins[i] == _EMPTY:
+            # 가장 가까운 오른쪽 비어 있지 않은 구간 값 + 거리 (두 기사에서 같은 규칙으로 채워짐)
+            distance = 1
+            while bins[(i + distance) % NUM_BINS] == _EMPTY:
+                distance += 1
+            signature[i] = bins[(i + distance) % NUM_BINS] + distance * _EMPTY
+    return tuple(signature)
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """두 서명의 일치 비율 (자카드 유사도 추정치)"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_BINS
+
+
+def find_duplicate_clusters(signatures: List[Optional[Tuple[int, ...]]], ranks: List[Any],
+                            threshold: float = DEDUP_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    근접 중복 클러스터를 찾습니다. 인덱스 기준으로 반환합니다.
+
+        [{"canonical": i, "duplicates": [j, ...], "similarity": [대표와의 유사도, ...]}, ...]
+
+    ranks[i]가 가장 큰 기사가 대표이며, 같으면 앞선 기사가 대표입니다.
+    """
+    parent = list(range(len(signatures)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for band in range(BANDS):
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        for i, signature in enumerate(signatures):
+            if signature is not None:
+                buckets.setdefault(signature[band * _ROWS:(band + 1) * _ROWS], []).append(i)
+        for members in buckets.values():
+            for pos, j in enumerate(members):
+                for i in members[:pos]:
+                    if (i, j) in checked or find(i) == find(j):
+                        continue
+                    checked.add((i, j))
+                    if similarity(signatures[i], signatures[j]) >= threshold:
+                        parent[find(j)] = find(i)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(signatures)):
+        if signatures[i] is not None:
+            groups.setdefault(find(i), []).append(i)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        canonical = max(members, key=lambda i: (ranks[i], -i))
+        duplicates = [i for i in members if i != canonical]
+        clusters.append({
+            "canonical": canonical,
+            "duplicates": duplicates,
+            "similarity": [round(similarity(signatures[canonical], signatures[i]), 3) for i in duplicates],
+        })
+    clusters.sort(key=lambda cluster: cluster["canonical"])
+    return clusters
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+news_fetcher 벤치마크
+
+fetch (기본값): 로컬 가짜 BigKinds 서버로 하루치 전체 카테고리 수집을
+  - sequential : 카테고리를 하나씩 수집 (기존 방식과 같은 순서·속도 제한)
+  - concurrent : 카테고리별 동시 수집 (BIGKINDS_MAX_WORKERS)
+으로 실행해 소요 시간, 요청·재시도 수를 비교하고 두 결과가 같은 기사·같은 순서인지 확인합니다.
+가짜 서버는 요청마다 --latency초 지연 후 응답하고, 초당 --quota개를 넘는 요청에는
+429(Retry-After: 1)를 돌려줍니다. --error-rate 비율로 503을 섞어 재시도를 확인할 수 있습니다.
+
+artifacts: 하루치 기사(--articles-per-category × 8)의 마크다운·JSONL 아티팩트 생성을
+  - concat    : 파일 전체를 문자열로 이어 붙인 뒤 인코딩해 put_object 한 번 (기존 방식)
+  - streaming : save_articles_to_s3 (기사 단위 인코딩, 파트 단위 업로드)
+으로 실행해 CPU 시간과 최대 메모리(tracemalloc)를 비교하고 두 결과가 같은 바이트인지 확인합니다.
+S3는 받은 바이트의 크기·해시만 남기는 가짜 클라이언트를 사용합니다.
+
+dedup: 본문이 서로 다른 하루치 기사에 카테고리별 사본·수정본(--duplicate-rate)을 섞어
+drop_near_duplicates의 탐지 시간(1만 건당), 심어 둔 중복 중 찾아낸 비율, 중복 제거 전후
+KB 아티팩트 크기와 청크 수(700바이트 기준)를 비교합니다.
+
+사용법 예)
+    python benchmark.py --articles-per-category 700 --latency 1.5 --quota 2
+    python benchmark.py --rate 5 --quota 2     # 할당량보다 빠르게 호출 → 429 재시도 확인
+    python benchmark.py --benchmark artifacts --articles-per-category 625   # 하루 5,000건
+    python benchmark.py --benchmark dedup --articles-per-category 1250      # 하루 10,000건
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+from bigkinds_client import CATEGORIES, BigKindsClient, TokenBucket
+
+BENCHMARK_DATE = "2025-07-21"
+
+
+def make_documents(articles_per_category: int) -> Dict[str, List[Dict[str, Any]]]:
+    """카테고리 코드별 가짜 기사 목록 (발행 시각 내림차순)"""
+    documents = {}
+    day_end = datetime.strptime(BENCHMARK_DATE, "%Y-%m-%d") + timedelta(hours=23, minutes=59)
+    for c, (name, code) in enumerate(CATEGORIES.items()):
+        docs = []
+        for i in range(articles_per_category):
+            published = day_end - timedelta(seconds=(i * 8 + 1) * 13 + c)
+            docs.append({
+                "news_id": f"02100851.{published.strftime('%Y%m%d%H%M%S')}{c}{i:04d}",
+                "title": f"{name} 기사 {i}",
+                "content": f"{name} 분야 기사 본문입니다. " * 40,
+                "byline": "기자",
+                "publisher_name": "서울경제",
+                "published_at": published.strftime("%Y-%m-%dT%H:%M:%S.000+09:00"),
+                "provider_link_page": f"https://www.sedaily.com/NewsView/{c}{i:05d}",
+                "category": [f"{name}>일반"],
+                "category_code": code,
+                "year": 2025,
+                "month": 7,
+            })
+        documents[code] = docs
+    return documents
+
+
+class FakeBigKinds:
+    """지연·할당량·간헐적 오류를 흉내 내는 BigKinds 검색 서버"""
+
+    def __init__(self, documents: Dict[str, List[Dict[str, Any]]], latency: float, quota: float,
+                 error_rate: float):
+        self.documents = documents
+        self.latency = latency
+        self.quota = TokenBucket(quota)
+        self.error_rate = error_rate
+        self.counts = {"ok": 0, "throttled": 0, "errors": 0}
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, payload, headers = fake.respond(json.loads(body))
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/search/news"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def respond(self, request: Dict[str, Any]):
+        if not self.quota.try_acquire():
+            self._count("throttled")
+            return 429, {"result": -1, "reason": "rate limit exceeded"}, {"Retry-After": "1"}
+        time.sleep(self.latency)
+        if random.random() < self.error_rate:
+            self._count("errors")
+            return 503, {"result": -1, "reason": "temporarily unavailable"}, {}
+
+        argument = request["argument"]
+        window = argument["published_at"]
+        docs = [doc for doc in self.documents.get(argument["category"][0], [])
+                if window["from"] <= doc["published_at"][:19] <= window["until"]]
+        offset, size = argument["return_from"], argument["return_size"]
+        page = [{field: doc[field] for field in argument["fields"] if field in doc}
+                for doc in docs[offset:offset + size]]
+        self._count("ok")
+        return 200, {"result": 0, "return_object": {"total_hits": len(docs), "documents": page}}, {}
+
+    def start(self) -> None:
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_mode(fake: FakeBigKinds, workers: int, rate: float) -> Dict[str, Any]:
+    client = BigKindsClient("benchmark-key", base_url=fake.url, rate_per_second=rate, pool_size=workers)
+    started = time.time()
+    articles = client.fetch_all(BENCHMARK_DATE, BENCHMARK_DATE, max_workers=workers)
+    elapsed = time.time() - started
+    return {
+        "articles": articles,
+        "elapsed": elapsed,
+        "requests": client.stats["requests"],
+        "retries": client.stats["retries"],
+    }
+
+
+class HashingS3:
+    """받은 바이트를 보관하지 않고 키별 크기·SHA-256만 남기는 가짜 S3 클라이언트 (메모리 측정 왜곡 방지)"""
+
+    def __init__(self):
+        self.objects: Dict[str, Tuple[int, str]] = {}
+        self.calls = 0
+        self._parts: Dict[str, Any] = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls += 1
+        self.objects[Key] = (len(Body), hashlib.sha256(Body).hexdigest())
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.calls += 1
+        self._parts[Key] = [0, hashlib.sha256()]
+        return {"UploadId": Key}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls += 1
+        self._parts[UploadId][0] += len(Body)
+        self._parts[UploadId][1].update(Body)
+        return {"ETag": str(PartNumber)}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls += 1
+        size, digest = self._parts.pop(UploadId)
+        self.objects[Key] = (size, digest.hexdigest())
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self._parts.pop(UploadId, None)
+
+
+def concat_save(index, s3, articles: List[Dict[str, Any]]) -> None:
+    """기존 save_articles_to_s3 방식: 파일 전체를 문자열로 만든 뒤 인코딩해 한 번에 업로드"""
+    current_date = datetime.now()
+    date_str = current_date.strftime("%Y-%m-%d")
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    for article in articles:
+        by_category.setdefault(article.get("category", "기타"), []).append(article)
+
+    for category, category_articles in by_category.items():
+        md_content = f"# {date_str} {category} 뉴스\n\n"
+        md_content += f"**수집일**: {date_str}\n"
+        md_content += f"**총 기사 수**: {len(category_articles)}개\n\n"
+        md_content += "---\n\n"
+        for idx, article in enumerate(category_articles, 1):
+            md_content += index.convert_article_to_markdown(article, idx)
+        s3.put_object(Bucket="b", Key=index.category_markdown_key(category, current_date),
+                      Body=md_content.encode("utf-8"))
+
+        jsonl_content = ""
+        for article in category_articles:
+            jsonl_content += json.dumps(index.convert_article_to_jsonl(article, category, date_str),
+                                        ensure_ascii=False) + "\n"
+        s3.put_object(Bucket="b", Key=f"news-data-md/{current_date.strftime('%Y/%m/%d')}/{category}.jsonl",
+                      Body=jsonl_content.encode("utf-8"))
+
+
+def import_index():
+    """index 모듈을 벤치마크용 환경 변수로 불러옵니다 (AWS 호출은 하지 않음)."""
+    for name, value in (("AWS_DEFAULT_REGION", "ap-northeast-2"), ("BIGKINDS_API_SECRET_ARN", "benchmark"),
+                        ("DATA_BUCKET_NAME", "benchmark"), ("KNOWLEDGE_BASE_ID", "benchmark"),
+                        ("DATA_SOURCE_ID", "benchmark")):
+        os.environ.setdefault(name, value)
+    import index
+    logging.getLogger().setLevel(logging.WARNING)
+    return index
+
+
+def run_artifacts(articles_per_category: int) -> None:
+    index = import_index()
+
+    articles = []
+    for category, docs in zip(CATEGORIES, make_documents(articles_per_category).values()):
+        for doc in docs:
+            article = dict(doc, url=doc["provider_link_page"], category=category)
+            articles.append(article)
+    # 요약 계산은 두 방식에 공통이므로 측정에서 제외
+    index.annotate_summaries(articles)
+
+    outputs = {}
+    for mode in ("concat", "streaming"):
+        s3 = HashingS3()
+        tracemalloc.start()
+        cpu_started = time.process_time()
+        if mode == "concat":
+            concat_save(index, s3, articles)
+        else:
+            index.s3_client = s3
+            index.save_articles_to_s3(articles, index.ArtifactManifest())
+        cpu = time.process_time() - cpu_started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        outputs[mode] = s3.objects
+        total = sum(size for size, _ in s3.objects.values())
+        print(f"{mode:<10} articles={len(articles):>5}  files={len(s3.objects):>2}  bytes={total:>10}  "
+              f"cpu={cpu * 1000:7.1f}ms  peak_mem={peak / 1024 / 1024:6.2f}MB  s3_calls={s3.calls}")
+
+    print(f"identical_output={outputs['concat'] == outputs['streaming']}")
+
+
+def make_dedup_articles(articles_per_category: int, duplicate_rate: float) -> Tuple[List[Dict[str, Any]], int]:
+    """본문이 서로 다른 기사에 사본(다른 카테고리)·수정본(문장 교체·추가, 더 늦은 발행)을 섞은 하루치 기사"""
+    rng = random.Random(0)
+    vocab = ["".join(rng.choice("가나다라마바사아자차카타파하경제금리반도체수출시장정부") for _ in range(rng.randint(2, 4)))
+             for _ in range(3000)]
+
+    def sentence() -> str:
+        return " ".join(rng.choice(vocab) for _ in range(rng.randint(8, 15))) + "다."
+
+    day_start = datetime.strptime(BENCHMARK_DATE, "%Y-%m-%d")
+    articles, planted = [], 0
+    for category in CATEGORIES:
+        for i in range(articles_per_category):
+            published = day_start + timedelta(seconds=rng.randrange(86400))
+            article = {
+                "news_id": f"02100851.{category}.{i:05d}",
+                "title": " ".join(rng.choice(vocab) for _ in range(5)),
+                "content": " ".join(sentence() for _ in range(rng.randint(6, 20))),
+                "category": category,
+                "url": f"https://www.sedaily.com/NewsView/{category}{i:05d}",
+                "byline": "기자",
+            }
+            r = rng.random()
+            if articles and r < duplicate_rate / 2:
+                source = rng.choice(articles)
+                article.update(title=source["title"], content=source["content"])
+                published = datetime.strptime(source["published_at"][:19], "%Y-%m-%dT%H:%M:%S")
+                planted += 1
+            elif articles and r < duplicate_rate:
+                source = rng.choice(articles)
+                sentences = source["content"].split("다.")
+                sentences[rng.randrange(len(sentences))] = sentence()[:-2]
+                sentences.append(sentence()[:-2])
+                article.update(title=source["title"], content="다.".join(sentences))
+                planted += 1
+            article["published_at"] = published.strftime("%Y-%m-%dT%H:%M:%S.000+09:00")
+            articles.append(article)
+    return articles, planted
+
+
+def run_dedup(articles_per_category: int, duplicate_rate: float) -> None:
+    index = import_index()
+    articles, planted = make_dedup_articles(articles_per_category, duplicate_rate)
+    index.annotate_summaries(articles)
+
+    index.s3_client = HashingS3()
+    cpu_started = time.process_time()
+    kept = index.drop_near_duplicates(articles, BENCHMARK_DATE)
+    cpu = time.process_time() - cpu_started
+    dropped = len(articles) - len(kept)
+    print(f"articles={len(articles)}  planted_duplicates={planted}  dropped={dropped}  "
+          f"dedup_cpu={cpu:.2f}s  per_10k={cpu / len(articles) * 10000:.2f}s")
+
+    sizes = {}
+    for mode, mode_articles in (("all", articles), ("deduped", kept)):
+        s3 = HashingS3()
+        index.s3_client = s3
+        index.save_articles_to_s3(mode_articles, index.ArtifactManifest())
+        chunks = sum(len(index.chunk_text(article.get("content", ""))) for article in mode_articles)
+        sizes[mode] = (sum(size for size, _ in s3.objects.values()), chunks)
+        print(f"{mode:<8} articles={len(mode_articles):>6}  artifact_bytes={sizes[mode][0]:>11}  chunks={chunks:>7}")
+    print(f"index_reduction bytes={1 - sizes['deduped'][0] / sizes['all'][0]:.1%}  "
+          f"chunks={1 - sizes['deduped'][1] / sizes['all'][1]:.1%}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="news_fetcher 벤치마크")
+    ap.add_argument("--benchmark", choices=("fetch", "artifacts", "dedup"), default="fetch")
+    ap.add_argument("--articles-per-category", type=int, default=700, help="카테고리별 하루 기사 수")
+    ap.add_argument("--latency", type=float, default=1.5, help="가짜 서버 응답 지연(초)")
+    ap.add_argument("--quota", type=float, default=2.0, help="가짜 서버 초당 허용 요청 수")
+    ap.add_argument("--rate", type=float, default=2.0, help="클라이언트 초당 요청 수 (BIGKINDS_RATE_PER_SECOND)")
+    ap.add_argument("--workers", type=int, default=8, help="동시 수집 카테고리 수 (BIGKINDS_MAX_WORKERS)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율")
+    ap.add_argument("--duplicate-rate", type=float, default=0.16, help="dedup: 사본·수정본 비율")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.benchmark == "artifacts":
+        run_artifacts(args.articles_per_category)
+        return
+    if args.benchmark == "dedup":
+        run_dedup(args.articles_per_category, args.duplicate_rate)
+        return
+
+    random.seed(0)
+    fake = FakeBigKinds(make_documents(args.articles_per_category), args.latency, args.quota, args.error_rate)
+    fake.start()
+    try:
+        results = {}
+        for mode, workers in (("sequential", 1), ("concurrent", args.workers)):
+            results[mode] = run_mode(fake, workers, args.rate)
+            r = results[mode]
+            print(f"{mode:<11} articles={len(r['articles']):>5}  elapsed={r['elapsed']:6.2f}s  "
+                  f"requests={r['requests']:>3}  retries={r['retries']:>3}  "
+                  f"articles/s={len(r['articles']) / r['elapsed']:8.1f}")
+            time.sleep(1)  # 다음 모드가 서버 할당량을 새로 시작하도록
+
+        same = ([a["news_id"] for a in results["sequential"]["articles"]]
+                == [a["news_id"] for a in results["concurrent"]["articles"]])
+        print(f"speedup={results['sequential']['elapsed'] / results['concurrent']['elapsed']:.2f}x  "
+              f"identical_output={same}  server={fake.counts}")
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+BigKinds 뉴스 검색 API 클라이언트
+
+카테고리별 페이지 수집을 동시에 실행하되, 모든 요청이 하나의 토큰 버킷을 거치게 해 전체 호출 속도를
+BigKinds 할당량(BIGKINDS_RATE_PER_SECOND) 안으로 유지합니다.
+
+- 카테고리마다 페이지 수집 작업 하나 (카테고리 안의 페이지는 offset 순서대로)
+- 연결 풀을 쓰는 requests.Session 하나를 모든 작업이 공유 (keep-alive)
+- 429·5xx·연결 오류는 지수 백오프(+지터)로 재시도, 429의 Retry-After 헤더가 있으면 따름
+
+결과는 카테고리 정의 순서 → 카테고리 안의 페이지 순서로 합쳐 순차 수집과 같은 순서를 유지합니다.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger()
+
+BIGKINDS_BASE_URL = os.environ.get('BIGKINDS_BASE_URL', 'https://tools.kinds.or.kr/search/news')
+# BigKinds 할당량에 맞춘 전체 초당 요청 수 (기존 순차 수집의 페이지 간 0.5초 대기와 같은 속도)
+BIGKINDS_RATE_PER_SECOND = float(os.environ.get('BIGKINDS_RATE_PER_SECOND', '2'))
+BIGKINDS_MAX_WORKERS = int(os.environ.get('BIGKINDS_MAX_WORKERS', '8'))
+BIGKINDS_MAX_RETRIES = int(os.environ.get('BIGKINDS_MAX_RETRIES', '5'))
+BIGKINDS_PAGE_SIZE = 1000
+BIGKINDS_TIMEOUT_SECONDS = 30
+
+CATEGORIES = {
+    "정치": "001000000",
+    "경제": "002000000",
+    "사회": "003000000",
+    "문화": "004000000",
+    "국제": "005000000",
+    "지역": "006000000",
+    "스포츠": "007000000",
+    "IT_과학": "008000000",
+}
+
+FIELDS = [
+    "news_id", "title", "content", "byline", "publisher_name",
+    "published_at", "provider_link_page",
+    "category", "category_code", "year", "month"
+]
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """초당 rate개 토큰이 채워지는 버킷. acquire()는 토큰이 생길 때까지 기다립니다."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """토큰이 있으면 하나 쓰고 0을, 없으면 다음 토큰까지 남은 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def try_acquire(self) -> bool:
+        return self._take() == 0.0
+
+    def acquire(self) -> None:
+        while True:
+            wait = self._take()
+            if wait == 0.0:
+                return
+            time.sleep(wait)
+
+
+class BigKindsError(Exception):
+    """재시도 후에도 BigKinds 요청이 실패한 경우"""
+    pass
+
+
+class BigKindsClient:
+    """토큰 버킷·연결 풀·재시도를 갖춘 BigKinds 검색 클라이언트 (스레드 안전)"""
+
+    def __init__(self, api_key: str, base_url: str = BIGKINDS_BASE_URL,
+                 rate_per_second: float = BIGKINDS_RATE_PER_SECOND,
+                 max_retries: int = BIGKINDS_MAX_RETRIES, pool_size: int = BIGKINDS_MAX_WORKERS):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_retries = max_retries
+        # 버스트 없이 일정 간격으로 호출 (할당량 경계에서 429 방지)
+        self.bucket = TokenBucket(rate_per_second, capacity=1)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.stats = {'requests': 0, 'retries': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def search(self, argument: Dict[str, Any]) -> Dict[str, Any]:
+        """검색 요청 하나를 보내고 return_object를 반환합니다."""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            self._count('requests')
+            retry_after = None
+            try:
+                response = self.session.post(
+                    self.base_url,
+                    json={"access_key": self.api_key, "argument": argument},
+                    timeout=BIGKINDS_TIMEOUT_SECONDS
+                )
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    return response.json()["return_object"]
+                error = f"HTTP {response.status_code}"
+                if response.headers.get('Retry-After', '').isdigit():
+                    retry_after = int(response.headers['Retry-After'])
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+
+            if attempt == self.max_retries:
+                raise BigKindsError(f"BigKinds request failed after {attempt + 1} attempts: {error}")
+            delay = retry_after if retry_after is not None else min(30.0, 2 ** attempt) * (0.5 + random.random() / 2)
+            logger.warning(f"BigKinds request failed ({error}), retrying in {delay:.1f}s")
+            self._count('retries')
+            time.sleep(delay)
+
+    def fetch_category(self, category_name: str, category_code: str,
+                       start_date: str, end_date: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        카테고리 하나의 기간 내 기사를 모든 페이지에 걸쳐 수집합니다.
+        
+        since("YYYY-MM-DDTHH:MM:SS")가 있으면 그 시각 이후(포함) 발행된 기사만 요청합니다.
+        """
+        articles: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            ret = self.search({
+                "query": "",
+                "published_at": {
+                    "from": since or f"{start_date}T00:00:00",
+                    "until": f"{end_date}T23:59:59"
+                },
+                "provider": [
+                    "서울경제"  # 서울경제신문만 수집
+                ],
+                "category": [category_code],
+                "sort": {"date": "desc"},
+                "return_from": offset,
+                "return_size": BIGKINDS_PAGE_SIZE,
+                "fields": FIELDS
+            })
+            batch = ret["documents"]
+            if not batch:
+                break
+
+            # URL 필드 정규화
+            for doc in batch:
+                doc["url"] = doc.pop("provider_link_page", None)
+                doc["category"] = category_name
+
+            articles.extend(batch)
+            offset += len(batch)
+            if offset >= ret["total_hits"]:
+                break
+
+        logger.info(f"Collected {len(articles)} articles for {category_name}")
+        return articles
+
+    def fetch_all(self, start_date: str, end_date: str, categories: Optional[Dict[str, str]] = None,
+                  max_workers: int = BIGKINDS_MAX_WORKERS,
+                  since: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        모든 카테고리를 동시에 수집해 카테고리 정의 순서대로 합칩니다.
+        
+        since: 카테고리별 증분 수집 시작 시각 (없는 카테고리는 start_date부터 전체 수집)
+        """
+        categories = categories or CATEGORIES
+        since = since or {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(categories)))) as executor:
+            futures = [
+                executor.submit(self.fetch_category, name, code, start_date, end_date, since.get(name))
+                for name, code in categories.items()
+            ]
+            results = [future.result() for future in futures]
+        return [article for category_articles in results for article in category_articles]
@@ -0,0 +1,151 @@
+"""
+수집 상태(워터마크)와 증분 수집
+
+하루 중 여러 번 실행되는 수집이 매번 7일치 전체를 다시 받지 않도록, 그날 이미 수집한 기사와
+카테고리별 워터마크(가장 최근 published_at, news_id)를 S3에 저장합니다.
+
+    {prefix}/watermarks.json        : {"date", "window_start", "categories": {카테고리: {"published_at", "news_id", "count"}}}
+    {prefix}/{date}/{카테고리}.jsonl : 그날 수집한 기사 원본 (lead·summary 포함)
+
+다음 실행은 워터마크 시각에서 겹침 구간(WATERMARK_OVERLAP_HOURS)만큼 앞선 시각부터 BigKinds에 요청하고,
+news_id로 중복을 걸러 저장된 기사에 합친 뒤 그날의 아티팩트를 다시 씁니다. BigKinds는 기사를 발행
+시각보다 늦게 색인하기도 하므로, 워터마크 직전 발행 기사가 나중에 색인되어도 겹침 구간 안이면 받습니다.
+카테고리 안의 기사는 항상 (published_at, news_id) 내림차순으로 정렬하므로 같은 기사 집합이면 전체
+재수집과 증분 수집의 결과 파일이 바이트 단위로 같습니다.
+
+수집 날짜나 조회 구간 시작일이 바뀌면(자정 이후 첫 실행) 저장된 상태를 버리고 전체를 수집합니다.
+겹침 구간보다 더 늦게 색인된 기사와 BigKinds에서 수정·삭제된 기사는 다음 날 전체 수집 때 반영됩니다.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger()
+
+WATERMARKS_FILE = "watermarks.json"
+# 증분 수집 시 워터마크보다 앞서 다시 요청하는 시간 (늦게 색인된 기사 수집용, news_id로 중복 제거)
+WATERMARK_OVERLAP_HOURS = float(os.environ.get("WATERMARK_OVERLAP_HOURS", "24"))
+
+
+def article_sort_key(article: Dict[str, Any]):
+    return (article.get('published_at') or '', article.get('news_id') or '')
+
+
+class CollectionState:
+    """수집 날짜 하나의 카테고리별 기사와 워터마크"""
+
+    def __init__(self, date: str, window_start: str,
+                 articles_by_category: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.date = date
+        self.window_start = window_start
+        self.articles_by_category = articles_by_category or {}
+        self._changed = set()
+
+    @classmethod
+    def load(cls, s3_client, bucket: str, prefix: str, date: str, window_start: str) -> "CollectionState":
+        """저장된 상태를 불러옵니다. 다른 날짜·구간의 상태이거나 읽을 수 없으면 빈 상태."""
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=f"{prefix}/{WATERMARKS_FILE}")
+            watermarks = json.loads(response['Body'].read())
+        except s3_client.exceptions.NoSuchKey:
+            return cls(date, window_start)
+        except Exception as e:
+            logger.warning(f"Failed to load collection state, collecting the full window: {str(e)}")
+            return cls(date, window_start)
+
+        if watermarks.get('date') != date or watermarks.get('window_start') != window_start:
+            logger.info(f"Collection state is for {watermarks.get('date')}, collecting the full window")
+            return cls(date, window_start)
+
+        articles_by_category = {}
+        try:
+            for category, mark in watermarks.get('categories', {}).items():
+                response = s3_client.get_object(Bucket=bucket, Key=f"{prefix}/{date}/{category}.jsonl")
+                articles = [json.loads(line) for line in response['Body'].read().decode('utf-8').splitlines() if line]
+                if len(articles) != mark.get('count'):
+                    raise ValueError(f"{category}: expected {mark.get('count')} articles, found {len(articles)}")
+                articles_by_category[category] = articles
+        except Exception as e:
+            logger.warning(f"Collection state is incomplete, collecting the full window: {str(e)}")
+            return cls(date, window_start)
+
+        return cls(date, window_start, articles_by_category)
+
+    def watermarks(self) -> Dict[str, str]:
+        """
+        카테고리별 증분 수집 시작 시각 (BigKinds published_at.from 형식, 초 단위).
+        가장 최근 published_at에서 WATERMARK_OVERLAP_HOURS를 뺀 시각이며 조회 구간 시작보다 앞서지 않습니다.
+        """
+        window_start = datetime.fromisoformat(self.window_start)
+        overlap = timedelta(hours=WATERMARK_OVERLAP_HOURS)
+        since = {}
+        for category, articles in self.articles_by_category.items():
+            if not articles or not articles[0].get('published_at'):
+                continue
+            newest = datetime.fromisoformat(articles[0]['published_at'][:19])
+            since[category] = max(newest - overlap, window_start).strftime('%Y-%m-%dT%H:%M:%S')
+        return since
+
+    def merge(self, fetched: List[Dict[str, Any]]) -> int:
+        """새로 받은 기사를 합치고 새 기사 수를 반환합니다. 이미 있는 news_id는 건너뜁니다."""
+        seen = {
+            category: {article.get('news_id') for article in articles}
+            for category, articles in self.articles_by_category.items()
+        }
+        touched = set()
+        added = 0
+        for article in fetched:
+            category = article.get('category', '기타')
+            category_seen = seen.setdefault(category, set())
+            if article.get('news_id') in category_seen:
+                continue
+            category_seen.add(article.get('news_id'))
+            self.articles_by_category.setdefault(category, []).append(article)
+            touched.add(category)
+            added += 1
+
+        for category in touched:
+            self.articles_by_category[category].sort(key=article_sort_key, reverse=True)
+        self._changed |= touched
+        return added
+
+    def articles(self, category_order: List[str]) -> List[Dict[str, Any]]:
+        """category_order 순서(없는 카테고리는 뒤에 이름순)로 모든 기사를 반환합니다."""
+        order = list(category_order) + sorted(c for c in self.articles_by_category if c not in category_order)
+        return [article for category in order for article in self.articles_by_category.get(category, [])]
+
+    def save(self, s3_client, bucket: str, prefix: str) -> None:
+        """바뀐 카테고리의 기사를 먼저 쓰고 워터마크 파일을 마지막에 씁니다 (워터마크 파일이 커밋 지점)."""
+        for category in sorted(self._changed):
+            body = "".join(json.dumps(article, ensure_ascii=False) + "\n"
+                           for article in self.articles_by_category[category])
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=f"{prefix}/{self.date}/{category}.jsonl",
+                Body=body.encode('utf-8'),
+                ContentType='application/x-ndjson; charset=utf-8'
+            )
+
+        watermarks = {
+            'date': self.date,
+            'window_start': self.window_start,
+            'categories': {
+                category: {
+                    'published_at': articles[0].get('published_at') if articles else None,
+                    'news_id': articles[0].get('news_id') if articles else None,
+                    'count': len(articles)
+                }
+                for category, articles in self.articles_by_category.items()
+            }
+        }
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=f"{prefix}/{WATERMARKS_FILE}",
+            Body=json.dumps(watermarks, ensure_ascii=False, indent=2).encode('utf-8'),
+            ContentType='application/json; charset=utf-8'
+        )
+        self._changed.clear()
+        logger.info(f"Saved collection state for {self.date}: {watermarks['categories']}")
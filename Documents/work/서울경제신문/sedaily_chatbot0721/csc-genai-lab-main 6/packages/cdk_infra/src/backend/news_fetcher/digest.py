@@ -0,0 +1,131 @@
+"""
+일자·카테고리별 주요 뉴스 다이제스트 생성
+
+"오늘/어제 <카테고리> 주요 뉴스" 질문을 챗봇이 RAG 없이 바로 답할 수 있도록, 수집한 기사로
+(발행일, 카테고리)마다 순위를 매긴 다이제스트를 만들어 예측 가능한 키에 저장합니다.
+
+    s3://{DATA_BUCKET_NAME}/{DIGEST_PREFIX}/{YYYY-MM-DD}/{카테고리}.json
+
+순위 (LLM 호출 없음)
+    - 화제성: 같은 날 같은 카테고리의 다른 기사 제목과 겹치는 정도의 합 (여러 매체·후속 기사로 다뤄진 이슈일수록 높음)
+    - 본문 길이 가중치 (짧은 단신보다 본기사 우선)
+    - 제목이 거의 같은 기사는 하나만 선택
+
+다이제스트 형식은 챗봇(news_chatbot/digest.py)이 읽는 형식과 같아야 합니다.
+"""
+
+import json
+import logging
+import math
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+logger = logging.getLogger()
+
+DIGEST_VERSION = 1
+DIGEST_TOP_ARTICLES = 5
+# 요약 문단에 lead 문장을 사용할 상위 기사 수
+DIGEST_SUMMARY_ARTICLES = 3
+# 이 값 이상으로 제목이 겹치면 같은 이슈의 중복 기사로 보고 제외
+DUPLICATE_TITLE_SIMILARITY = 0.5
+
+
+def _title_terms(title: str) -> Set[str]:
+    terms = set()
+    for word in title.lower().split():
+        word = "".join(ch for ch in word if ch.isalnum())
+        terms.update(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def _similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def rank_articles(articles: List[Dict[str, Any]], top_n: int = DIGEST_TOP_ARTICLES) -> List[Dict[str, Any]]:
+    """화제성·본문 길이로 기사 순위를 매기고, 중복 이슈를 제외한 상위 top_n개를 반환합니다."""
+    terms = [_title_terms(article.get('title', '')) for article in articles]
+    scored: List[Tuple[float, int]] = []
+    for i, article in enumerate(articles):
+        prominence = sum(_similarity(terms[i], terms[j]) for j in range(len(articles)) if j != i)
+        length_weight = math.log1p(len(article.get('content', ''))) / 10
+        scored.append((prominence + length_weight, i))
+
+    selected: List[int] = []
+    for _, i in sorted(scored, reverse=True):
+        if any(_similarity(terms[i], terms[j]) >= DUPLICATE_TITLE_SIMILARITY for j in selected):
+            continue
+        selected.append(i)
+        if len(selected) >= top_n:
+            break
+    return [articles[i] for i in selected]
+
+
+def build_category_digests(articles: List[Dict[str, Any]], date_of: Callable[[Dict[str, Any]], str],
+                           s3_uri_for: Callable[[Dict[str, Any]], str]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    기사 목록으로 (발행일, 카테고리)별 다이제스트를 만듭니다.
+
+    Args:
+        date_of: 기사 → 발행일(YYYY-MM-DD)
+        s3_uri_for: 기사 → 원문 마크다운 S3 URI (챗봇 출처 링크용)
+    """
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for article in articles:
+        groups.setdefault((date_of(article), article.get('category', '기타')), []).append(article)
+
+    digests = {}
+    for (date_str, category), group in groups.items():
+        top_articles = rank_articles(group)
+        entries = []
+        for rank, article in enumerate(top_articles, 1):
+            entries.append({
+                "rank": rank,
+                "title": article.get('title', ''),
+                "lead": article.get('lead', ''),
+                "summary": article.get('summary', ''),
+                "date": date_str,
+                "author": article.get('byline', ''),
+                "url": article.get('url', ''),
+                "s3_uri": s3_uri_for(article),
+            })
+
+        leads = [entry["lead"] or entry["title"] for entry in entries[:DIGEST_SUMMARY_ARTICLES]]
+        digests[(date_str, category)] = {
+            "version": DIGEST_VERSION,
+            "date": date_str,
+            "category": category,
+            "generated_at": datetime.now().isoformat(),
+            "article_count": len(group),
+            "summary": " ".join(leads),
+            "articles": entries,
+            "sources": [{
+                "title": entry["title"],
+                "date": entry["date"],
+                "author": entry["author"],
+                "media": "서울경제",
+                "url": entry["url"],
+                "s3_uri": entry["s3_uri"],
+            } for entry in entries],
+        }
+    return digests
+
+
+def digest_key(prefix: str, date_str: str, category: str) -> str:
+    return f"{prefix}/{date_str}/{category}.json"
+
+
+def upload_digests(s3_client, bucket: str, prefix: str,
+                   digests: Dict[Tuple[str, str], Dict[str, Any]]) -> int:
+    """다이제스트를 S3에 저장하고 저장한 개수를 반환합니다."""
+    for (date_str, category), digest in digests.items():
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=digest_key(prefix, date_str, category),
+            Body=json.dumps(digest, ensure_ascii=False).encode('utf-8'),
+            ContentType='application/json; charset=utf-8'
+        )
+    logger.info(f"Uploaded {len(digests)} daily category digests to s3://{bucket}/{prefix}/")
+    return len(digests)
@@ -2,10 +2,18 @@ import json
 import logging
 import os
 import boto3
-import requests
+import time
 from datetime import datetime, timedelta
 import uuid
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+from article_summary import summarize_article
+from artifact_writer import ArtifactManifest, S3StreamingWriter
+from bigkinds_client import CATEGORIES, BigKindsClient
+from collection_state import CollectionState
+from digest import build_category_digests, upload_digests
+from near_duplicates import find_duplicate_clusters, minhash_signature
+from recent_index import build_recent_index, load_previous_embeddings, upload_recent_index
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -13,11 +21,27 @@ logger.setLevel(logging.INFO)
 s3_client = boto3.client('s3')
 secrets_client = boto3.client('secretsmanager')
 bedrock_agent = boto3.client('bedrock-agent')
+bedrock_runtime = boto3.client('bedrock-runtime')
+lambda_client = boto3.client('lambda')
 
 BIGKINDS_API_SECRET_ARN = os.environ['BIGKINDS_API_SECRET_ARN']
 DATA_BUCKET_NAME = os.environ['DATA_BUCKET_NAME']
 KNOWLEDGE_BASE_ID = os.environ['KNOWLEDGE_BASE_ID']
 DATA_SOURCE_ID = os.environ['DATA_SOURCE_ID']
+RECENT_INDEX_PREFIX = os.environ.get('RECENT_INDEX_PREFIX', 'news-index/recent')
+DIGEST_PREFIX = os.environ.get('DIGEST_PREFIX', 'news-index/digests')
+# 챗봇 답변 캐시의 데이터 버전 파일 (KB 동기화 완료 시 갱신)
+DATA_VERSION_KEY = os.environ.get('DATA_VERSION_KEY', 'news-index/data-version.json')
+# 설정되어 있으면 동기화 완료 후 챗봇 Lambda에 답변 캐시 사전 적재를 요청
+CHATBOT_FUNCTION_NAME = os.environ.get('CHATBOT_FUNCTION_NAME', '')
+# 그날 이미 수집한 기사와 카테고리별 워터마크를 저장해 이후 실행은 새 기사만 요청 (collection_state 참고)
+INCREMENTAL_FETCH_ENABLED = os.environ.get('INCREMENTAL_FETCH_ENABLED', 'true').lower() == 'true'
+FETCHER_STATE_PREFIX = os.environ.get('FETCHER_STATE_PREFIX', 'fetcher-state')
+# 업로드한 KB 문서의 내용 해시와 미뤄 둔 동기화 여부 (내용이 같은 파일은 다시 올리지 않음)
+ARTIFACT_MANIFEST_KEY = f"{FETCHER_STATE_PREFIX}/artifact-manifest.json"
+# 본문이 거의 같은 기사(수정 송고본·카테고리별 사본)는 대표 기사 하나만 KB에 올림 (near_duplicates 참고)
+DEDUP_ENABLED = os.environ.get('DEDUP_ENABLED', 'true').lower() == 'true'
+DEDUP_THRESHOLD = float(os.environ.get('DEDUP_THRESHOLD', '0.7'))
 
 def lambda_handler(event, context):
     """
@@ -34,37 +58,73 @@ def lambda_handler(event, context):
         end_date = datetime.now()
         start_date = end_date - timedelta(days=7)
         
-        # BigKinds에서 뉴스 데이터 수집
-        news_articles = fetch_bigkinds_news(
+        # 오늘 앞선 실행에서 수집한 기사와 워터마크 (없으면 전체 구간 수집)
+        state = load_collection_state(end_date.strftime('%Y-%m-%d'), start_date.strftime('%Y-%m-%d'))
+        
+        # BigKinds에서 뉴스 데이터 수집 (워터마크가 있는 카테고리는 그 이후 기사만)
+        fetched_articles = fetch_bigkinds_news(
             api_key=bigkinds_api_key,
             start_date=start_date.strftime('%Y-%m-%d'),
-            end_date=end_date.strftime('%Y-%m-%d')
+            end_date=end_date.strftime('%Y-%m-%d'),
+            since=state.watermarks()
         )
         
-        if not news_articles:
+        # 업로드한 KB 문서의 내용 해시와 미뤄 둔 동기화 여부
+        manifest = ArtifactManifest.load(s3_client, DATA_BUCKET_NAME, ARTIFACT_MANIFEST_KEY)
+        
+        processed_count = 0
+        duplicate_count = 0
+        new_count = state.merge(fetched_articles)
+        if new_count:
+            # 그날 수집한 전체 기사 (카테고리 순서, 카테고리 안은 발행 시각 내림차순)
+            news_articles = state.articles(list(CATEGORIES))
+            logger.info(f"{new_count} new articles, {len(news_articles)} articles in today's collection")
+            
+            # 근접 중복 기사는 대표 기사만 남김 (수집 상태에는 모든 기사를 그대로 보관)
+            if DEDUP_ENABLED:
+                canonical_articles = drop_near_duplicates(news_articles, state.date)
+                duplicate_count = len(news_articles) - len(canonical_articles)
+                news_articles = canonical_articles
+            
+            # S3에 JSONL 형식으로 저장 (내용이 바뀐 파일만 업로드)
+            processed_count, failed_categories = save_articles_to_s3(news_articles, manifest)
+            
+            # 모든 카테고리 아티팩트를 저장했을 때만 워터마크 갱신 (실패하면 다음 실행이 같은 기사를 다시 요청)
+            if failed_categories:
+                logger.error(f"Keeping previous collection state, failed categories: {failed_categories}")
+            else:
+                save_collection_state(state)
+            
+            # 최근 기사 벡터 계층 갱신 (KB 수집 지연 동안 챗봇이 직접 검색)
+            update_recent_index(news_articles)
+            
+            # 일자·카테고리별 주요 뉴스 다이제스트 갱신 (챗봇이 "오늘 경제 주요 뉴스" 류 질문에 바로 응답)
+            update_daily_digests(news_articles)
+        else:
             logger.info("No new articles found")
-            return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'message': 'No new articles found',
-                    'processed_count': 0
-                })
-            }
         
-        # S3에 JSONL 형식으로 저장
-        processed_count = save_articles_to_s3(news_articles)
+        # 앞선 실행이 시작한 동기화가 끝났으면 데이터 버전을 갱신하고 챗봇 답변 캐시 사전 적재 요청
+        published_version = publish_data_version(manifest)
         
-        # Knowledge Base 동기화 시작
-        sync_job_id = trigger_knowledge_base_sync()
+        # 바뀐 문서가 있거나 앞선 실행이 미룬 동기화가 있을 때만 Knowledge Base 동기화 시작
+        sync_job_id = request_knowledge_base_sync(manifest)
+        if sync_job_id and sync_job_id != "sync_failed":
+            manifest.version_job_id = sync_job_id
+        save_artifact_manifest(manifest)
         
         logger.info(f"Successfully processed {processed_count} articles")
         
         return {
             'statusCode': 200,
             'body': json.dumps({
-                'message': 'News data collection completed successfully',
+                'message': 'News data collection completed successfully' if new_count else 'No new articles found',
                 'processed_count': processed_count,
+                'new_count': new_count,
+                'duplicate_count': duplicate_count,
+                'changed_files': len(manifest.changed_keys),
                 'sync_job_id': sync_job_id,
+                'published_version': published_version,
+                'ingestion_pending': manifest.ingestion_pending,
                 'timestamp': datetime.now().isoformat()
             })
         }
@@ -89,98 +149,65 @@ def get_bigkinds_api_key() -> str:
         logger.error(f"Failed to retrieve BigKinds API key: {str(e)}")
         raise
 
-def fetch_bigkinds_news(api_key: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+def fetch_bigkinds_news(api_key: str, start_date: str, end_date: str,
+                        since: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
     """
     BigKinds API를 사용하여 서울경제신문 뉴스를 수집합니다.
+    
+    카테고리별로 동시에 수집하되 전체 호출 속도는 BIGKINDS_RATE_PER_SECOND로 제한합니다 (bigkinds_client 참고).
+    since에 카테고리별 워터마크가 있으면 그 시각 이후 기사만 요청합니다.
     """
     try:
-        base_url = "https://tools.kinds.or.kr/search/news"
-        
-        categories = {
-            "정치": "001000000",
-            "경제": "002000000", 
-            "사회": "003000000",
-            "문화": "004000000",
-            "국제": "005000000",
-            "지역": "006000000",
-            "스포츠": "007000000",
-            "IT_과학": "008000000",
-        }
-        
-        fields = [
-            "news_id", "title", "content", "byline", "publisher_name",
-            "published_at", "provider_link_page",
-            "category", "category_code", "year", "month"
-        ]
-        
-        all_articles = []
-        
-        for category_name, category_code in categories.items():
-            offset = 0
-            size = 1000
-            
-            while True:
-                payload = {
-                    "access_key": api_key,
-                    "argument": {
-                        "query": "",
-                        "published_at": {
-                            "from": f"{start_date}T00:00:00",
-                            "until": f"{end_date}T23:59:59"
-                        },
-                        "provider": [
-                            "서울경제"  # 서울경제신문만 수집
-                        ],
-                        "category": [category_code],
-                        "sort": {"date": "desc"},
-                        "return_from": offset,
-                        "return_size": size,
-                        "fields": fields
-                    }
-                }
-                
-                response = requests.post(base_url, json=payload, timeout=30)
-                response.raise_for_status()
-                
-                ret = response.json()["return_object"]
-                batch = ret["documents"]
-                
-                if not batch:
-                    break
-                    
-                # URL 필드 정규화
-                for doc in batch:
-                    doc["url"] = doc.pop("provider_link_page", None)
-                    doc["category"] = category_name
-                
-                all_articles.extend(batch)
-                offset += len(batch)
-                
-                if offset >= ret["total_hits"]:
-                    break
-                
-                # API 호출 제한 대응
-                import time
-                time.sleep(0.5)
-            
-            logger.info(f"Collected {len([a for a in all_articles if a.get('category') == category_name])} articles for {category_name}")
+        started = time.time()
+        client = BigKindsClient(api_key)
+        all_articles = client.fetch_all(start_date, end_date, since=since)
         
-        logger.info(f"Total articles collected: {len(all_articles)}")
+        logger.info(
+            f"Total articles collected: {len(all_articles)} "
+            f"({client.stats['requests']} requests, {client.stats['retries']} retries, "
+            f"{time.time() - started:.1f}s)"
+        )
         return all_articles
         
     except Exception as e:
         logger.error(f"Failed to fetch news from BigKinds: {str(e)}")
         return []
 
-def save_articles_to_s3(articles: List[Dict[str, Any]]) -> int:
+def load_collection_state(date_str: str, window_start: str) -> CollectionState:
+    """오늘의 수집 상태를 불러옵니다. 증분 수집이 꺼져 있으면 빈 상태(전체 수집)."""
+    if not INCREMENTAL_FETCH_ENABLED:
+        return CollectionState(date_str, window_start)
+    return CollectionState.load(s3_client, DATA_BUCKET_NAME, FETCHER_STATE_PREFIX, date_str, window_start)
+
+def save_collection_state(state: CollectionState) -> None:
+    """수집 상태를 저장합니다. 실패해도 다음 실행이 전체 구간을 다시 수집할 뿐이므로 중단하지 않습니다."""
+    if not INCREMENTAL_FETCH_ENABLED:
+        return
+    try:
+        state.save(s3_client, DATA_BUCKET_NAME, FETCHER_STATE_PREFIX)
+    except Exception as e:
+        logger.error(f"Failed to save collection state: {str(e)}")
+
+def save_articles_to_s3(articles: List[Dict[str, Any]], manifest: ArtifactManifest) -> Tuple[int, List[str]]:
     """
     수집된 기사들을 Knowledge Base용 마크다운 형식으로 S3에 저장합니다.
+    
+    파일 내용은 기사 목록만으로 정해집니다 (실행 시각은 S3 메타데이터 collected_at에만 기록).
+    같은 날 증분 수집과 전체 재수집이 같은 파일을 만들도록 하기 위함입니다.
+    내용 해시가 매니페스트에 기록된 이전 업로드와 같은 파일은 올리지 않습니다.
+    
+    Returns:
+        (저장한 기사 수, 저장에 실패한 카테고리 목록)
     """
     try:
         processed_count = 0
+        failed_categories = []
         current_date = datetime.now()
         date_str = current_date.strftime('%Y-%m-%d')
         
+        # 기사별 lead 문장·추출 요약을 한 번만 계산 (마크다운·JSONL에 함께 저장)
+        annotate_summaries(articles)
+        
         # 카테고리별로 기사 그룹화
         articles_by_category = {}
         for article in articles:
@@ -189,81 +216,181 @@ def save_articles_to_s3(articles: List[Dict[str, Any]]) -> int:
                 articles_by_category[category] = []
             articles_by_category[category].append(article)
         
-        # 각 카테고리별로 마크다운 파일 생성
+        # 각 카테고리별로 마크다운·JSONL 파일을 기사 목록 한 번 순회로 생성 (파트 단위 스트리밍 업로드)
         for category, category_articles in articles_by_category.items():
             try:
-                # 마크다운 내용 생성
-                md_content = f"# {date_str} {category} 뉴스\n\n"
-                md_content += f"**수집일시**: {current_date.strftime('%Y-%m-%d %H:%M:%S')}\n"
-                md_content += f"**총 기사 수**: {len(category_articles)}개\n\n"
-                md_content += "---\n\n"
-                
-                for idx, article in enumerate(category_articles, 1):
-                    # 기사를 마크다운 형식으로 변환
-                    md_article = convert_article_to_markdown(article, idx)
-                    md_content += md_article
-                
-                # S3에 마크다운 파일로 저장
-                year = current_date.strftime('%Y')
-                month = current_date.strftime('%m')
-                day = current_date.strftime('%d')
-                
                 # 파일 경로: news-data-md/YYYY/MM/DD/카테고리.md (S3 구조와 일치)
-                s3_key = f"news-data-md/{year}/{month}/{day}/{category}.md"
+                s3_key = category_markdown_key(category, current_date)
+                # JSONL 형식도 함께 저장 (Knowledge Base 호환성)
+                jsonl_key = f"news-data-md/{current_date.strftime('%Y/%m/%d')}/{category}.jsonl"
                 
-                s3_client.put_object(
-                    Bucket=DATA_BUCKET_NAME,
-                    Key=s3_key,
-                    Body=md_content.encode('utf-8'),
-                    ContentType='text/markdown; charset=utf-8',
-                    Metadata={
+                md_writer = S3StreamingWriter(
+                    s3_client, DATA_BUCKET_NAME, s3_key,
+                    content_type='text/markdown; charset=utf-8',
+                    metadata={
                         'source': 'bigkinds-api',
                         'collection_date': date_str,
+                        'collected_at': current_date.strftime('%Y-%m-%d %H:%M:%S'),
                         'category': category,
                         'article_count': str(len(category_articles))
-                    }
+                    },
+                    previous_sha256=manifest.get(s3_key)
+                )
+                jsonl_writer = S3StreamingWriter(
+                    s3_client, DATA_BUCKET_NAME, jsonl_key,
+                    content_type='application/x-ndjson; charset=utf-8',
+                    previous_sha256=manifest.get(jsonl_key)
                 )
                 
-                processed_count += len(category_articles)
-                logger.info(f"Saved {len(category_articles)} articles to S3: {s3_key}")
-                
-                # JSONL 형식도 함께 저장 (Knowledge Base 호환성)
-                jsonl_key = f"news-data-md/{year}/{month}/{day}/{category}.jsonl"
-                jsonl_content = ""
+                with md_writer, jsonl_writer:
+                    # 마크다운 헤더
+                    md_writer.write(
+                        f"# {date_str} {category} 뉴스\n\n"
+                        f"**수집일**: {date_str}\n"
+                        f"**총 기사 수**: {len(category_articles)}개\n\n"
+                        "---\n\n"
+                    )
+                    
+                    for idx, article in enumerate(category_articles, 1):
+                        md_writer.write(convert_article_to_markdown(article, idx))
+                        jsonl_writer.write(
+                            json.dumps(convert_article_to_jsonl(article, category, date_str), ensure_ascii=False) + "\n"
+                        )
                 
-                for article in category_articles:
-                    kb_doc = {
-                        "chunk": article.get("content", ""),
-                        "title": article.get("title", ""),
-                        "date": format_date(article.get('date', '')),
-                        "url": article.get("url", ""),
-                        "category": category,
-                        "publisher": article.get("byline", ""),
-                        "metadata": {
-                            "source": "BigKinds",
-                            "collection_timestamp": current_date.isoformat()
-                        }
-                    }
-                    jsonl_content += json.dumps(kb_doc, ensure_ascii=False) + "\n"
+                manifest.record(md_writer)
+                manifest.record(jsonl_writer)
                 
-                s3_client.put_object(
-                    Bucket=DATA_BUCKET_NAME,
-                    Key=jsonl_key,
-                    Body=jsonl_content.encode('utf-8'),
-                    ContentType='application/x-ndjson; charset=utf-8'
-                )
+                processed_count += len(category_articles)
+                if md_writer.skipped and jsonl_writer.skipped:
+                    logger.info(f"Unchanged, skipped upload: {s3_key}")
+                else:
+                    logger.info(f"Saved {len(category_articles)} articles to S3: {s3_key} "
+                                f"({md_writer.bytes_written} + {jsonl_writer.bytes_written} bytes)")
                 
             except Exception as e:
                 logger.error(f"Failed to save articles for category {category}: {str(e)}")
+                failed_categories.append(category)
                 continue
         
         logger.info(f"Successfully saved {processed_count} articles to S3")
-        return processed_count
+        return processed_count, failed_categories
         
     except Exception as e:
         logger.error(f"Failed to save articles to S3: {str(e)}")
         raise
 
+def drop_near_duplicates(articles: List[Dict[str, Any]], date_str: str) -> List[Dict[str, Any]]:
+    """
+    본문이 거의 같은 기사를 묶어 클러스터마다 대표 기사(최신 발행 → 긴 본문 → 앞선 카테고리)만 남깁니다.
+    클러스터 목록은 {FETCHER_STATE_PREFIX}/{date}/duplicates.json에 기록합니다.
+    """
+    try:
+        started = time.time()
+        signatures = [minhash_signature(article.get('content', '')) for article in articles]
+        ranks = [(article.get('published_at') or '', len(article.get('content') or '')) for article in articles]
+        clusters = find_duplicate_clusters(signatures, ranks, DEDUP_THRESHOLD)
+        elapsed = time.time() - started
+        
+        duplicates = {i for cluster in clusters for i in cluster['duplicates']}
+        logger.info(f"Near-duplicate detection: {len(duplicates)} of {len(articles)} articles in "
+                    f"{len(clusters)} clusters dropped, {elapsed:.2f}s "
+                    f"({elapsed / max(len(articles), 1) * 10000:.1f}s per 10k articles)")
+        
+        def describe(i: int) -> Dict[str, Any]:
+            article = articles[i]
+            return {
+                'news_id': article.get('news_id'),
+                'category': article.get('category'),
+                'title': article.get('title'),
+                'published_at': article.get('published_at')
+            }
+        
+        s3_client.put_object(
+            Bucket=DATA_BUCKET_NAME,
+            Key=f"{FETCHER_STATE_PREFIX}/{date_str}/duplicates.json",
+            Body=json.dumps({
+                'date': date_str,
+                'threshold': DEDUP_THRESHOLD,
+                'articles': len(articles),
+                'dropped': len(duplicates),
+                'clusters': [
+                    {
+                        'canonical': describe(cluster['canonical']),
+                        'duplicates': [
+                            dict(describe(i), similarity=similarity)
+                            for i, similarity in zip(cluster['duplicates'], cluster['similarity'])
+                        ]
+                    }
+                    for cluster in clusters
+                ]
+            }, ensure_ascii=False, indent=2).encode('utf-8'),
+            ContentType='application/json; charset=utf-8'
+        )
+        
+        return [article for i, article in enumerate(articles) if i not in duplicates]
+    except Exception as e:
+        # 중복 제거는 색인 크기 최적화이므로 실패하면 모든 기사를 그대로 저장
+        logger.error(f"Failed to detect near-duplicate articles: {str(e)}")
+        return articles
+
+def convert_article_to_jsonl(article: Dict[str, Any], category: str, date_str: str) -> Dict[str, Any]:
+    """개별 기사를 Knowledge Base 호환 JSONL 레코드로 변환합니다."""
+    return {
+        "chunk": article.get("content", ""),
+        "title": article.get("title", ""),
+        "date": format_date(article.get('date', '')),
+        "url": article.get("url", ""),
+        "category": category,
+        "publisher": article.get("byline", ""),
+        "lead": article.get("lead", ""),
+        "summary": article.get("summary", ""),
+        "metadata": {
+            "source": "BigKinds",
+            "collection_date": date_str
+        }
+    }
+
+def annotate_summaries(articles: List[Dict[str, Any]]) -> None:
+    """요약이 없는 기사에 lead·summary 필드를 채웁니다."""
+    for article in articles:
+        if 'summary' not in article:
+            article.update(summarize_article(article.get('title', ''), article.get('content', '')))
+
+def category_markdown_key(category: str, current_date: datetime) -> str:
+    """카테고리별 마크다운 파일의 S3 키를 반환합니다."""
+    return f"news-data-md/{current_date.strftime('%Y/%m/%d')}/{category}.md"
+
+def update_recent_index(articles: List[Dict[str, Any]]) -> None:
+    """수집 구간(최근 7일) 기사로 챗봇용 최근 기사 벡터 계층을 다시 만듭니다."""
+    try:
+        current_date = datetime.now()
+        matrix, records = build_recent_index(
+            articles,
+            s3_uri_for=lambda article: f"s3://{DATA_BUCKET_NAME}/"
+                                       f"{category_markdown_key(article.get('category', '기타'), current_date)}",
+            bedrock_client=bedrock_runtime,
+            previous=load_previous_embeddings(s3_client, DATA_BUCKET_NAME, RECENT_INDEX_PREFIX)
+        )
+        upload_recent_index(s3_client, DATA_BUCKET_NAME, RECENT_INDEX_PREFIX, matrix, records)
+    except Exception as e:
+        # 최근 기사 계층은 보조 검색 경로이므로 실패해도 수집을 중단하지 않음
+        logger.error(f"Failed to update recent article index: {str(e)}")
+
+def update_daily_digests(articles: List[Dict[str, Any]]) -> None:
+    """수집 구간 기사로 발행일·카테고리별 다이제스트를 다시 만듭니다."""
+    try:
+        current_date = datetime.now()
+        digests = build_category_digests(
+            articles,
+            date_of=lambda article: format_date(article.get('published_at') or article.get('date', '')),
+            s3_uri_for=lambda article: f"s3://{DATA_BUCKET_NAME}/"
+                                       f"{category_markdown_key(article.get('category', '기타'), current_date)}"
+        )
+        upload_digests(s3_client, DATA_BUCKET_NAME, DIGEST_PREFIX, digests)
+    except Exception as e:
+        # 다이제스트는 보조 응답 경로이므로 실패해도 수집을 중단하지 않음
+        logger.error(f"Failed to update daily digests: {str(e)}")
+
 def convert_article_to_markdown(article: Dict[str, Any], idx: int) -> str:
     """개별 기사를 마크다운 형식으로 변환합니다."""
     md = f"### {idx}. {article.get('title', '제목 없음')}\n\n"
@@ -276,6 +403,9 @@ def convert_article_to_markdown(article: Dict[str, Any], idx: int) -> str:
     if article.get('byline'):
         md += f"**기자/출처**: {article['byline']}\n"
     
+    if article.get('summary'):
+        md += f"**요약**: {article['summary']}\n"
+    
     md += "\n**내용**:\n"
     
     # 본문 내용
@@ -303,10 +433,15 @@ def process_article_for_knowledge_base(article: Dict[str, Any]) -> Dict[str, Any
         # 텍스트 청킹 (700바이트 단위)
         chunks = chunk_text(content, max_bytes=700)
         
+        # 기사 단위 lead 문장·추출 요약 (청크와 별도로 기사당 한 번만 계산)
+        annotate_summaries([article])
+        
         processed_article = {
             'title': title,
             'content': content,
             'chunks': chunks,
+            'lead': article['lead'],
+            'summary': article['summary'],
             'date': format_date(article.get('date', '')),
             'url': article.get('url', ''),
             'category': article.get('category', ''),
@@ -384,4 +519,105 @@ def trigger_knowledge_base_sync() -> str:
     except Exception as e:
         logger.error(f"Failed to trigger Knowledge Base sync: {str(e)}")
         # 동기화 실패는 치명적이지 않으므로 예외를 발생시키지 않음
-        return "sync_failed"
\ No newline at end of file
+        return "sync_failed"
+
+def find_running_ingestion_job() -> Optional[str]:
+    """데이터 소스에서 시작 중이거나 실행 중인 수집 작업 ID를 반환합니다. 없으면 None."""
+    response = bedrock_agent.list_ingestion_jobs(
+        knowledgeBaseId=KNOWLEDGE_BASE_ID,
+        dataSourceId=DATA_SOURCE_ID,
+        filters=[{'attribute': 'STATUS', 'operator': 'EQ', 'values': ['STARTING', 'IN_PROGRESS']}],
+        maxResults=1
+    )
+    jobs = response.get('ingestionJobSummaries', [])
+    return jobs[0]['ingestionJobId'] if jobs else None
+
+def request_knowledge_base_sync(manifest: ArtifactManifest) -> Optional[str]:
+    """
+    KB 문서가 바뀌었거나 미뤄 둔 동기화가 있으면 동기화를 시작하고 작업 ID를 반환합니다.
+    
+    이미 실행 중인 수집 작업이 있으면 새 작업을 시작하지 않고 manifest.ingestion_pending에 표시해
+    다음 실행으로 미룹니다. 실행 중인 작업이 이번 변경을 읽었는지 알 수 없으므로 건너뛰지는 않습니다.
+    """
+    if not manifest.changed_keys and not manifest.ingestion_pending:
+        logger.info("No document changes, skipping Knowledge Base sync")
+        return None
+    
+    try:
+        running_job_id = find_running_ingestion_job()
+    except Exception as e:
+        logger.warning(f"Failed to list ingestion jobs: {str(e)}")
+        running_job_id = None
+    
+    if running_job_id:
+        manifest.ingestion_pending = True
+        logger.info(f"Ingestion job {running_job_id} in progress, deferring sync to the next run")
+        return None
+    
+    sync_job_id = trigger_knowledge_base_sync()
+    manifest.ingestion_pending = sync_job_id == "sync_failed"
+    return sync_job_id
+
+def save_artifact_manifest(manifest: ArtifactManifest) -> None:
+    """매니페스트를 저장합니다. 실패하면 다음 실행이 모든 파일을 다시 올리고 동기화할 뿐이므로 중단하지 않습니다."""
+    try:
+        manifest.save(s3_client, DATA_BUCKET_NAME, ARTIFACT_MANIFEST_KEY)
+    except Exception as e:
+        logger.error(f"Failed to save artifact manifest: {str(e)}")
+
+def publish_data_version(manifest: ArtifactManifest) -> Optional[str]:
+    """
+    manifest.version_job_id의 수집 작업이 완료됐으면 챗봇 답변 캐시의 데이터 버전을 그 작업 ID로 바꾸고
+    사전 적재를 요청합니다. 게시한 버전을 반환합니다.
+    
+    작업 완료를 기다리지 않고 실행마다 상태를 한 번만 확인합니다. 아직 실행 중이면 작업 ID를 매니페스트에
+    남겨 다음 실행이 다시 확인하고, 실패·중단됐으면 동기화를 다음 실행으로 미룹니다. 그동안 챗봇은
+    이전 버전 캐시를 계속 사용합니다.
+    """
+    job_id = manifest.version_job_id
+    if not job_id:
+        return None
+    try:
+        response = bedrock_agent.get_ingestion_job(
+            knowledgeBaseId=KNOWLEDGE_BASE_ID,
+            dataSourceId=DATA_SOURCE_ID,
+            ingestionJobId=job_id
+        )
+        status = response['ingestionJob']['status']
+        if status not in ('COMPLETE', 'FAILED', 'STOPPED'):
+            logger.info(f"Knowledge Base sync {job_id} still {status}, publishing data version on a later run")
+            return None
+        if status != 'COMPLETE':
+            logger.warning(f"Knowledge Base sync {job_id} {status}, keeping data version and retrying sync")
+            manifest.version_job_id = None
+            manifest.ingestion_pending = True
+            return None
+        
+        s3_client.put_object(
+            Bucket=DATA_BUCKET_NAME,
+            Key=DATA_VERSION_KEY,
+            Body=json.dumps({
+                'version': job_id,
+                'updated_at': datetime.now().isoformat()
+            }).encode('utf-8'),
+            ContentType='application/json'
+        )
+        manifest.version_job_id = None
+        logger.info(f"Published data version {job_id}")
+    except Exception as e:
+        # 데이터 버전은 보조 기능이므로 실패해도 수집을 중단하지 않음 (작업 ID는 남겨 다음 실행이 재시도)
+        logger.error(f"Failed to publish data version: {str(e)}")
+        return None
+    
+    if CHATBOT_FUNCTION_NAME:
+        try:
+            # 비동기 호출: 사전 적재 완료를 기다리지 않음
+            lambda_client.invoke(
+                FunctionName=CHATBOT_FUNCTION_NAME,
+                InvocationType='Event',
+                Payload=json.dumps({'action': 'prewarm', 'dataVersion': job_id}).encode('utf-8')
+            )
+            logger.info(f"Requested answer cache prewarm for data version {job_id}")
+        except Exception as e:
+            logger.error(f"Failed to request answer cache prewarm: {str(e)}")
+    return job_id
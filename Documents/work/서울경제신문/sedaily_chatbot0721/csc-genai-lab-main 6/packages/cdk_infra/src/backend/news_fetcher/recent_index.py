@@ -0,0 +1,155 @@
+"""
+최근 기사 벡터 계층(recent article index) 아티팩트 생성
+
+수집한 최근 N일 기사를 Knowledge Base와 같은 Bedrock 임베딩 모델(Titan Text Embeddings V2)로
+임베딩해 float16 행렬로 S3에 저장합니다. 챗봇 Lambda(news_chatbot/recent_index.py)가 이 아티팩트를
+/tmp에 내려받아 메모리 매핑한 뒤 KB 검색과 함께 조회합니다.
+
+모델·차원은 챗봇 쪽 설정과 같아야 하며 manifest의 embedder 값으로 확인합니다.
+직전 아티팩트에 같은 텍스트의 벡터가 있으면 다시 임베딩하지 않고 재사용합니다.
+
+metadata.json과 embeddings.npy는 따로 업로드되므로 실행마다 build_id를 만들어 manifest와
+embeddings.npy 객체 메타데이터(build-id)에 함께 기록합니다. 읽는 쪽은 두 값이 같을 때만 짝을 맞춥니다.
+"""
+
+import io
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger()
+
+# 챗봇 news_chatbot/recent_index.py와 같아야 함
+EMBEDDING_MODEL_ID = os.environ.get("RECENT_INDEX_EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0")
+EMBEDDING_DIM = int(os.environ.get("RECENT_INDEX_EMBEDDING_DIM", "1024"))
+EMBEDDER_NAME = f"bedrock:{EMBEDDING_MODEL_ID}:{EMBEDDING_DIM}"
+# 새 기사 임베딩 동시 호출 수
+EMBEDDING_WORKERS = int(os.environ.get("RECENT_INDEX_EMBEDDING_WORKERS", "8"))
+
+# 기사당 임베딩/프롬프트에 사용할 본문 앞부분 크기 (KB 청크 크기와 동일)
+TEXT_MAX_BYTES = 700
+
+
+def embed_text(bedrock_client, text: str) -> np.ndarray:
+    """Bedrock 임베딩 모델로 L2 정규화된 float32 벡터를 만듭니다."""
+    response = bedrock_client.invoke_model(
+        modelId=EMBEDDING_MODEL_ID,
+        body=json.dumps({"inputText": text, "dimensions": EMBEDDING_DIM, "normalize": True})
+    )
+    embedding = json.loads(response["body"].read())["embedding"]
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def load_previous_embeddings(s3_client, bucket: str, prefix: str) -> Dict[str, np.ndarray]:
+    """
+    직전 아티팩트의 {텍스트: 벡터}를 반환합니다. 아티팩트가 없거나 임베딩 모델이 다르면 빈 dict입니다.
+    메타데이터와 임베딩의 build_id가 다르면(업로드 도중) 재사용하지 않습니다.
+    """
+    try:
+        metadata = json.loads(s3_client.get_object(Bucket=bucket, Key=f"{prefix}/metadata.json")["Body"].read())
+        if metadata.get("manifest", {}).get("embedder") != EMBEDDER_NAME:
+            return {}
+        response = s3_client.get_object(Bucket=bucket, Key=f"{prefix}/embeddings.npy")
+        if response.get("Metadata", {}).get("build-id") != metadata["manifest"].get("build_id"):
+            logger.info("Recent index metadata and embeddings are from different builds, not reusing")
+            return {}
+        matrix = np.load(io.BytesIO(response["Body"].read()))
+    except Exception as e:
+        logger.info(f"No reusable recent index embeddings: {e}")
+        return {}
+
+    records = metadata.get("records", [])
+    if matrix.shape != (len(records), EMBEDDING_DIM):
+        return {}
+    return {record["text"]: matrix[row] for row, record in enumerate(records)}
+
+
+def _truncate_bytes(text: str, max_bytes: int) -> str:
+    return text.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
+
+
+def build_recent_index(articles: List[Dict[str, Any]],
+                       s3_uri_for: Callable[[Dict[str, Any]], str],
+                       bedrock_client,
+                       previous: Dict[str, np.ndarray]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """
+    기사 목록으로 (float16 임베딩 행렬, 병렬 메타데이터 배열)을 만듭니다.
+
+    Args:
+        articles: BigKinds 기사 목록
+        s3_uri_for: 기사가 저장된 마크다운 파일의 S3 URI를 반환하는 함수
+        bedrock_client: 임베딩 모델 호출용 Bedrock Runtime 클라이언트
+        previous: load_previous_embeddings 결과 (이 텍스트들은 다시 임베딩하지 않음)
+    """
+    matrix = np.zeros((len(articles), EMBEDDING_DIM), dtype=np.float16)
+    records = []
+    pending = []
+
+    for row, article in enumerate(articles):
+        title = (article.get("title") or "").strip()
+        text = f"{title}\n{_truncate_bytes((article.get('content') or '').strip(), TEXT_MAX_BYTES)}"
+        if text in previous:
+            matrix[row] = previous[text]
+        else:
+            pending.append(row)
+        records.append({
+            "title": title,
+            "date": (article.get("published_at") or "")[:10],
+            "url": article.get("url") or "",
+            "category": article.get("category") or "",
+            "s3_uri": s3_uri_for(article),
+            "text": text
+        })
+
+    with ThreadPoolExecutor(max_workers=EMBEDDING_WORKERS) as executor:
+        vectors = executor.map(lambda row: embed_text(bedrock_client, records[row]["text"]), pending)
+        for row, vector in zip(pending, vectors):
+            matrix[row] = vector
+    logger.info(f"Embedded {len(pending)} new articles, reused {len(articles) - len(pending)}")
+
+    return matrix, records
+
+
+def upload_recent_index(s3_client, bucket: str, prefix: str,
+                        matrix: np.ndarray, records: List[Dict[str, Any]]) -> None:
+    """
+    메타데이터를 먼저, 임베딩을 나중에 올립니다. 챗봇은 임베딩 ETag 변경으로 갱신을 감지하고
+    두 파일의 build_id가 같은지 확인합니다.
+    """
+    build_id = uuid.uuid4().hex
+    dates = sorted(record["date"] for record in records if record["date"])
+    metadata = {
+        "manifest": {
+            "build_id": build_id,
+            "embedder": EMBEDDER_NAME,
+            "dim": EMBEDDING_DIM,
+            "count": len(records),
+            "min_date": dates[0] if dates else "",
+            "max_date": dates[-1] if dates else "",
+            "created_at": datetime.now().isoformat()
+        },
+        "records": records
+    }
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=f"{prefix}/metadata.json",
+        Body=json.dumps(metadata, ensure_ascii=False).encode("utf-8"),
+        ContentType="application/json; charset=utf-8"
+    )
+
+    buffer = io.BytesIO()
+    np.save(buffer, matrix)
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=f"{prefix}/embeddings.npy",
+        Body=buffer.getvalue(),
+        ContentType="application/octet-stream",
+        Metadata={"build-id": build_id}
+    )
+    logger.info(f"Uploaded recent article index: {len(records)} articles to s3://{bucket}/{prefix}/")
@@ -8,7 +8,7 @@ import * as iam from 'aws-cdk-lib/aws-iam';
 import * as secretsmanager from 'aws-cdk-lib/aws-secretsmanager';
 import * as events from 'aws-cdk-lib/aws-events';
 import * as targets from 'aws-cdk-lib/aws-events-targets';
-import { PythonFunction } from '@aws-cdk/aws-lambda-python-alpha';
+import { PythonFunction, PythonLayerVersion } from '@aws-cdk/aws-lambda-python-alpha';
 import { Construct } from 'constructs';
 import * as s3deploy from 'aws-cdk-lib/aws-s3-deployment';
 import * as path from 'path';
@@ -16,6 +16,8 @@ import * as path from 'path';
 export interface NewsChatbotStackProps extends cdk.StackProps {
   perplexityApiKey: string;
   bigkindsApiKey: string;
+  // 답변 캐시 사전 적재를 요청할 챗봇 (루트 src/backend/news_chatbot을 배포한 함수, 기본값: news-chatbot-handler)
+  prewarmFunctionName?: string;
 }
 
 export class NewsChatbotStack extends cdk.Stack {
@@ -75,6 +77,10 @@ export class NewsChatbotStack extends cdk.Stack {
       },
     });
 
+    // 답변 캐시 사전 적재 대상: 루트 NewsChatbotStack(src/backend/news_chatbot)의 챗봇 함수.
+    // 이 스택의 NewsChatbotFunction은 prewarm 이벤트를 처리하지 않음
+    const prewarmFunctionName = props.prewarmFunctionName ?? 'news-chatbot-handler';
+
     // IAM Role for Data Fetcher Lambda
     const dataFetcherLambdaRole = new iam.Role(this, 'DataFetcherLambdaRole', {
       assumedBy: new iam.ServicePrincipal('lambda.amazonaws.com'),
@@ -113,6 +119,26 @@ export class NewsChatbotStack extends cdk.Stack {
               ],
               resources: ['*'],
             }),
+            // 최근 기사 벡터 계층 임베딩 (Knowledge Base와 같은 Titan Text Embeddings V2)
+            new iam.PolicyStatement({
+              effect: iam.Effect.ALLOW,
+              actions: [
+                'bedrock:InvokeModel',
+              ],
+              resources: [
+                `arn:aws:bedrock:${cdk.Aws.REGION}::foundation-model/amazon.titan-embed-text-v2:0`,
+              ],
+            }),
+            // KB 동기화 완료 후 챗봇 답변 캐시 사전 적재 요청
+            new iam.PolicyStatement({
+              effect: iam.Effect.ALLOW,
+              actions: [
+                'lambda:InvokeFunction',
+              ],
+              resources: [
+                `arn:aws:lambda:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:function:${prewarmFunctionName}`,
+              ],
+            }),
           ],
         }),
       },
@@ -133,6 +159,13 @@ export class NewsChatbotStack extends cdk.Stack {
       },
     });
 
+    // news_fetcher와 tools/data_preprocessing이 함께 쓰는 모듈 (src/backend/common/layers/news_shared)
+    const newsSharedLayer = new PythonLayerVersion(this, 'NewsSharedLayer', {
+      entry: path.join(__dirname, '../backend/common/layers/news_shared'),
+      compatibleRuntimes: [lambda.Runtime.PYTHON_3_11],
+      description: 'Shared news ingestion modules',
+    });
+
     // News Data Fetcher Lambda Function
     this.dataFetcherFunction = new PythonFunction(this, 'NewsDataFetcherFunction', {
       entry: path.join(__dirname, '../backend/news_fetcher'),
@@ -141,11 +174,13 @@ export class NewsChatbotStack extends cdk.Stack {
       timeout: cdk.Duration.minutes(15),
       memorySize: 2048,
       role: dataFetcherLambdaRole,
+      layers: [newsSharedLayer],
       environment: {
         BIGKINDS_API_SECRET_ARN: bigkindsSecret.secretArn,
         DATA_BUCKET_NAME: dataBucket.bucketName,
         KNOWLEDGE_BASE_ID: 'PGQV3JXPET',
         DATA_SOURCE_ID: 'W8DS8YQGZG',
+        CHATBOT_FUNCTION_NAME: prewarmFunctionName,
       },
     });
 
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+BigKinds 과거 데이터 재수집 (backfill)
+
+날짜 구간을 (날짜 × 카테고리) 작업 단위로 나눠 프로세스 풀에서 수집·변환하고, 끝난 단위를
+체크포인트 파일에 기록합니다. 중간에 멈춰도 다시 실행하면 끝나지 않았거나 실패한 단위만 처리합니다.
+
+- 체크포인트: {output-dir}/backfill-checkpoint.jsonl (단위마다 한 줄씩 추가, 같은 단위는 마지막 줄이 유효)
+- API 호출 속도: 모든 프로세스가 공유하는 요청 간격(--rate, 초당 요청 수)으로 제한
+- 429·5xx·연결 오류는 지수 백오프로 재시도하고, 재시도 후에도 실패하면 단위를 failed로 기록
+- 출력 형식은 bigkinds_to_markdown.py와 같음 (output/YYYY/MM/DD/카테고리.{json,md,jsonl})
+- 파일은 임시 파일에 쓴 뒤 이름을 바꾸므로 중간에 멈춰도 반쯤 쓴 파일이 남지 않음
+
+사용법 예)
+    python backfill.py --start-date 2016-01-01 --end-date 2025-07-20 --workers 8 --rate 4
+    python backfill.py --start-date 2016-01-01 --end-date 2025-07-20   # 같은 명령으로 재개
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from bigkinds_to_markdown import (
+    ACCESS_KEY, API_URL, CATEGORIES, FIELDS, convert_to_markdown, save_as_jsonl_for_knowledge_base
+)
+
+CHECKPOINT_FILE = "backfill-checkpoint.jsonl"
+PAGE_SIZE = 10000
+REQUEST_TIMEOUT = 60
+MAX_RETRIES = 5
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# 작업 프로세스 전역 (initializer에서 설정)
+_next_slot = None
+_slot_lock = None
+_interval = 0.0
+_session: Optional[requests.Session] = None
+_api_url = API_URL
+
+
+def _init_worker(next_slot, slot_lock, rate: float, api_url: str) -> None:
+    global _next_slot, _slot_lock, _interval, _session, _api_url
+    # Ctrl+C는 메인 프로세스가 처리 (작업 프로세스는 진행 중인 단위를 마저 끝냄)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _next_slot, _slot_lock = next_slot, slot_lock
+    _interval = 1.0 / rate
+    _session = requests.Session()
+    _api_url = api_url
+
+
+def _wait_for_slot() -> None:
+    """모든 프로세스가 공유하는 다음 요청 시각을 예약하고 그때까지 기다립니다."""
+    with _slot_lock:
+        now = time.time()
+        slot = max(now, _next_slot.value)
+        _next_slot.value = slot + _interval
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _post(payload: Dict[str, Any]) -> Dict[str, Any]:
+    for attempt in range(MAX_RETRIES + 1):
+        _wait_for_slot()
+        retry_after = None
+        try:
+            r = _session.post(_api_url, json=payload, timeout=REQUEST_TIMEOUT)
+            if r.status_code not in RETRYABLE_STATUS:
+                r.raise_for_status()
+                return r.json()["return_object"]
+            error = f"HTTP {r.status_code}"
+            if r.headers.get("Retry-After", "").isdigit():
+                retry_after = int(r.headers["Retry-After"])
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = str(e)
+        if attempt == MAX_RETRIES:
+            raise RuntimeError(f"API 요청 실패 ({attempt + 1}회 시도): {error}")
+        time.sleep(retry_after if retry_after is not None else min(60, 2 ** attempt) * (0.5 + random.random() / 2))
+
+
+def fetch_unit(category_code: str, day: datetime) -> List[Dict]:
+    """하루 × 카테고리 하나의 기사를 모두 가져옵니다. 실패하면 예외 (일부만 받은 결과는 쓰지 않음)."""
+    docs = []
+    offset = 0
+    while True:
+        ret = _post({
+            "access_key": ACCESS_KEY,
+            "argument": {
+                "query": "",
+                "published_at": {
+                    "from": day.strftime("%Y-%m-%dT00:00:00"),
+                    "until": day.strftime("%Y-%m-%dT23:59:59")
+                },
+                "category": [category_code],
+                "sort": {"date": "asc"},
+                "return_from": offset,
+                "return_size": PAGE_SIZE,
+                "fields": FIELDS
+            }
+        })
+        batch = ret["documents"]
+        if not batch:
+            break
+        docs.extend(batch)
+        offset += len(batch)
+        if offset >= ret["total_hits"]:
+            break
+
+    # URL 필드 정규화
+    for doc in docs:
+        doc["url"] = doc.pop("provider_link_page", None)
+    return docs
+
+
+def _write_atomic(path: str, write) -> None:
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def run_unit(date_str: str, name: str, output_dir: str, output_format: str) -> Dict[str, Any]:
+    """작업 단위 하나를 수집·변환·저장하고 결과를 반환합니다 (작업 프로세스에서 실행)."""
+    started = time.time()
+    day = datetime.strptime(date_str, "%Y-%m-%d")
+    docs = fetch_unit(CATEGORIES[name], day)
+
+    if docs:
+        folder = os.path.join(output_dir, day.strftime("%Y"), day.strftime("%m"), day.strftime("%d"))
+        os.makedirs(folder, exist_ok=True)
+
+        if output_format in ["json", "all"]:
+            meta = {
+                "year": day.year, "month": day.month, "day": day.day,
+                "category": name,
+                "total_articles": len(docs),
+                "collection_date": datetime.now().isoformat(),
+                "date_range": {"from": date_str, "until": date_str}
+            }
+
+            def write_json(path):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({"metadata": meta, "articles": docs}, f, ensure_ascii=False, indent=2)
+            _write_atomic(os.path.join(folder, f"{name}.json"), write_json)
+
+        if output_format in ["markdown", "all"]:
+            md_content = convert_to_markdown(docs, name, date_str)
+
+            def write_md(path):
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(md_content)
+            _write_atomic(os.path.join(folder, f"{name}.md"), write_md)
+
+        if output_format in ["jsonl", "all"]:
+            _write_atomic(os.path.join(folder, f"{name}.jsonl"),
+                          lambda path: save_as_jsonl_for_knowledge_base(docs, path, name, date_str))
+
+    return {"articles": len(docs), "seconds": round(time.time() - started, 2)}
+
+
+def load_checkpoint(path: str) -> Dict[str, Dict[str, Any]]:
+    """단위별 마지막 기록을 반환합니다. 마지막 줄이 잘렸으면(중단) 그 줄은 무시합니다."""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record["unit"]] = record
+    return records
+
+
+def plan_units(start: datetime, end: datetime) -> List[Tuple[str, str]]:
+    units = []
+    day = start
+    while day <= end:
+        units.extend((day.strftime("%Y-%m-%d"), name) for name in CATEGORIES)
+        day += timedelta(days=1)
+    return units
+
+
+def main():
+    ap = argparse.ArgumentParser(description="BigKinds 과거 데이터 재수집 (체크포인트·재개 지원)")
+    ap.add_argument("--start-date", required=True, help="시작 날짜 (YYYY-MM-DD)")
+    ap.add_argument("--end-date", required=True, help="종료 날짜 (YYYY-MM-DD)")
+    ap.add_argument("--output-format", choices=["json", "markdown", "jsonl", "all"], default="all",
+                    help="출력 형식 선택")
+    ap.add_argument("--output-dir", default="output", help="출력 디렉토리")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="작업 프로세스 수")
+    ap.add_argument("--rate", type=float, default=2.0, help="전체 초당 API 요청 수")
+    ap.add_argument("--api-url", default=API_URL, help="BigKinds 검색 API 주소")
+    ap.add_argument("--progress-every", type=int, default=50, help="진행 상황 출력 간격 (단위 수)")
+    args = ap.parse_args()
+
+    if not ACCESS_KEY:
+        print("BigKinds API 키가 설정되지 않았습니다! 환경변수 BIGKINDS_KEY를 설정해주세요.")
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    checkpoint_path = os.path.join(args.output_dir, CHECKPOINT_FILE)
+    done = {unit for unit, record in load_checkpoint(checkpoint_path).items() if record["status"] == "done"}
+
+    units = plan_units(datetime.strptime(args.start_date, "%Y-%m-%d"),
+                       datetime.strptime(args.end_date, "%Y-%m-%d"))
+    pending = [(date_str, name) for date_str, name in units if f"{date_str}/{name}" not in done]
+    print(f"작업 단위 {len(units)}개 중 완료 {len(units) - len(pending)}개, 남은 단위 {len(pending)}개")
+    if not pending:
+        return
+
+    next_slot = multiprocessing.Value("d", 0.0, lock=False)
+    slot_lock = multiprocessing.Lock()
+    started = time.time()
+    articles = completed = failed = 0
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+            ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                initargs=(next_slot, slot_lock, args.rate, args.api_url)) as executor:
+        futures = {
+            executor.submit(run_unit, date_str, name, args.output_dir, args.output_format): f"{date_str}/{name}"
+            for date_str, name in pending
+        }
+        try:
+            for future in as_completed(futures):
+                unit = futures[future]
+                try:
+                    record = {"unit": unit, "status": "done", **future.result()}
+                    articles += record["articles"]
+                    completed += 1
+                except Exception as e:
+                    record = {"unit": unit, "status": "failed", "error": str(e)}
+                    failed += 1
+                    print(f"  ✗ {unit}: {e}")
+                checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+                os.fsync(checkpoint.fileno())
+
+                finished = completed + failed
+                if finished % args.progress_every == 0 or finished == len(pending):
+                    elapsed = time.time() - started
+                    rate = articles / elapsed if elapsed else 0.0
+                    eta = elapsed / finished * (len(pending) - finished)
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] {finished}/{len(pending)} 단위 "
+                          f"(실패 {failed}) | 기사 {articles}개 | {rate:.1f} articles/s | 남은 시간 {eta / 60:.1f}분")
+        except KeyboardInterrupt:
+            print("중단합니다. 같은 명령으로 다시 실행하면 남은 단위부터 재개합니다.")
+            executor.shutdown(wait=False, cancel_futures=True)
+            return
+
+    elapsed = time.time() - started
+    print(f"\n✅ 완료 {completed}개, 실패 {failed}개 단위 | 기사 {articles}개 | {elapsed:.1f}초 | "
+          f"{articles / elapsed if elapsed else 0.0:.1f} articles/s")
+    if failed:
+        print("실패한 단위는 같은 명령으로 다시 실행하면 재시도합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,9 @@ from typing import Dict, List, Any
 import argparse
 import time
 
+import shared_modules  # noqa: F401  (공유 모듈 경로 설정, 공유 모듈보다 먼저 import)
+from article_summary import summarize_article
+
 load_dotenv()
 
 # BigKinds API 설정
@@ -107,7 +110,12 @@ def convert_to_markdown(articles: List[Dict], category: str, date: str) -> str:
         md_content += f"**언론사**: {article.get('publisher_name', 'N/A')}\n"
         md_content += f"**기자**: {article.get('byline', 'N/A')}\n"
         md_content += f"**URL**: {article.get('url', 'N/A')}\n"
-        md_content += f"**카테고리**: {category}\n\n"
+        md_content += f"**카테고리**: {category}\n"
+        summary = summarize_article(title, article.get("content", ""))
+        article.update(summary)  # JSONL 저장 시 재계산하지 않도록 기록
+        if summary["summary"]:
+            md_content += f"**요약**: {summary['summary']}\n"
+        md_content += "\n"
         
         # 본문
         content = article.get("content", "내용 없음")
@@ -123,6 +131,9 @@ def save_as_jsonl_for_knowledge_base(articles: List[Dict], output_path: str, cat
     """Knowledge Base용 JSONL 형식으로 저장합니다."""
     with open(output_path, 'w', encoding='utf-8') as f:
         for article in articles:
+            # 마크다운 변환 때 계산한 요약을 재사용 (JSONL만 출력할 때는 여기서 계산)
+            if "summary" not in article:
+                article.update(summarize_article(article.get("title", ""), article.get("content", "")))
             # Knowledge Base에 필요한 형식으로 변환
             kb_doc = {
                 "chunk": article.get("content", ""),
@@ -132,6 +143,8 @@ def save_as_jsonl_for_knowledge_base(articles: List[Dict], output_path: str, cat
                 "category": category,
                 "publisher": article.get("publisher_name", ""),
                 "byline": article.get("byline", ""),
+                "lead": article["lead"],
+                "summary": article["summary"],
                 "article_id": article.get("news_id", ""),
                 "metadata": {
                     "source": "BigKinds",
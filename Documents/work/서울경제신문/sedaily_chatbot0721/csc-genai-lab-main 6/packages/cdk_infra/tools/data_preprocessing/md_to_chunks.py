@@ -7,11 +7,22 @@
         --output out/2016_04_10_chunks.jsonl \
         --chunk_bytes 700
 
+    # 증분 모드: 바뀐 마크다운 파일만 다시 청킹해 파일별 샤드로 저장
+    python md_to_chunks.py \
+        --input_dir ../../서울경제뉴스데이터_마크다운 \
+        --output_dir out/chunks
+
+    # 근접 중복 기사(수정본·카테고리별 사본)는 대표 기사만 청킹
+    python md_to_chunks.py --input_dir ../../서울경제뉴스데이터_마크다운 --output_dir out/chunks --dedup
+
 결과는 JSON Lines(.jsonl) 형식으로 저장되며, 각 행은 OpenSearch Bulk
 API 의 _source 로 바로 넣을 수 있는 구조입니다.
 
+기사 블록은 news_markdown.py 파서로 파일을 한 번 훑어 나눕니다 (`**발행일:**`·`**발행일**:` 두 표기 모두 읽음).
+
 필드 구조
 ----------
+chunk_id        : str  – 청크 ID (레코드 내용의 SHA-1 앞 16자리, 내용이 바뀌면 ID도 바뀜)
 chunk           : str  – 본문 조각(임베딩 대상)
 path            : str  – S3 상대 경로(연,월,일/파일명.md)
 article_idx     : int  – 해당 파일 내 기사 번호(1 부터)
@@ -20,50 +31,95 @@ title           : str
 date            : str  – YYYY-MM-DD
 url             : str
 category        : str 또는 list
+lead            : str  – 기사 첫 문장 (기사 단위, 모든 청크에 동일)
+summary         : str  – 기사 추출 요약 (기사 단위, 모든 청크에 동일)
+
+병렬 처리 (--workers N)
+------------------------
+파일끼리는 서로 독립이므로 N개 프로세스가 파일 단위로 청킹·직렬화하고, 메인 프로세스는 결과를
+입력 파일 경로 순서대로 이어 씁니다. 입력 파일은 항상 경로 순으로 정렬하므로 workers 값과 관계없이
+출력 파일이 바이트 단위로 같습니다. orjson이 설치되어 있으면 직렬화에 사용합니다 (없으면 표준 json,
+출력은 동일). 끝나면 처리량(MB/s, chunks/s)을 출력합니다.
+
+증분 모드 (--output_dir DIR)
+----------------------------
+DIR/chunk-manifest.json 에 마크다운 파일별 (크기, mtime, SHA-256) → 샤드 경로·청크 ID 목록을 기록하고,
+다음 실행에서는 새로 생기거나 내용이 바뀐 파일만 다시 청킹합니다. 크기·mtime이 같으면 읽지 않고,
+다르더라도 SHA-256이 같으면(복사·touch) 다시 청킹하지 않습니다.
+
+    DIR/shards/YYYY/MM/DD/카테고리.jsonl : 마크다운 파일 하나의 청크
+    DIR/deltas/YYYYMMDDTHHMMSS_ffffff.json : 실행별로 추가·삭제된 청크 ID (바뀐 것이 있을 때만)
+
+샤드와 델타를 먼저 쓰고 매니페스트를 마지막에 씁니다 (매니페스트가 커밋 지점). 중간에 멈추면
+다음 실행이 같은 파일을 다시 처리합니다. --chunk_bytes나 청크 레코드 형식(CHUNK_FORMAT)이 바뀌면
+모든 파일을 다시 청킹합니다.
+
+근접 중복 제거 (--dedup)
+------------------------
+같은 날짜 폴더(그날의 카테고리 파일들) 안에서 본문이 거의 같은 기사를 MinHash + LSH로 묶어
+(near_duplicates.py) 클러스터마다 대표 기사(최신 발행 → 긴 본문 → 앞선 파일·순서)만 청킹합니다.
+article_idx는 원래 기사 번호를 유지합니다. 클러스터는 --output 모드에서는 <output>.duplicates.jsonl,
+증분 모드에서는 DIR/duplicates/YYYY/MM/DD.jsonl 에 기록합니다. 증분 모드에서는 날짜 폴더의 파일이
+하나라도 바뀌면 그 폴더 전체를 다시 처리하고, --dedup·--dedup_threshold가 바뀌면 전체를 다시 청킹합니다.
+끝나면 제외한 기사·청크 수(색인 크기 감소율)와 탐지 시간(1만 건당)을 출력합니다.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
-import re
+import shutil
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Dict
+from typing import Any, Callable, FrozenSet, Iterable, Iterator, List, Dict, Optional, Set, Tuple
+
+import shared_modules  # noqa: F401  (공유 모듈 경로 설정, 공유 모듈보다 먼저 import)
+from article_summary import summarize_article
+from near_duplicates import DEDUP_THRESHOLD, find_duplicate_clusters, minhash_signature
+
+try:
+    from news_markdown import NewsArticle, iter_articles, parse_articles
+except ImportError as e:
+    raise SystemExit(
+        "news_markdown 모듈을 찾을 수 없습니다. NEWS_SHARED_PATH에 챗봇 레이어 경로"
+        "(src/backend/common/layers/news_shared)를 지정하세요."
+    ) from e
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
 
-# --- 정규식 패턴 ---
-TITLE_RE = re.compile(r"^###\s*\d+\.\s*(.+)$")
-DATE_RE = re.compile(r"\*\*발행일:\*\*\s*([0-9T:\-+]+)")
-URL_RE = re.compile(r"\*\*URL:\*\*\s*(https?://[^\s]+)")
-CATEGORY_RE = re.compile(r"\*\*카테고리:\*\*\s*(.+)")
+MANIFEST_FILE = "chunk-manifest.json"
+SHARD_DIR = "shards"
+DELTA_DIR = "deltas"
+DUPLICATES_DIR = "duplicates"
+
+# 청크 레코드 형식 버전: 바뀌면 증분 모드가 모든 파일을 다시 청킹 (2: news_markdown 파서로 제목·두 가지 필드 표기 추출)
+CHUNK_FORMAT = 2
 
 
 # ---------------------------------------------------------------------------
 # Parser helpers
 # ---------------------------------------------------------------------------
 
-def find_articles(md_text: str) -> List[str]:
-    """`---` 구분자로 기사 블록 나누기."""
-    # 첫 메타데이터/헤더 부분은 제거하고 기사만 반환
-    parts = md_text.split("\n---\n")
-    return parts[1:] if len(parts) > 1 else []
-
-
-def extract_metadata(article_md: str) -> Dict[str, str]:
-    """기사 블록에서 메타데이터 추출"""
+def extract_metadata(article: NewsArticle) -> Dict[str, str]:
+    """기사 레코드(news_markdown)에서 청크에 붙일 메타데이터 추출"""
     meta = {}
-    title_m = TITLE_RE.search(article_md)
-    date_m = DATE_RE.search(article_md)
-    url_m = URL_RE.search(article_md)
-    cat_m = CATEGORY_RE.search(article_md)
-    if title_m:
-        meta["title"] = title_m.group(1).strip()
-    if date_m:
-        meta["date"] = date_m.group(1)[:10]  # YYYY-MM-DD
-    if url_m:
-        meta["url"] = url_m.group(1).strip()
-    if cat_m:
-        meta["category"] = cat_m.group(1).strip()
+    if article.title:
+        meta["title"] = article.title
+    date = article.date
+    if date:
+        meta["date"] = date  # YYYY-MM-DD
+    if article.url.startswith(("http://", "https://")):
+        meta["url"] = article.url.split()[0]
+    if article.category:
+        meta["category"] = article.category
     return meta
 
 
@@ -90,17 +146,30 @@ def chunk_text(text: str, max_bytes: int = 700) -> List[str]:
 # ---------------------------------------------------------------------------
 
 def iter_md_files(input_dir: Path) -> Iterator[Path]:
-    for p in input_dir.rglob("*.md"):
-        yield p
+    # 파일 시스템 나열 순서는 환경마다 다르므로 경로 순으로 정렬 (출력 순서 고정)
+    yield from sorted(input_dir.rglob("*.md"))
 
 
-def process_file(md_path: Path, base_dir: Path, chunk_bytes: int) -> Iterator[dict]:
+def dumps_line(rec: dict) -> bytes:
+    """레코드 하나를 JSONL 한 줄(UTF-8)로 직렬화합니다. orjson과 표준 json의 결과가 같습니다."""
+    if orjson is not None:
+        return orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def process_file(md_path: Path, base_dir: Path, chunk_bytes: int,
+                 skip: FrozenSet[int] = frozenset()) -> Iterator[dict]:
     rel_path = md_path.relative_to(base_dir)
-    content = md_path.read_text(encoding="utf-8")
-    for art_idx, article_md in enumerate(find_articles(content), 1):
-        meta = extract_metadata(article_md)
-        body_start = article_md.find("**내용:")
-        body = article_md[body_start + 6:].strip() if body_start != -1 else article_md
+    data = md_path.read_bytes()
+    for art_idx, article in enumerate(iter_articles(data), 1):
+        if art_idx in skip:
+            continue
+        meta = extract_metadata(article)
+        body = article.body(data)
+        # 기사 단위 요약: 마크다운에 이미 있으면(news_fetcher 수집분) 그대로, 없으면 한 번 계산
+        summary = summarize_article(article.title, body)
+        if article.summary:
+            summary["summary"] = article.summary
         for c_idx, chunk in enumerate(chunk_text(body, chunk_bytes), 1):
             yield {
                 "chunk": chunk,
@@ -108,27 +177,291 @@ def process_file(md_path: Path, base_dir: Path, chunk_bytes: int) -> Iterator[di
                 "article_idx": art_idx,
                 "chunk_idx": c_idx,
                 **meta,
+                **summary,
             }
 
 
+def chunk_file(md_path: Path, base_dir: Path, chunk_bytes: int,
+               skip: FrozenSet[int] = frozenset()) -> Tuple[bytes, int, List[str], int]:
+    """
+    파일 하나를 청킹해 (JSONL 바이트, 입력 파일 크기, 청크 ID 목록, 제외한 기사의 청크 수)를
+    반환합니다 (작업 프로세스에서 실행). skip은 제외할 기사 번호(근접 중복)입니다.
+    """
+    lines, chunk_ids = [], []
+    for rec in process_file(md_path, base_dir, chunk_bytes, skip):
+        chunk_id = hashlib.sha1(dumps_line(rec)).hexdigest()[:16]
+        lines.append(dumps_line({"chunk_id": chunk_id, **rec}))
+        chunk_ids.append(chunk_id)
+    skipped_chunks = 0
+    if skip:
+        data = md_path.read_bytes()
+        articles = parse_articles(data)
+        skipped_chunks = sum(len(chunk_text(articles[i - 1].body(data), chunk_bytes)) for i in skip)
+    return b"".join(lines), md_path.stat().st_size, chunk_ids, skipped_chunks
+
+
+def run_ordered(func: Callable, calls: Iterable[tuple], workers: int) -> Iterator[Any]:
+    """func(*args) 결과를 calls 순서대로 내보냅니다. workers > 1이면 프로세스 풀에서 처리합니다."""
+    if workers <= 1:
+        for args in calls:
+            yield func(*args)
+        return
+
+    # 앞선 파일이 오래 걸려도 결과가 무한정 쌓이지 않도록 진행 중인 작업 수를 제한
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for args in calls:
+            pending.append(executor.submit(func, *args))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_chunked_files(md_files: Iterable[Path], base_dir: Path, chunk_bytes: int, workers: int,
+                       skips: Optional[Dict[Path, FrozenSet[int]]] = None) -> Iterator[Tuple[bytes, int, List[str], int]]:
+    """chunk_file 결과를 입력 순서대로 내보냅니다."""
+    skips = skips or {}
+    return run_ordered(chunk_file, ((md, base_dir, chunk_bytes, skips.get(md, frozenset())) for md in md_files),
+                       workers)
+
+
+def new_stats() -> Dict[str, float]:
+    return {"files": 0, "input_bytes": 0, "chunks": 0,
+            "dedup_articles": 0, "duplicates": 0, "duplicate_chunks": 0, "dedup_seconds": 0.0}
+
+
+# ---------------------------------------------------------------------------
+# 근접 중복 제거
+# ---------------------------------------------------------------------------
+
+def article_signatures(md_path: Path) -> List[Tuple[Optional[Tuple[int, ...]], Tuple[str, int]]]:
+    """파일의 기사별 (MinHash 서명, 대표 선택 순위)를 반환합니다 (작업 프로세스에서 실행)."""
+    signatures = []
+    data = md_path.read_bytes()
+    for article in iter_articles(data):
+        body = article.body(data)
+        signatures.append((minhash_signature(body), (article.published, len(body))))
+    return signatures
+
+
+def find_duplicates(md_files: List[Path], base_dir: Path, threshold: float, workers: int,
+                    stats: Dict[str, float]) -> Tuple[Dict[Path, FrozenSet[int]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    날짜 폴더 안에서 근접 중복 기사를 찾아 (파일별 제외할 기사 번호, 날짜 폴더별 클러스터 목록)을 반환합니다.
+    폴더 단위로 처리하므로 메모리에는 날짜 폴더 하나의 서명만 둡니다.
+    """
+    started = time.time()
+    ordered = sorted(md_files, key=lambda p: (p.parent, p.name))
+    skips: Dict[Path, Set[int]] = {}
+    clusters_by_day: Dict[str, List[Dict[str, Any]]] = {}
+    day: Optional[Path] = None
+    entries: List[Tuple[Path, int, Optional[Tuple[int, ...]], Tuple[str, int]]] = []
+
+    def close_day() -> None:
+        name = lambda i: f"{entries[i][0].relative_to(base_dir).as_posix()}#{entries[i][1]}"
+        clusters = find_duplicate_clusters([e[2] for e in entries], [e[3] for e in entries], threshold)
+        for cluster in clusters:
+            for i in cluster["duplicates"]:
+                skips.setdefault(entries[i][0], set()).add(entries[i][1])
+        clusters_by_day[day.relative_to(base_dir).as_posix()] = [
+            {"canonical": name(c["canonical"]), "duplicates": [name(i) for i in c["duplicates"]],
+             "similarity": c["similarity"]}
+            for c in clusters
+        ]
+        stats["dedup_articles"] += len(entries)
+        stats["duplicates"] += sum(len(c["duplicates"]) for c in clusters)
+
+    for md, signatures in zip(ordered, run_ordered(article_signatures, ((md,) for md in ordered), workers)):
+        if md.parent != day:
+            if day is not None:
+                close_day()
+            day, entries = md.parent, []
+        entries.extend((md, art_idx, signature, rank) for art_idx, (signature, rank) in enumerate(signatures, 1))
+    if day is not None:
+        close_day()
+
+    stats["dedup_seconds"] += time.time() - started
+    return {md: frozenset(idx) for md, idx in skips.items()}, clusters_by_day
+
+
+# ---------------------------------------------------------------------------
+# 증분 모드
+# ---------------------------------------------------------------------------
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(path: Path) -> Tuple[Optional[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """(청킹 옵션, 파일별 기록)을 반환합니다. 매니페스트가 없으면 (None, {})."""
+    if not path.exists():
+        return None, {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    options = {"chunk_bytes": data.get("chunk_bytes"), "dedup_threshold": data.get("dedup_threshold"),
+               "format": data.get("format")}
+    return options, data.get("files", {})
+
+
+def plan_changes(inp_root: Path, old_files: Dict[str, Dict[str, Any]],
+                 rebuild: bool) -> Tuple[Dict[str, Dict[str, Any]], List[Path]]:
+    """새 매니페스트의 파일별 기록과 다시 청킹할 파일 목록을 반환합니다."""
+    files, changed = {}, []
+    for md in iter_md_files(inp_root):
+        rel = md.relative_to(inp_root).as_posix()
+        st = md.stat()
+        old = old_files.get(rel)
+        if not rebuild and old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+            files[rel] = old
+            continue
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(md)}
+        if not rebuild and old and old["sha256"] == entry["sha256"]:
+            files[rel] = {**old, **entry}
+            continue
+        entry["shard"] = (Path(SHARD_DIR) / rel).with_suffix(".jsonl").as_posix()
+        files[rel] = entry
+        changed.append(md)
+    return files, changed
+
+
+def run_incremental(inp_root: Path, out_dir: Path, chunk_bytes: int, workers: int,
+                    dedup_threshold: Optional[float], stats: Dict[str, float]) -> None:
+    """바뀐 파일만 다시 청킹합니다. dedup_threshold가 None이 아니면 근접 중복 기사를 제외합니다."""
+    manifest_path = out_dir / MANIFEST_FILE
+    old_options, old_files = load_manifest(manifest_path)
+    options = {"chunk_bytes": chunk_bytes, "dedup_threshold": dedup_threshold, "format": CHUNK_FORMAT}
+    rebuild = old_options is not None and old_options != options
+    if rebuild:
+        print(f"청킹 옵션이 바뀌어 모든 파일을 다시 청킹합니다 ({old_options} → {options})")
+
+    files, changed = plan_changes(inp_root, old_files, rebuild)
+    removed_files = sorted(set(old_files) - set(files))
+    affected_days = set()
+    if dedup_threshold is not None:
+        # 중복 판단은 날짜 폴더 단위이므로 폴더의 파일이 하나라도 바뀌면 폴더 전체를 다시 처리
+        affected_days = {md.parent for md in changed} | {(inp_root / rel).parent for rel in removed_files}
+        changed_set = set(changed)
+        changed = sorted(changed_set | {inp_root / rel for rel in files if (inp_root / rel).parent in affected_days})
+    print(f"파일 {len(files)}개 중 다시 청킹할 파일 {len(changed)}개, 삭제된 파일 {len(removed_files)}개")
+
+    skips: Dict[Path, FrozenSet[int]] = {}
+    if dedup_threshold is not None:
+        skips, clusters_by_day = find_duplicates(changed, inp_root, dedup_threshold, workers, stats)
+        for day_dir in affected_days:
+            day = day_dir.relative_to(inp_root).as_posix()
+            path = (out_dir / DUPLICATES_DIR / day).with_suffix(".jsonl")
+            clusters = clusters_by_day.get(day)
+            if clusters:
+                write_atomic(path, b"".join(dumps_line(cluster) for cluster in clusters))
+            else:
+                path.unlink(missing_ok=True)
+
+    added, removed = [], []
+    for md, (data, size, chunk_ids, skipped_chunks) in zip(
+            changed, iter_chunked_files(changed, inp_root, chunk_bytes, workers, skips)):
+        rel = md.relative_to(inp_root).as_posix()
+        entry = files[rel]
+        write_atomic(out_dir / entry["shard"], data)
+        old_ids = old_files.get(rel, {}).get("chunk_ids", [])
+        new_set, old_set = set(chunk_ids), set(old_ids)
+        added.extend(i for i in chunk_ids if i not in old_set)
+        removed.extend(i for i in old_ids if i not in new_set)
+        entry["chunk_ids"] = chunk_ids
+        stats["files"] += 1
+        stats["input_bytes"] += size
+        stats["chunks"] += len(chunk_ids)
+        stats["duplicate_chunks"] += skipped_chunks
+    for rel in removed_files:
+        removed.extend(old_files[rel]["chunk_ids"])
+
+    if added or removed:
+        created_at = datetime.now()
+        write_atomic(out_dir / DELTA_DIR / f"{created_at.strftime('%Y%m%dT%H%M%S_%f')}.json", json.dumps({
+            "created_at": created_at.isoformat(),
+            "changed_files": [md.relative_to(inp_root).as_posix() for md in changed],
+            "removed_files": removed_files,
+            "added": added,
+            "removed": removed,
+        }, ensure_ascii=False, indent=2).encode("utf-8"))
+    if files != old_files or old_options != options:
+        write_atomic(manifest_path, json.dumps({**options, "files": files}, ensure_ascii=False).encode("utf-8"))
+    # 매니페스트를 쓴 뒤에 삭제된 파일의 샤드(중복 제거를 끈 경우 클러스터 기록도)를 지움
+    for rel in removed_files:
+        (out_dir / old_files[rel]["shard"]).unlink(missing_ok=True)
+    if dedup_threshold is None:
+        shutil.rmtree(out_dir / DUPLICATES_DIR, ignore_errors=True)
+
+    print(f"  청크 추가 {len(added)}개, 삭제 {len(removed)}개")
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--input_dir", required=True, help="마크다운 루트 디렉터리")
-    ap.add_argument("--output", required=True, help="출력 jsonl 파일 경로")
+    out = ap.add_mutually_exclusive_group(required=True)
+    out.add_argument("--output", help="출력 jsonl 파일 경로 (전체를 파일 하나로)")
+    out.add_argument("--output_dir", help="증분 모드 출력 디렉터리 (파일별 샤드·매니페스트·델타)")
     ap.add_argument("--chunk_bytes", type=int, default=700)
+    ap.add_argument("--workers", type=int, default=1, help="작업 프로세스 수 (1이면 단일 프로세스)")
+    ap.add_argument("--dedup", action="store_true", help="같은 날짜 폴더 안의 근접 중복 기사는 대표 기사만 청킹")
+    ap.add_argument("--dedup_threshold", type=float, default=DEDUP_THRESHOLD,
+                    help="근접 중복으로 볼 유사도 (MinHash 자카드 추정치)")
     args = ap.parse_args()
 
     inp_root = Path(args.input_dir)
-    out_path = Path(args.output)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    dedup_threshold = args.dedup_threshold if args.dedup else None
+    stats = new_stats()
+    started = time.time()
 
-    with out_path.open("w", encoding="utf-8") as fw:
-        for md in iter_md_files(inp_root):
-            for rec in process_file(md, inp_root, args.chunk_bytes):
-                fw.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    if args.output_dir:
+        out_path = Path(args.output_dir)
+        run_incremental(inp_root, out_path, args.chunk_bytes, args.workers, dedup_threshold, stats)
+    else:
+        out_path = Path(args.output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        md_files = list(iter_md_files(inp_root))
+        skips: Dict[Path, FrozenSet[int]] = {}
+        if dedup_threshold is not None:
+            skips, clusters_by_day = find_duplicates(md_files, inp_root, dedup_threshold, args.workers, stats)
+            with out_path.with_suffix(".duplicates.jsonl").open("wb") as fw:
+                for day, clusters in sorted(clusters_by_day.items()):
+                    for cluster in clusters:
+                        fw.write(dumps_line({"day": day, **cluster}))
+        with out_path.open("wb") as fw:
+            for data, size, chunk_ids, skipped_chunks in iter_chunked_files(md_files, inp_root, args.chunk_bytes,
+                                                                            args.workers, skips):
+                fw.write(data)
+                stats["files"] += 1
+                stats["input_bytes"] += size
+                stats["chunks"] += len(chunk_ids)
+                stats["duplicate_chunks"] += skipped_chunks
 
+    elapsed = time.time() - started
     print(f"[완료] {out_path} 생성")
+    print(f"  파일 {stats['files']}개 | 청크 {stats['chunks']}개 | {elapsed:.2f}초 | "
+          f"{stats['input_bytes'] / 1e6 / elapsed if elapsed else 0.0:.2f} MB/s | "
+          f"{stats['chunks'] / elapsed if elapsed else 0.0:.0f} chunks/s "
+          f"(workers={args.workers}, {'orjson' if orjson is not None else 'json'})")
+    if dedup_threshold is not None:
+        total_chunks = stats["chunks"] + stats["duplicate_chunks"]
+        articles = stats["dedup_articles"]
+        print(f"  근접 중복: 기사 {articles}개 중 {stats['duplicates']}개 제외 → "
+              f"청크 {stats['duplicate_chunks']}개 감소 "
+              f"({stats['duplicate_chunks'] / total_chunks * 100 if total_chunks else 0.0:.1f}%) | "
+              f"탐지 {stats['dedup_seconds']:.2f}초 "
+              f"(1만 건당 {stats['dedup_seconds'] / articles * 10000 if articles else 0.0:.2f}초)")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,17 +5,27 @@
 - JSON -> Markdown 변환
 - S3 업로드 (s3://seoul-economic-news-data-2025/news-data-md/)
 - 서울경제신문만 수집
+
+수집은 페이지 단위 스트리밍으로 처리합니다. 페이지(PAGE_SIZE건)를 받는 대로 기사마다 마크다운으로
+변환해 로컬 파일과 S3 멀티파트 업로드에 바로 쓰므로, 수집 기간·기사 수와 관계없이 메모리에는
+페이지 하나만 남습니다. 페이지마다 진행 위치(offset)를 `{카테고리}.md.offset`에 기록해 두어
+중간에 멈추면 다음 실행이 그 위치부터 이어서 수집합니다.
 """
 
 import os
 import json
+import random
+import time
 import requests
 import boto3
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional
 import argparse
 
+import shared_modules  # noqa: F401  (공유 모듈 경로 설정, 공유 모듈보다 먼저 import)
+from artifact_writer import S3StreamingWriter
+
 load_dotenv()
 
 # BigKinds API 설정 (원래 구조 유지)
@@ -43,141 +53,240 @@ FIELDS = [
 S3_BUCKET = "seoul-economic-news-data-2025"
 S3_PREFIX = "news-data-md"
 
-def fetch_all(category_code, date_from, date_to):
-    """원래 함수 구조 유지 - 서울경제 전용으로 수정"""
-    docs, all_docs = [], []
-    offset, size = 0, 10000
+# 페이지 크기·요청 제한 시간 (연결, 응답 읽기)·재시도
+PAGE_SIZE = 1000
+REQUEST_TIMEOUT = (10, 60)
+MAX_RETRIES = 5
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+class DocumentStream:
+    """
+    카테고리·기간의 기사를 페이지 단위로 받아 한 건씩 내보내는 반복자
     
-    while True:
+    total_hits는 첫 페이지를 받은 뒤 채워지고, offset은 지금까지 내보낸 페이지의 끝 위치입니다.
+    start_offset을 주면 그 위치부터 이어서 받습니다.
+    """
+    
+    def __init__(self, category_code: str, date_from: datetime, date_to: datetime,
+                 start_offset: int = 0, page_size: int = PAGE_SIZE, session: Optional[requests.Session] = None):
+        self.category_code = category_code
+        self.date_from = date_from
+        self.date_to = date_to
+        self.offset = start_offset
+        self.page_size = page_size
+        self.total_hits: Optional[int] = None
+        self.session = session or requests.Session()
+    
+    def fetch_page(self) -> List[Dict]:
+        """현재 offset의 페이지 하나를 받습니다. 429·5xx·연결 오류는 지수 백오프로 재시도합니다."""
         payload = {
             "access_key": ACCESS_KEY,
             "argument": {
                 "query": "",
                 "published_at": {
-                    "from": date_from.strftime("%Y-%m-%dT00:00:00"),
-                    "until": date_to.strftime("%Y-%m-%dT23:59:59")
+                    "from": self.date_from.strftime("%Y-%m-%dT00:00:00"),
+                    "until": self.date_to.strftime("%Y-%m-%dT23:59:59")
                 },
                 "provider": [
                     "서울경제"  # 서울경제신문만 수집
                 ],
-                "category": [category_code],
+                "category": [self.category_code],
                 "sort": {"date": "desc"},
-                "return_from": offset,
-                "return_size": size,
+                "return_from": self.offset,
+                "return_size": self.page_size,
                 "fields": FIELDS
             }
         }
         
-        try:
-            r = requests.post(API_URL, json=payload)
-            r.raise_for_status()
-            ret = r.json()["return_object"]
-            batch = ret["documents"]
-            
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                r = self.session.post(API_URL, json=payload, timeout=REQUEST_TIMEOUT)
+                if r.status_code not in RETRYABLE_STATUS:
+                    r.raise_for_status()
+                    ret = r.json()["return_object"]
+                    self.total_hits = ret["total_hits"]
+                    return ret["documents"]
+                error = f"HTTP {r.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+            if attempt == MAX_RETRIES:
+                raise RuntimeError(f"API 요청 실패 (offset {self.offset}, {attempt + 1}회 시도): {error}")
+            time.sleep(min(60, 2 ** attempt) * (0.5 + random.random() / 2))
+    
+    def pages(self) -> Iterator[List[Dict]]:
+        """페이지를 차례로 내보냅니다. 다음 페이지를 요청하기 전에 offset이 앞으로 이동합니다."""
+        while self.total_hits is None or self.offset < self.total_hits:
+            batch = self.fetch_page()
             if not batch:
                 break
-                
-            all_docs.extend(batch)
-            offset += len(batch)
             
-            if offset >= ret["total_hits"]:
-                break
-                
-        except Exception as e:
-            print(f"API 오류: {e}")
-            break
-    
-    # URL 필드 정규화 (원래 구조 유지)
-    for d in all_docs:
-        d["url"] = d.pop("provider_link_page", None)
+            # URL 필드 정규화 (원래 구조 유지)
+            for d in batch:
+                d["url"] = d.pop("provider_link_page", None)
+            
+            yield batch
+            self.offset += len(batch)
     
+    def __iter__(self) -> Iterator[Dict]:
+        for batch in self.pages():
+            yield from batch
+
+def fetch_all(category_code, date_from, date_to):
+    """원래 함수 구조 유지 - 서울경제 전용으로 수정 (전체를 목록으로 모음. 큰 구간은 DocumentStream 사용)"""
+    all_docs = []
+    try:
+        all_docs.extend(DocumentStream(category_code, date_from, date_to))
+    except Exception as e:
+        print(f"API 오류: {e}")
     return all_docs
 
-def convert_to_markdown(articles: List[Dict], category: str, date: str) -> str:
-    """JSON 기사를 마크다운 형식으로 변환"""
-    if not articles:
+def markdown_header(category: str, date: str, total: int) -> str:
+    """카테고리 마크다운 파일의 머리말"""
+    if not total:
         return f"# {date} {category} 뉴스\n\n수집된 기사가 없습니다.\n"
     
     md_content = f"# {date} {category} 뉴스\n\n"
     md_content += f"**수집일시**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    md_content += f"**총 기사 수**: {len(articles)}개\n"
+    md_content += f"**총 기사 수**: {total}개\n"
     md_content += f"**출처**: 서울경제신문\n\n"
     md_content += "---\n\n"
+    return md_content
+
+def convert_to_markdown(articles: List[Dict], category: str, date: str) -> str:
+    """JSON 기사를 마크다운 형식으로 변환"""
+    return markdown_header(category, date, len(articles)) + "".join(
+        article_to_markdown(article, idx, category) for idx, article in enumerate(articles, 1)
+    )
+
+def article_to_markdown(article: Dict, idx: int, category: str) -> str:
+    """기사 하나를 마크다운으로 변환"""
+    title = article.get("title", "제목 없음").strip()
+    md_content = f"### {idx}. {title}\n\n"
     
-    for idx, article in enumerate(articles, 1):
-        title = article.get("title", "제목 없음").strip()
-        md_content += f"### {idx}. {title}\n\n"
-        
-        # 메타데이터
-        published_at = article.get("published_at", "")
-        if published_at:
-            try:
-                pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                formatted_date = pub_date.strftime('%Y-%m-%d %H:%M')
-            except:
-                formatted_date = published_at
-        else:
-            formatted_date = "N/A"
-            
-        md_content += f"**발행일**: {formatted_date}\n"
-        md_content += f"**URL**: {article.get('url', 'N/A')}\n"
-        md_content += f"**카테고리**: {category}\n"
-        
-        byline = article.get("byline", "")
-        if byline:
-            md_content += f"**기자**: {byline}\n"
-        
-        md_content += "\n**내용**:\n"
-        
-        content = article.get("content", "내용 없음").strip()
-        if content:
-            content = content.replace('\\n', '\n').replace('\n\n\n', '\n\n')
-            md_content += f"{content}\n\n"
-        else:
-            md_content += "내용이 제공되지 않았습니다.\n\n"
+    # 메타데이터
+    published_at = article.get("published_at", "")
+    if published_at:
+        try:
+            pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+            formatted_date = pub_date.strftime('%Y-%m-%d %H:%M')
+        except:
+            formatted_date = published_at
+    else:
+        formatted_date = "N/A"
         
-        md_content += "---\n\n"
+    md_content += f"**발행일**: {formatted_date}\n"
+    md_content += f"**URL**: {article.get('url', 'N/A')}\n"
+    md_content += f"**카테고리**: {category}\n"
+    
+    byline = article.get("byline", "")
+    if byline:
+        md_content += f"**기자**: {byline}\n"
+    
+    md_content += "\n**내용**:\n"
+    
+    content = article.get("content", "내용 없음").strip()
+    if content:
+        content = content.replace('\\n', '\n').replace('\n\n\n', '\n\n')
+        md_content += f"{content}\n\n"
+    else:
+        md_content += "내용이 제공되지 않았습니다.\n\n"
+    
+    md_content += "---\n\n"
     
     return md_content
 
-def save_to_local_and_s3(content: str, category: str, date_str: str, local_only: bool = False):
-    """로컬 저장 및 S3 업로드 (덮어쓰기 방식)"""
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    year = date_obj.strftime('%Y')
-    month = date_obj.strftime('%m')
-    day = date_obj.strftime('%d')
+def stream_category(name: str, code: str, target_date: datetime, local_only: bool = False,
+                    s3_client=None) -> int:
+    """
+    카테고리 하나를 페이지 단위로 받아 로컬 파일과 S3에 바로 씁니다 (덮어쓰기). 저장한 기사 수를 반환합니다.
+    
+    쓰는 동안에는 {카테고리}.md.partial에 쓰고, 페이지마다 진행 위치를 {카테고리}.md.offset에 기록합니다.
+    중간에 실패하면 두 파일이 남고, 다음 실행은 기록된 위치까지의 내용을 유지한 채 그다음 페이지부터
+    이어서 받습니다 (S3에는 남아 있던 부분을 다시 올린 뒤 이어서 업로드).
+    발행 시각 내림차순 offset이므로 기사가 계속 추가되는 당일 수집을 재개하면 경계의 기사가 밀릴 수 있습니다.
+    """
+    date_str = target_date.strftime('%Y-%m-%d')
+    year, month, day = date_str.split('-')
     
-    # 로컬 저장
     folder = os.path.join("output", year, month, day)
     os.makedirs(folder, exist_ok=True)
-    file_path = os.path.join(folder, f"{category}.md")
+    file_path = os.path.join(folder, f"{name}.md")
+    partial_path = f"{file_path}.partial"
+    offset_path = f"{file_path}.offset"
     
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"로컬 저장: {file_path}")
+    progress = None
+    if os.path.exists(partial_path) and os.path.exists(offset_path):
+        with open(offset_path, encoding='utf-8') as f:
+            progress = json.load(f)
+        print(f"  -> 이어서 수집: {progress['offset']}/{progress['total_hits']}")
     
-    # S3 업로드 (덮어쓰기)
+    writer = None
     if not local_only:
-        try:
-            s3_client = boto3.client('s3')
-            s3_key = f"{S3_PREFIX}/{year}/{month}/{day}/{category}.md"
+        writer = S3StreamingWriter(
+            s3_client or boto3.client('s3'), S3_BUCKET, f"{S3_PREFIX}/{year}/{month}/{day}/{name}.md",
+            content_type='text/markdown; charset=utf-8',
+            metadata={
+                'source': 'sedaily-bigkinds',
+                'collection_date': datetime.now().isoformat(),
+                'category': name,
+                'date': date_str
+            }
+        )
+    
+    stream = DocumentStream(code, target_date, target_date, start_offset=progress['offset'] if progress else 0)
+    total = progress['total_hits'] if progress else None
+    count = stream.offset
+    
+    try:
+        with open(partial_path, 'r+b' if progress else 'wb') as f:
+            if progress:
+                # 마지막 기록 이후에 쓴 내용은 버리고, S3에는 유지한 부분부터 다시 올림
+                f.truncate(progress['bytes'])
+                if writer:
+                    while True:
+                        chunk = f.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        writer.write_bytes(chunk)
+                f.seek(progress['bytes'])
             
-            s3_client.put_object(
-                Bucket=S3_BUCKET,
-                Key=s3_key,
-                Body=content.encode('utf-8'),
-                ContentType='text/markdown; charset=utf-8',
-                Metadata={
-                    'source': 'sedaily-bigkinds',
-                    'collection_date': datetime.now().isoformat(),
-                    'category': category,
-                    'date': date_str
-                }
-            )
-            print(f"S3 업로드: s3://{S3_BUCKET}/{s3_key}")
+            def emit(text: str) -> None:
+                data = text.encode('utf-8')
+                f.write(data)
+                if writer:
+                    writer.write_bytes(data)
             
-        except Exception as e:
-            print(f"S3 업로드 실패: {e}")
+            for batch in stream.pages():
+                if total is None:
+                    total = stream.total_hits
+                    emit(markdown_header(name, date_str, total))
+                for article in batch:
+                    count += 1
+                    emit(article_to_markdown(article, count, name))
+                
+                f.flush()
+                with open(offset_path, 'w', encoding='utf-8') as progress_file:
+                    json.dump({'offset': stream.offset + len(batch), 'bytes': f.tell(), 'total_hits': total},
+                              progress_file)
+            
+            if total is None:
+                emit(markdown_header(name, date_str, 0))
+        
+        if writer:
+            writer.close()
+    except Exception:
+        if writer:
+            writer.abort()
+        raise
+    
+    os.replace(partial_path, file_path)
+    if os.path.exists(offset_path):
+        os.remove(offset_path)
+    
+    print(f"로컬 저장: {file_path}")
+    if writer:
+        print(f"S3 업로드: s3://{S3_BUCKET}/{writer.key}")
+    return count
 
 def collect_daily_news(target_date: datetime = None, local_only: bool = False):
     """지정된 날짜의 뉴스를 수집 (원래 구조 기반)"""
@@ -188,25 +297,24 @@ def collect_daily_news(target_date: datetime = None, local_only: bool = False):
     print(f"{date_str} 서울경제 뉴스 수집 시작")
     
     total_articles = 0
+    s3_client = None if local_only else boto3.client('s3')
     
     # 원래 구조와 동일한 방식으로 수집
     for name, code in CATEGORIES.items():
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 수집 중: {date_str} / {name}")
         
-        # fetch_all 함수 사용 (원래 구조 유지)
-        docs = fetch_all(code, target_date, target_date)
+        # 페이지 단위로 받아 마크다운 변환·저장 (덮어쓰기)
+        try:
+            count = stream_category(name, code, target_date, local_only, s3_client)
+        except Exception as e:
+            print(f"  -> 수집 실패 (다음 실행 시 이어서 수집): {e}")
+            continue
         
-        if docs:
-            print(f"  -> {len(docs)}개 기사 수집 완료")
-            total_articles += len(docs)
+        if count:
+            print(f"  -> {count}개 기사 수집 완료")
+            total_articles += count
         else:
             print(f"  -> 기사 없음")
-        
-        # 마크다운 변환
-        md_content = convert_to_markdown(docs, name, date_str)
-        
-        # 저장 (덮어쓰기)
-        save_to_local_and_s3(md_content, name, date_str, local_only)
     
     print(f"수집 완료: 총 {total_articles}개 기사")
     return total_articles
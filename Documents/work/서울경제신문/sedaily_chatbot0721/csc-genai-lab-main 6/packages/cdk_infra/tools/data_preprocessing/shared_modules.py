@@ -0,0 +1,22 @@
+"""
+Lambda와 같이 쓰는 공유 모듈 경로 설정
+
+Lambda와 도구가 함께 쓰는 수집 모듈(article_summary 등)은 이 패키지의 src/backend/common/layers/news_shared
+한 곳에만 두고 Lambda에는 레이어로 배포합니다. 도구 스크립트는 공유 모듈보다 이 모듈을 먼저 import 해
+그 경로를 sys.path에 추가합니다.
+
+마크다운 파서(news_markdown)는 챗봇 레이어에 있으므로 md_to_chunks.py를 실행하려면
+NEWS_SHARED_PATH에 그 디렉터리를 지정해야 합니다 (여러 개면 os.pathsep으로 구분).
+    export NEWS_SHARED_PATH=<챗봇 저장소>/src/backend/common/layers/news_shared
+"""
+
+import os
+import sys
+from pathlib import Path
+
+SHARED_DIR = Path(__file__).resolve().parents[2] / "src" / "backend" / "common" / "layers" / "news_shared"
+NEWS_SHARED_PATH = os.environ.get("NEWS_SHARED_PATH", "")
+
+for shared_path in [str(SHARED_DIR)] + [path for path in NEWS_SHARED_PATH.split(os.pathsep) if path]:
+    if shared_path not in sys.path:
+        sys.path.append(shared_path)
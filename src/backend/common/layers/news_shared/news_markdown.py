@@ -0,0 +1,156 @@
+"""
+뉴스 마크다운 파서 (한 번 훑기)
+
+수집기·news_fetcher가 쓰는 카테고리 마크다운 파일을 기사 단위 레코드로 나눕니다.
+
+    # 서울경제 경제 뉴스 - 2025-07-21      ← 헤더 (첫 구분자 앞, 기사로 보지 않음)
+    ---
+    ### 1. 기사 제목
+    **발행일:** 2025-07-21T09:30:00.000+09:00
+    **기자:** 홍길동
+    **URL:** https://www.sedaily.com/...
+    **내용:**
+    본문 ...
+    ---
+
+필드 줄은 `**키:** 값`과 `**키**: 값` 두 가지 표기를 모두 받습니다 (수집 도구마다 다르게 씀).
+
+파일 전체를 bytes로 받아 앞에서부터 한 번만 훑습니다. 구분자(`\n---\n`)와 블록의 `**내용:**` 줄은
+bytes.find로 찾고, 그 앞의 짧은 헤더(제목·필드 줄)만 줄 단위로 읽습니다. 없는 필드를 찾느라
+본문 전체를 다시 검색하는 일이 없습니다.
+필드마다 블록을 다시 검색하거나 블록 문자열을 잘라 만들지 않고, 레코드에는 필드 값과
+바이트 오프셋(start, body_start, end)만 둡니다. 블록 원문·본문이 필요할 때만 text()/body()로
+잘라 디코딩합니다. 발행일은 파싱할 때 한 번 datetime(published_at)으로 바꿔 둡니다.
+`**내용:**` 줄 뒤(본문)에 나오는 제목·필드 모양의 줄은 무시합니다.
+"""
+
+import re
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+SEPARATOR = b"\n---\n"
+_TITLE_RE = re.compile(rb"###[ \t]*(\d+)\.[ \t]*(.*)")
+_BODY_RE = re.compile(r"^\*\*내용(?::\*\*|\*\*:)[ \t]*".encode("utf-8"), re.MULTILINE)
+_BODY_MARKER = "**내용".encode("utf-8")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?")
+
+_FIELDS = {
+    "발행일".encode("utf-8"): "published",
+    "기자".encode("utf-8"): "author",
+    "기자/출처".encode("utf-8"): "author",
+    "언론사".encode("utf-8"): "media",
+    b"URL": "url",
+    "카테고리".encode("utf-8"): "category",
+    "요약".encode("utf-8"): "summary",
+}
+
+
+def parse_published(value: str) -> Optional[datetime]:
+    """발행일 값의 앞부분(YYYY-MM-DD[THH:MM[:SS]])을 datetime으로 바꿉니다. 시간대는 버립니다."""
+    m = _DATE_RE.match(value)
+    if not m:
+        return None
+    try:
+        return datetime.fromisoformat(m.group(0))
+    except ValueError:
+        return None
+
+
+class NewsArticle:
+    """
+    기사 블록 하나. 필드가 없으면 빈 문자열이고, 오프셋은 파싱한 bytes 기준입니다.
+
+        start       : 블록 시작 (구분자 다음 줄)
+        body_start  : `**내용:**` 표시 바로 뒤 (표시가 없으면 None → 블록 전체가 본문)
+        end         : 블록 끝 (다음 구분자 또는 파일 끝)
+    """
+
+    __slots__ = ("number", "title", "published", "published_at", "author", "media", "url",
+                 "category", "summary", "start", "body_start", "end")
+
+    def __init__(self, start: int, end: int):
+        self.number = 0
+        self.title = ""
+        self.published = ""
+        self.published_at: Optional[datetime] = None
+        self.author = ""
+        self.media = ""
+        self.url = ""
+        self.category = ""
+        self.summary = ""
+        self.start = start
+        self.body_start: Optional[int] = None
+        self.end = end
+
+    @property
+    def date(self) -> str:
+        """발행일 YYYY-MM-DD (없거나 읽을 수 없으면 빈 문자열)"""
+        return self.published_at.date().isoformat() if self.published_at else ""
+
+    def text(self, data: bytes) -> str:
+        """블록 원문 (제목·필드·본문)"""
+        return data[self.start:self.end].decode("utf-8")
+
+    def body(self, data: bytes) -> str:
+        """`**내용:**` 뒤의 본문 (표시가 없으면 블록 전체)"""
+        start = self.start if self.body_start is None else self.body_start
+        return data[start:self.end].decode("utf-8").strip()
+
+    def __repr__(self) -> str:
+        return f"NewsArticle(number={self.number}, title={self.title!r}, published={self.published!r})"
+
+
+def iter_articles(data: bytes) -> Iterator[NewsArticle]:
+    """
+    마크다운 파일 내용(bytes)에서 기사 레코드를 순서대로 내보냅니다.
+    첫 구분자 앞(파일 헤더)과 공백뿐인 블록(파일 끝 구분자 뒤 등)은 건너뜁니다.
+    필드가 여러 번 나오면 처음 값을 씁니다.
+    """
+    sep = data.find(SEPARATOR)
+    while sep != -1:
+        start = sep + len(SEPARATOR)
+        sep = data.find(SEPARATOR, start)
+        end = len(data) if sep == -1 else sep
+
+        # 본문 표시를 먼저 찾고 그 앞(제목·필드 줄)만 줄 단위로 봄: 본문 바이트는 다시 훑지 않음
+        body = None
+        marker = data.find(_BODY_MARKER, start, end)
+        if marker != -1:
+            body = _BODY_RE.match(data, marker) if data[marker - 1:marker] == b"\n" else None
+            if body is None:
+                body = _BODY_RE.search(data, start, end)
+        header = data[start:end if body is None else body.start()]
+        if body is None and not header.strip():
+            continue
+
+        article = NewsArticle(start, end)
+        if body is not None:
+            article.body_start = body.end()
+        for line in header.split(b"\n"):
+            if line.startswith(b"**"):
+                # **키:** 값 / **키**: 값
+                close = line.find(b"**", 2)
+                if close == -1:
+                    continue
+                if line[close - 1:close] == b":":
+                    key, value = line[2:close - 1], line[close + 2:]
+                elif line[close + 2:close + 3] == b":":
+                    key, value = line[2:close], line[close + 3:]
+                else:
+                    continue
+                attr = _FIELDS.get(key.strip())
+                if attr and not getattr(article, attr):
+                    value = value.decode("utf-8").strip()
+                    setattr(article, attr, value)
+                    if attr == "published":
+                        article.published_at = parse_published(value)
+            elif line.startswith(b"###") and not article.title:
+                m = _TITLE_RE.match(line)
+                if m:
+                    article.number = int(m.group(1))
+                    article.title = m.group(2).decode("utf-8").strip()
+        yield article
+
+
+def parse_articles(data: bytes) -> List[NewsArticle]:
+    return list(iter_articles(data))
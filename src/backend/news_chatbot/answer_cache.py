@@ -0,0 +1,146 @@
+"""
+Data-versioned Answer Cache
+
+/chat 답변을 (데이터 버전, 날짜 버킷, 정규화 질문) 키로 저장해 같은 질문을 다시 계산하지 않습니다.
+
+데이터 버전은 news_fetcher가 Knowledge Base 동기화(수집 작업) 완료를 확인한 뒤 기록하는
+s3://{NEWS_DATA_BUCKET}/{DATA_VERSION_KEY} 의 "version" 값(수집 작업 ID)입니다. 새 기사가 KB에
+반영되면 버전이 바뀌어 이전 답변은 자연히 조회되지 않습니다. 버전 파일이 없으면(아직 한 번도
+동기화 완료를 기록하지 않음) 답변의 신선도를 판단할 수 없으므로 캐시를 사용하지 않습니다.
+
+저장소는 CHATBOT_STATE_TABLE(DynamoDB)이 있으면 컨테이너 간에 공유하고, 아니면 프로세스 내 저장소를
+사용합니다. 출처가 없는 답변(Perplexity 폴백)과 "cacheable": False로 표시한 답변(Bedrock 장애 시
+BM25 추출형 답변 등)은 저장하지 않습니다.
+
+캐시 조회 결과는 질문 로그 줄(event=chat_query)에 함께 기록되어 사전 적재(prewarm.py)가
+인기 질문 추출과 적중률 보고에 사용합니다.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from news_data import NEWS_DATA_BUCKET
+from singleflight import coalesce_key, normalize_question
+from stores import InMemoryStore, get_shared_store
+
+logger = logging.getLogger()
+
+DATA_VERSION_KEY = os.environ.get("DATA_VERSION_KEY", "news-index/data-version.json")
+ANSWER_CACHE_ENABLED = os.environ.get("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_TTL_SECONDS = int(os.environ.get("ANSWER_CACHE_TTL_SECONDS", "3600"))
+# 데이터 버전 파일을 다시 읽는 주기
+DATA_VERSION_REFRESH_SECONDS = int(os.environ.get("DATA_VERSION_REFRESH_SECONDS", "60"))
+
+
+class DataVersion:
+    """S3 데이터 버전 파일을 주기적으로 다시 읽는 조회기"""
+
+    def __init__(self, refresh_seconds: int = DATA_VERSION_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._version: Optional[str] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self, s3_client) -> Optional[str]:
+        with self._lock:
+            if time.time() - self._loaded_at < self.refresh_seconds:
+                return self._version
+            # 다른 스레드가 같은 주기에 다시 읽지 않도록 먼저 갱신 시각을 기록
+            self._loaded_at = time.time()
+
+        try:
+            response = s3_client.get_object(Bucket=NEWS_DATA_BUCKET, Key=DATA_VERSION_KEY)
+            version = json.loads(response["Body"].read()).get("version")
+        except Exception as e:
+            logger.info(f"Data version unavailable: {e}")
+            version = self._version
+
+        with self._lock:
+            self._version = version
+        return version
+
+
+class AnswerCache:
+    """데이터 버전별 답변 캐시"""
+
+    def __init__(self, store, data_version: DataVersion, ttl_seconds: int = ANSWER_CACHE_TTL_SECONDS):
+        self.store = store
+        # 컨테이너 간 공유 저장소인지 (프로세스 내 저장소면 사전 적재가 호출받은 컨테이너에만 남음)
+        self.shared = not isinstance(store, InMemoryStore)
+        self.data_version = data_version
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hit": 0, "miss": 0, "bypass": 0}
+
+    @staticmethod
+    def key(version: str, question: str) -> str:
+        return f"ans:{version}:{coalesce_key(question)}"
+
+    def get(self, s3_client, question: str) -> Optional[Dict[str, Any]]:
+        """현재 데이터 버전의 캐시된 답변을 반환합니다. 없거나 캐시를 쓸 수 없으면 None."""
+        version = self.data_version.current(s3_client)
+        if version is None:
+            self._record("bypass")
+            return None
+        try:
+            cached = self.store.get(self.key(version, question))
+        except Exception as e:
+            logger.warning(f"Answer cache read failed: {e}")
+            cached = None
+        self._record("hit" if cached is not None else "miss")
+        return cached
+
+    def put(self, s3_client, question: str, result: Dict[str, Any], version: Optional[str] = None) -> bool:
+        """답변을 저장합니다. version을 주지 않으면 현재 데이터 버전에 저장합니다."""
+        version = version or self.data_version.current(s3_client)
+        if version is None or not result.get("sources") or not result.get("cacheable", True):
+            return False
+        try:
+            self.store.put(self.key(version, question), result, self.ttl_seconds)
+            return True
+        except Exception as e:
+            logger.warning(f"Answer cache write failed: {e}")
+            return False
+
+    def _record(self, status: str) -> None:
+        with self._lock:
+            self._stats[status] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """이 프로세스의 누적 적중/실패 수와 적중률 (버전 없음으로 건너뛴 조회 제외)"""
+        with self._lock:
+            stats = dict(self._stats)
+        looked_up = stats["hit"] + stats["miss"]
+        stats["hit_rate"] = round(stats["hit"] / looked_up, 4) if looked_up else 0.0
+        return stats
+
+
+def log_query(question: str, cache_status: str, version: Optional[str]) -> None:
+    """사전 적재 작업이 CloudWatch Logs Insights로 읽는 질문 로그 한 줄을 출력합니다."""
+    print(json.dumps({
+        "event": "chat_query",
+        "question": normalize_question(question),
+        "cache": cache_status,
+        "data_version": version or "",
+    }, ensure_ascii=False), flush=True)
+
+
+_answer_cache: Optional[AnswerCache] = None
+_init_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """프로세스 전역 답변 캐시를 지연 생성합니다. 비활성화되어 있으면 None."""
+    global _answer_cache
+
+    if not ANSWER_CACHE_ENABLED:
+        return None
+    if _answer_cache is None:
+        with _init_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache(get_shared_store() or InMemoryStore(), DataVersion())
+    return _answer_cache
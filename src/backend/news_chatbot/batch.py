@@ -0,0 +1,156 @@
+"""
+Batch Chat Processing
+
+/chat/batch 요청의 여러 질문을 한 번의 호출에서 처리합니다.
+
+- 같은 질문(정규화 기준)은 한 번만 처리해 결과를 나눠 씁니다.
+- 배치 범위 메모(RequestMemo)를 contextvar로 전달해, 질문 분석·검색어 확장·KB 검색·S3 원본 읽기를
+  배치 전체에서 키별로 한 번만 실행합니다. 동시에 같은 키를 요청하면 먼저 시작한 계산을 기다립니다.
+- 생성 단계는 BATCH_MAX_WORKERS 크기의 스레드 풀에서 병렬로 실행하고, 결과는 입력 순서대로 반환합니다.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from singleflight import normalize_question
+
+logger = logging.getLogger()
+
+BATCH_MAX_QUESTIONS = int(os.environ.get("BATCH_MAX_QUESTIONS", "50"))
+BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", "8"))
+
+
+class _Entry:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestMemo:
+    """배치 하나 동안 유지되는 키별 계산 결과 메모 (동시 요청은 첫 계산을 기다림)"""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def seed(self, key: Hashable, value: Any) -> None:
+        """미리 계산한 값을 등록합니다 (예: 일괄 질문 분석 결과)."""
+        entry = _Entry()
+        entry.value = value
+        entry.done.set()
+        with self._lock:
+            self._entries.setdefault(key, entry)
+
+    def get_or_compute(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = _Entry()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if owner:
+            try:
+                entry.value = fn()
+            except BaseException as e:
+                entry.error = e
+                raise
+            finally:
+                entry.done.set()
+        else:
+            entry.done.wait()
+        if entry.error is not None:
+            raise entry.error
+        return entry.value
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_current_memo: "contextvars.ContextVar[Optional[RequestMemo]]" = contextvars.ContextVar("batch_memo", default=None)
+
+
+def memoized(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """배치 처리 중이면 배치 메모를 거쳐, 아니면 바로 fn()을 실행합니다."""
+    memo = _current_memo.get()
+    if memo is None:
+        return fn()
+    return memo.get_or_compute(key, fn)
+
+
+def seed(key: Hashable, value: Any) -> None:
+    """배치 처리 중이면 미리 계산한 값을 배치 메모에 등록합니다."""
+    memo = _current_memo.get()
+    if memo is not None:
+        memo.seed(key, value)
+
+
+def run_batch(questions: List[str], answer_fn: Callable[[str], Dict[str, Any]],
+              error_fn: Callable[[Exception], Dict[str, Any]],
+              prepare_fn: Optional[Callable[[List[str]], None]] = None,
+              max_workers: int = BATCH_MAX_WORKERS) -> Dict[str, Any]:
+    """
+    질문 목록을 처리해 입력 순서대로 결과를 반환합니다.
+
+    Args:
+        questions: 검증을 마친 질문 목록
+        answer_fn: 질문 하나를 처리하는 함수 (실패 시 예외)
+        error_fn: 예외를 항목별 오류 객체로 바꾸는 함수
+        prepare_fn: 고유 질문 목록을 받아 일괄 사전 처리(질문 분석 등)를 수행하는 함수
+    """
+    started = time.time()
+    memo = RequestMemo()
+
+    distinct: Dict[str, str] = {}
+    for question in questions:
+        distinct.setdefault(normalize_question(question), question)
+    unique_questions = list(distinct.values())
+
+    token = _current_memo.set(memo)
+    try:
+        if prepare_fn is not None:
+            try:
+                prepare_fn(unique_questions)
+            except Exception as e:
+                logger.warning(f"Batch preparation failed, continuing per question: {e}")
+
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_questions))),
+                                thread_name_prefix="batch") as pool:
+            futures = {
+                key: pool.submit(contextvars.copy_context().run, answer_fn, question)
+                for key, question in zip(distinct.keys(), unique_questions)
+            }
+            for key, future in futures.items():
+                try:
+                    outcomes[key] = future.result()
+                except Exception as e:
+                    outcomes[key] = error_fn(e)
+    finally:
+        _current_memo.reset(token)
+
+    results = []
+    for position, question in enumerate(questions):
+        outcome = dict(outcomes[normalize_question(question)], question=question)
+        outcome["index"] = position
+        results.append(outcome)
+
+    stats = {
+        "questions": len(questions),
+        "distinct_questions": len(unique_questions),
+        "errors": sum(1 for result in results if "error" in result),
+        "memo": memo.stats(),
+        "elapsed_ms": int((time.time() - started) * 1000),
+    }
+    logger.info(f"Batch processed: {stats}")
+    return {"results": results, "stats": stats}
@@ -0,0 +1,414 @@
+"""
+Local BM25 Fallback Index
+
+Bedrock Knowledge Base 검색이 실패하거나 스로틀링될 때 사용하는 로컬 BM25 역색인입니다.
+news-data-md JSONL 파일에서 오프라인으로 구축하며, 한국어 문자 bigram을 색인어로 씁니다.
+
+아티팩트(단일 파일) 구조
+    b"BM25IDX2"                     magic
+    uint64 little-endian            header 길이
+    header JSON (UTF-8)             num_docs, num_terms, avgdl, k1, b, sections{이름: [시작 바이트, 길이(바이트)]}
+    섹션 (각각 4바이트 정렬, 0 padding)
+        term_offsets    uint32[num_terms + 1]   term_blob 안 색인어별 시작 위치
+        term_blob       UTF-8                   정렬된 색인어를 이어 붙인 것
+        term_postings   uint32[num_terms * 2]   색인어별 (postings 시작 word, df)
+        postings        uint32[]                색인어별 (doc_id, tf) 쌍이 연속 저장
+        doc_lengths     uint32[num_docs]        문서 길이
+        doc_offsets     uint32[num_docs + 1]    doc_blob 안 문서별 시작 위치
+        doc_blob        UTF-8                   문서별 JSON 배열 [title, date, url, category, s3_uri, text]
+
+헤더에는 크기가 고정된 값만 두고, 색인어 사전과 문서 메타데이터도 mmap 위의 오프셋 표로 둡니다.
+색인어는 정렬된 term_blob에서 이진 탐색으로 찾고, 문서는 결과에 오른 것만 잘라 디코딩하므로
+로딩 시 힙에 올리는 것은 헤더뿐입니다. 모든 uint32 영역은 memoryview.cast("I")로 복사 없이 읽습니다.
+
+오프라인 구축 예)
+    aws s3 sync s3://seoul-economic-news-data-2025/news-data-md/ corpus/ --exclude "*" --include "*.jsonl"
+    python bm25_index.py --input_dir corpus --output bm25.idx
+    aws s3 cp bm25.idx s3://seoul-economic-news-data-2025/news-index/bm25/bm25.idx
+"""
+
+import argparse
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from news_data import NEWS_DATA_BUCKET
+
+logger = logging.getLogger()
+
+BM25_INDEX_KEY = os.environ.get("BM25_INDEX_KEY", "news-index/bm25/bm25.idx")
+BM25_INDEX_LOCAL_PATH = os.environ.get("BM25_INDEX_LOCAL_PATH", "/tmp/bm25.idx")
+BM25_REFRESH_SECONDS = int(os.environ.get("BM25_REFRESH_SECONDS", "3600"))
+
+MAGIC = b"BM25IDX2"
+K1 = 1.2
+B = 0.75
+
+# 전체 문서의 일정 비율 이상에 나타나는 색인어는 불용어로 보고 조회하지 않음
+MAX_DF_RATIO = 0.3
+
+# 답변 생성에 사용할 문서 본문 최대 크기 (KB 청크 크기와 동일)
+DOC_TEXT_MAX_BYTES = 700
+
+# 파일에 쓰는 순서 (uint32 영역과 UTF-8 영역)
+SECTIONS = ("term_offsets", "term_blob", "term_postings", "postings", "doc_lengths", "doc_offsets", "doc_blob")
+UINT32_SECTIONS = {"term_offsets", "term_postings", "postings", "doc_lengths", "doc_offsets"}
+
+
+def tokenize(text: str) -> List[str]:
+    """단어 내부 문자 bigram(한 글자 단어는 unigram) 목록을 반환합니다."""
+    tokens = []
+    for word in text.lower().split():
+        word = "".join(ch for ch in word if ch.isalnum())
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    mmap 기반 BM25 역색인
+
+    갱신으로 교체된 색인은 retire()로 닫습니다. 다른 스레드가 아직 검색 중이면 그 검색이 끝난 뒤 닫습니다.
+    """
+
+    def __init__(self, path: str, etag: str = ""):
+        self.path = path
+        self.etag = etag
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        self._readers = 0
+        self._retired = False
+        self._closed = False
+        self._state_lock = threading.Lock()
+
+        try:
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a BM25 index file: {path}")
+            (header_len,) = struct.unpack_from("<Q", self._mmap, len(MAGIC))
+            header_start = len(MAGIC) + 8
+            header = json.loads(self._mmap[header_start:header_start + header_len].decode("utf-8"))
+
+            self.num_docs = header["num_docs"]
+            self.num_terms = header["num_terms"]
+            self.avgdl = header["avgdl"]
+            self.k1 = header.get("k1", K1)
+            self.b = header.get("b", B)
+
+            sections = {}
+            for name in SECTIONS:
+                offset, size = header["sections"][name]
+                view = memoryview(self._mmap)[offset:offset + size]
+                sections[name] = view.cast("I") if name in UINT32_SECTIONS else view
+                self._views.append(view)
+                if name in UINT32_SECTIONS:
+                    self._views.append(sections[name])
+        except Exception:
+            self.close()
+            raise
+
+        self.term_offsets = sections["term_offsets"]
+        self.term_blob = sections["term_blob"]
+        self.term_postings = sections["term_postings"]
+        self.postings = sections["postings"]
+        self.doc_lengths = sections["doc_lengths"]
+        self.doc_offsets = sections["doc_offsets"]
+        self.doc_blob = sections["doc_blob"]
+
+    def _term_at(self, i: int) -> bytes:
+        return self.term_blob[self.term_offsets[i]:self.term_offsets[i + 1]].tobytes()
+
+    def lookup(self, term: str) -> Optional[Tuple[int, int]]:
+        """색인어의 (postings 시작 word, df)를 정렬된 사전에서 이진 탐색으로 찾습니다."""
+        key = term.encode("utf-8")
+        lo, hi = 0, self.num_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.num_terms and self._term_at(lo) == key:
+            return self.term_postings[lo * 2], self.term_postings[lo * 2 + 1]
+        return None
+
+    def document(self, doc_id: int) -> List[str]:
+        """[title, date, url, category, s3_uri, text]"""
+        return json.loads(self.doc_blob[self.doc_offsets[doc_id]:self.doc_offsets[doc_id + 1]].tobytes())
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """질문을 색인어로 분해해 BM25 점수 상위 top_k 문서 (doc_id, score)를 반환합니다."""
+        max_df = max(1, int(self.num_docs * MAX_DF_RATIO))
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            entry = self.lookup(term)
+            if entry is None:
+                continue
+            offset, df = entry
+            if df > max_df:
+                continue
+
+            idf = math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+            postings = self.postings[offset:offset + df * 2]
+            for i in range(0, df * 2, 2):
+                doc_id, tf = postings[i], postings[i + 1]
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    def to_retrieval_results(self, hits: List[Tuple[int, float]]) -> List[Dict[str, Any]]:
+        """검색 결과를 Bedrock retrieve API의 retrievalResults 형식으로 변환합니다."""
+        results = []
+        for doc_id, score in hits:
+            title, date, url, category, s3_uri, text = self.document(doc_id)
+            results.append({
+                "content": {"text": text},
+                "location": {"type": "S3", "s3Location": {"uri": s3_uri}},
+                "metadata": {
+                    "title": title,
+                    "date": date,
+                    "url": url,
+                    "category": category,
+                    "source": "bm25-fallback"
+                },
+                "score": score
+            })
+        return results
+
+    @contextmanager
+    def reading(self):
+        """검색하는 동안 색인이 닫히지 않도록 합니다. 이미 닫힌 색인이면 ValueError."""
+        with self._state_lock:
+            if self._closed:
+                raise ValueError(f"BM25 index is closed: {self.path}")
+            self._readers += 1
+        try:
+            yield self
+        finally:
+            with self._state_lock:
+                self._readers -= 1
+                close_now = self._retired and self._readers == 0
+            if close_now:
+                self.close()
+
+    def retire(self) -> None:
+        """교체된 색인을 닫습니다. 검색 중인 스레드가 있으면 마지막 검색이 끝날 때 닫습니다."""
+        with self._state_lock:
+            self._retired = True
+            close_now = self._readers == 0
+        if close_now:
+            self.close()
+
+    def close(self) -> None:
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+        for view in reversed(self._views):
+            view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+# ---------------------------------------------------------------------------
+# Offline build
+# ---------------------------------------------------------------------------
+
+def _iter_jsonl_documents(input_dir: Path, bucket: str, prefix: str) -> Iterator[List[str]]:
+    """JSONL 파일을 읽어 [title, date, url, category, s3_uri, text] 문서를 생성합니다."""
+    for jsonl_path in sorted(input_dir.rglob("*.jsonl")):
+        rel_path = jsonl_path.relative_to(input_dir).as_posix()
+        default_uri = f"s3://{bucket}/{prefix}/{rel_path[:-len('.jsonl')]}.md"
+        with jsonl_path.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                text = (record.get("chunk") or "").strip()
+                if not text:
+                    continue
+                s3_uri = f"s3://{bucket}/{prefix}/{record['path']}" if record.get("path") else default_uri
+                yield [
+                    (record.get("title") or "").strip(),
+                    (record.get("date") or "")[:10],
+                    record.get("url") or "",
+                    record.get("category") or "",
+                    s3_uri,
+                    text.encode("utf-8")[:DOC_TEXT_MAX_BYTES].decode("utf-8", errors="ignore"),
+                ]
+
+
+def build_index(input_dir: Path, output_path: Path, bucket: str = NEWS_DATA_BUCKET,
+                prefix: str = "news-data-md") -> Dict[str, Any]:
+    """JSONL 코퍼스로 BM25 색인 파일을 만듭니다. 제목은 본문과 함께 색인합니다."""
+    doc_lengths = array("I")
+    doc_offsets = array("I", [0])
+    doc_blob = bytearray()
+    term_postings: Dict[str, array] = {}
+
+    for doc in _iter_jsonl_documents(input_dir, bucket, prefix):
+        doc_id = len(doc_lengths)
+        title, text = doc[0], doc[5]
+        counts = Counter(tokenize(f"{title} {text}"))
+        for term, tf in counts.items():
+            postings = term_postings.get(term)
+            if postings is None:
+                postings = term_postings[term] = array("I")
+            postings.append(doc_id)
+            postings.append(tf)
+        doc_blob += json.dumps(doc, ensure_ascii=False).encode("utf-8")
+        doc_offsets.append(len(doc_blob))
+        doc_lengths.append(sum(counts.values()))
+
+    # 색인어는 UTF-8 바이트 순서(= 코드 포인트 순서)로 정렬해 이진 탐색
+    term_offsets = array("I", [0])
+    term_blob = bytearray()
+    term_entries = array("I")
+    postings_blob = array("I")
+    for term in sorted(term_postings):
+        postings = term_postings[term]
+        term_blob += term.encode("utf-8")
+        term_offsets.append(len(term_blob))
+        term_entries.append(len(postings_blob))
+        term_entries.append(len(postings) // 2)
+        postings_blob.extend(postings)
+
+    if postings_blob.itemsize != 4:
+        raise RuntimeError("array('I') must be 4 bytes on this platform")
+    blobs = {
+        "term_offsets": term_offsets.tobytes(),
+        "term_blob": bytes(term_blob),
+        "term_postings": term_entries.tobytes(),
+        "postings": postings_blob.tobytes(),
+        "doc_lengths": doc_lengths.tobytes(),
+        "doc_offsets": doc_offsets.tobytes(),
+        "doc_blob": bytes(doc_blob),
+    }
+    num_docs = len(doc_lengths)
+    header_fields = {
+        "num_docs": num_docs,
+        "num_terms": len(term_entries) // 2,
+        "avgdl": (sum(doc_lengths) / num_docs) if num_docs else 1.0,
+        "k1": K1,
+        "b": B,
+    }
+
+    # 섹션 위치는 헤더 길이에 따라 달라지므로, 위치 자릿수를 넉넉히 잡은 헤더로 크기를 정한 뒤 채움
+    def encode_header(sections: Dict[str, List[int]]) -> bytes:
+        return json.dumps({**header_fields, "sections": sections}, ensure_ascii=False).encode("utf-8")
+
+    placeholder = encode_header({name: [2 ** 63, len(blob)] for name, blob in blobs.items()})
+    position = len(MAGIC) + 8 + len(placeholder)
+    sections = {}
+    for name in SECTIONS:
+        position += (-position) % 4
+        sections[name] = [position, len(blobs[name])]
+        position += len(blobs[name])
+    header = encode_header(sections)
+    header += b" " * (len(placeholder) - len(header))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for name in SECTIONS:
+            f.write(b"\0" * ((-f.tell()) % 4))
+            assert f.tell() == sections[name][0]
+            f.write(blobs[name])
+
+    return {"num_docs": num_docs, "num_terms": header_fields["num_terms"], "bytes": output_path.stat().st_size}
+
+
+# ---------------------------------------------------------------------------
+# Lambda-side loading
+# ---------------------------------------------------------------------------
+
+_index: Optional[BM25Index] = None
+_last_checked = 0.0
+_lock = threading.Lock()
+
+
+def get_bm25_index(s3_client) -> Optional[BM25Index]:
+    """BM25 색인을 지연 로딩합니다. BM25_REFRESH_SECONDS마다 S3 ETag로 갱신 여부를 확인합니다."""
+    global _index, _last_checked
+
+    now = time.time()
+    if _index is not None and now - _last_checked < BM25_REFRESH_SECONDS:
+        return _index
+
+    with _lock:
+        if _index is not None and now - _last_checked < BM25_REFRESH_SECONDS:
+            return _index
+        _last_checked = now
+        try:
+            head = s3_client.head_object(Bucket=NEWS_DATA_BUCKET, Key=BM25_INDEX_KEY)
+            etag = head.get("ETag", "")
+            if _index is None or _index.etag != etag:
+                started = time.time()
+                staging_path = f"{BM25_INDEX_LOCAL_PATH}.staging"
+                s3_client.download_file(NEWS_DATA_BUCKET, BM25_INDEX_KEY, staging_path)
+                os.replace(staging_path, BM25_INDEX_LOCAL_PATH)
+                previous, _index = _index, BM25Index(BM25_INDEX_LOCAL_PATH, etag)
+                if previous is not None:
+                    previous.retire()
+                logger.info(
+                    f"Loaded BM25 fallback index: {_index.num_docs} docs, {_index.num_terms} terms "
+                    f"in {(time.time() - started) * 1000:.0f}ms"
+                )
+        except Exception as e:
+            logger.warning(f"BM25 fallback index unavailable: {e}")
+    return _index
+
+
+def search_bm25(s3_client, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """BM25 색인으로 검색해 retrievalResults 형식의 결과를 반환합니다."""
+    index = get_bm25_index(s3_client)
+    if index is None:
+        return []
+
+    started = time.time()
+    try:
+        with index.reading():
+            results = index.to_retrieval_results(index.search(query, top_k=top_k))
+    except ValueError:
+        # 조회 직전에 갱신으로 닫힌 색인이면 새 색인으로 다시 검색
+        index = get_bm25_index(s3_client)
+        with index.reading():
+            results = index.to_retrieval_results(index.search(query, top_k=top_k))
+    logger.info(f"BM25 fallback returned {len(results)} results in {(time.time() - started) * 1000:.1f}ms")
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="news-data-md JSONL → BM25 폴백 색인 빌더")
+    ap.add_argument("--input_dir", required=True, help="news-data-md JSONL 로컬 미러 디렉터리")
+    ap.add_argument("--output", required=True, help="출력 색인 파일 경로")
+    ap.add_argument("--bucket", default=NEWS_DATA_BUCKET, help="원본 마크다운 S3 버킷")
+    ap.add_argument("--prefix", default="news-data-md", help="원본 마크다운 S3 prefix")
+    args = ap.parse_args()
+
+    started = time.time()
+    stats = build_index(Path(args.input_dir), Path(args.output), args.bucket, args.prefix)
+    print(f"[완료] {args.output} 생성: 문서 {stats['num_docs']}개, 색인어 {stats['num_terms']}개, "
+          f"{stats['bytes'] / 1024 / 1024:.1f}MB, {time.time() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Daily Category Digest Router
+
+"오늘 경제 주요 뉴스", "어제 IT 뉴스 정리해줘" 같은 질문을 질문 분석·KB 검색·생성 없이
+news_fetcher가 수집 시 만들어 둔 다이제스트(S3 JSON 한 개)로 바로 답합니다.
+
+    s3://{NEWS_DATA_BUCKET}/{DIGEST_PREFIX}/{YYYY-MM-DD}/{카테고리}.json
+
+의도 판정은 규칙 기반입니다. 날짜 표현 + 카테고리 + "주요 뉴스"류 표현이 모두 있고 그 밖의
+내용어가 없을 때만 다이제스트 질문으로 봅니다 ("오늘 경제 뉴스 중 삼성전자 관련"은 일반 검색).
+다이제스트가 없으면 None을 반환하고 일반 파이프라인으로 넘어갑니다.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from news_data import NEWS_DATA_BUCKET
+from spell_corrector import WORD_RE, split_josa
+
+logger = logging.getLogger()
+
+DIGEST_PREFIX = os.environ.get("DIGEST_PREFIX", "news-index/digests")
+DIGEST_ENABLED = os.environ.get("DIGEST_ENABLED", "true").lower() == "true"
+DIGEST_CACHE_TTL_SECONDS = int(os.environ.get("DIGEST_CACHE_TTL_SECONDS", "300"))
+
+KST = timezone(timedelta(hours=9))
+
+RELATIVE_DAYS = {"오늘": 0, "금일": 0, "어제": 1, "전날": 1, "그제": 2, "그저께": 2}
+MONTH_DAY_RE = re.compile(r"(?:(20\d{2})\s*년\s*)?(\d{1,2})\s*월\s*(\d{1,2})\s*일")
+ISO_DATE_RE = re.compile(r"(20\d{2})-(\d{2})-(\d{2})")
+
+# 질문 표현 → news_fetcher 카테고리명
+CATEGORY_ALIASES = {
+    "정치": "정치",
+    "경제": "경제",
+    "사회": "사회",
+    "문화": "문화",
+    "국제": "국제", "세계": "국제", "해외": "국제",
+    "지역": "지역",
+    "스포츠": "스포츠",
+    "it": "IT_과학", "과학": "IT_과학", "it_과학": "IT_과학", "테크": "IT_과학", "it과학": "IT_과학",
+}
+
+DIGEST_INTENT_RE = re.compile(r"주요\s*(뉴스|기사|소식|이슈)|헤드라인|뉴스\s*(요약|정리|브리핑)|톱\s*뉴스|무슨\s*일|어떤\s*일")
+
+# 다이제스트 질문에 함께 올 수 있는 표현 (이 밖의 내용어가 있으면 일반 검색)
+ALLOWED_WORDS = {
+    "주요", "뉴스", "기사", "소식", "이슈", "헤드라인", "요약", "정리", "브리핑", "톱", "알려줘", "알려주세요",
+    "보여줘", "보여주세요", "뭐야", "뭐예요", "뭐", "무슨", "어떤", "일", "있었어", "있었나요", "있어", "있나요",
+    "분야", "부문", "섹션", "카테고리", "서울경제", "해줘", "해주세요", "주세요", "줘", "좀", "년", "월",
+}
+
+
+# "정리해줘", "알려주세요" 같은 요청 어미
+REQUEST_SUFFIX_RE = re.compile(r"(해\s*주세요|해\s*줘|주세요|줘|해)$")
+
+
+def _today() -> datetime:
+    return datetime.now(KST)
+
+
+def resolve_date(question: str, now: Optional[datetime] = None) -> Optional[str]:
+    """질문의 날짜 표현을 YYYY-MM-DD(KST)로 바꿉니다. 날짜 표현이 없으면 None."""
+    now = now or _today()
+    for word, days in RELATIVE_DAYS.items():
+        if word in question:
+            return (now - timedelta(days=days)).strftime("%Y-%m-%d")
+
+    iso = ISO_DATE_RE.search(question)
+    if iso:
+        return iso.group(0)
+
+    month_day = MONTH_DAY_RE.search(question)
+    if month_day:
+        year = int(month_day.group(1) or now.year)
+        try:
+            return datetime(year, int(month_day.group(2)), int(month_day.group(3))).strftime("%Y-%m-%d")
+        except ValueError:
+            return None
+    return None
+
+
+def match_digest_intent(question: str, now: Optional[datetime] = None) -> Optional[Tuple[str, str]]:
+    """다이제스트로 답할 질문이면 (날짜, 카테고리)를, 아니면 None을 반환합니다."""
+    if not DIGEST_INTENT_RE.search(question):
+        return None
+    date_str = resolve_date(question, now)
+    if not date_str:
+        return None
+
+    category = None
+    for token in WORD_RE.findall(question.lower()):
+        stem, _ = split_josa(token)
+        if stem in CATEGORY_ALIASES and category is None:
+            category = CATEGORY_ALIASES[stem]
+            continue
+        base = REQUEST_SUFFIX_RE.sub("", stem) or stem
+        if (stem in RELATIVE_DAYS or token in RELATIVE_DAYS or stem in ALLOWED_WORDS or token in ALLOWED_WORDS
+                or base in ALLOWED_WORDS or re.fullmatch(r"\d+(년|월|일)?", stem)):
+            continue
+        # 다이제스트로 답할 수 없는 구체적 내용어
+        return None
+
+    return (date_str, category) if category else None
+
+
+class _DigestCache:
+    """(날짜, 카테고리) → 다이제스트 TTL 캐시. 없는 다이제스트도 캐시해 반복 조회를 막습니다."""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._items: Dict[Tuple[str, str], Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, s3_client, date_str: str, category: str) -> Optional[Dict[str, Any]]:
+        key = (date_str, category)
+        now = time.time()
+        with self._lock:
+            cached = self._items.get(key)
+            if cached and now - cached[0] < self.ttl_seconds:
+                return cached[1]
+
+        digest = None
+        try:
+            response = s3_client.get_object(Bucket=NEWS_DATA_BUCKET, Key=f"{DIGEST_PREFIX}/{date_str}/{category}.json")
+            digest = json.loads(response["Body"].read())
+        except Exception as e:
+            logger.info(f"Digest unavailable for {date_str}/{category}: {e}")
+
+        with self._lock:
+            self._items[key] = (now, digest)
+        return digest
+
+
+_cache = _DigestCache(DIGEST_CACHE_TTL_SECONDS)
+
+
+def preload_digests(s3_client, days: int = 2) -> int:
+    """오늘부터 days일 동안의 모든 카테고리 다이제스트를 캐시에 적재하고, 존재하는 다이제스트 수를 반환합니다."""
+    today = _today()
+    loaded = 0
+    for offset in range(days):
+        date_str = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+        for category in sorted(set(CATEGORY_ALIASES.values())):
+            if _cache.get(s3_client, date_str, category):
+                loaded += 1
+    return loaded
+
+
+def format_digest_answer(digest: Dict[str, Any]) -> str:
+    """다이제스트를 각주가 달린 답변 문단으로 만듭니다. 각주 번호는 sources 순서와 같습니다."""
+    lines = [f"{digest['date']} {digest['category'].replace('_', '/')} 분야 주요 뉴스입니다."]
+    for entry in digest.get("articles", []):
+        detail = entry.get("summary") or entry.get("lead") or ""
+        lines.append(f"{entry['rank']}. {entry['title']}" + (f" – {detail}" if detail else "") + f" [{entry['rank']}]")
+    return "\n".join(lines)
+
+
+def answer_from_digest(s3_client, question: str) -> Optional[Dict[str, Any]]:
+    """다이제스트 질문이면 다이제스트로 만든 결과를, 아니면 None을 반환합니다."""
+    if not DIGEST_ENABLED:
+        return None
+    intent = match_digest_intent(question)
+    if intent is None:
+        return None
+
+    started = time.time()
+    digest = _cache.get(s3_client, *intent)
+    if not digest or not digest.get("articles"):
+        return None
+
+    logger.info(f"Answered from daily digest {intent} in {(time.time() - started) * 1000:.0f}ms")
+    return {
+        "answer": format_digest_answer(digest),
+        "sources": digest.get("sources", []),
+        "question": question,
+        "timestamp": datetime.utcnow().isoformat(),
+        "enhanced_search": False,
+        # 후속 질문 재사용(세션)을 위한 기사별 요약
+        "_context": [{"s3_uri": entry.get("s3_uri", ""), "text": entry.get("summary") or entry.get("lead", "")}
+                     for entry in digest["articles"]],
+    }
@@ -0,0 +1,266 @@
+"""
+Corpus-mined Entity Expansion
+
+뉴스 코퍼스에서 오프라인으로 추출한 개체 동시출현(co-occurrence) 사전으로 검색어를 확장합니다.
+예) 삼성전자 → 반도체, 삼성SDI, 파운드리
+
+expand_query_with_ai가 매 요청 Haiku를 호출하던 계열사·관련 키워드 확장을, 질문의 개체가
+모두 사전에 있을 때만 로컬에서 처리합니다. 사전에 없는 개체가 하나라도 있으면 LLM으로 넘깁니다.
+
+개체(사전 키)는 제목 어간 중 실제 기업·기관명만 씁니다.
+    --entity_list 파일(한 줄에 이름 하나, 예: KRX 상장회사 목록)이 있으면 그 목록에 있는 어간,
+    없으면 기업·기관명 꼴(영문 포함 또는 "전자"·"은행"·"증권" 같은 접미사로 끝남)인 어간.
+주가·전망·금리처럼 자주 나오는 일반어는 개체가 아니라 common_terms로 따로 저장합니다.
+질문 어간이 개체도, 일반어도, 질문 표현도 아니면 사전에 없는 개체로 봅니다.
+
+연관도는 지역 상호정보량(local mutual information)으로 계산합니다.
+    score(a, b) = cooc(a, b) × log(N × cooc(a, b) / (df(a) × df(b)))
+
+오프라인 사전 구축 예)
+    python entity_expansion.py --input_dir corpus --entity_list krx_companies.txt --output entity_expansion.json
+    aws s3 cp entity_expansion.json s3://seoul-economic-news-data-2025/news-index/entities/entity_expansion.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from news_data import NEWS_DATA_BUCKET
+from spell_corrector import WORD_RE, split_josa
+
+logger = logging.getLogger()
+
+ENTITY_EXPANSION_KEY = os.environ.get("ENTITY_EXPANSION_KEY", "news-index/entities/entity_expansion.json")
+
+# 로컬 확장 시 추가할 최대 키워드 수 (기존 프롬프트의 "최대 3-4개" 규칙과 동일)
+MAX_EXPANSION_TERMS = 4
+
+# 개체 후보에서 제외할 뉴스 상투어
+STOPWORDS = {
+    "기자", "서울경제", "뉴스", "오늘", "어제", "지난", "이번", "올해", "작년", "대한", "위해", "관련", "통해",
+    "대해", "따르면", "밝혔다", "있다", "했다", "것으로", "것이다", "이라고", "라고", "등을", "전년", "이후",
+    "최근", "현재", "가장", "함께", "또한", "하지만", "그러나", "이에", "있는", "없는", "하는", "된다", "한다",
+}
+
+# 관련어 후보로 사용할 본문 앞부분 길이 (리드 문단)
+LEAD_CHARS = 300
+
+# --entity_list가 없을 때 기업·기관명으로 보는 어간 접미사 (접미사보다 긴 어간만)
+ENTITY_SUFFIXES = (
+    "전자", "그룹", "은행", "증권", "금융", "지주", "홀딩스", "건설", "화학", "자동차", "모비스", "제약",
+    "바이오", "생명", "보험", "화재", "카드", "캐피탈", "중공업", "조선", "에너지", "물산", "상사", "전기",
+    "통신", "텔레콤", "항공", "해운", "제철", "스틸", "하이닉스", "디스플레이", "엔터", "솔루션", "테크",
+    "소프트", "반도체", "공사", "공단", "위원회", "거래소", "연구원",
+)
+
+# 질문에서 개체로 보지 않는 표현 (질문·요청 어미와 시점 표현)
+QUERY_STOPWORDS = {
+    "알려줘", "알려주세요", "알려", "설명해줘", "설명", "정리해줘", "정리", "요약해줘", "요약", "어때", "어떻게",
+    "어떤", "무엇", "뭐야", "뭔가요", "왜", "언제", "누구", "얼마", "어디", "있나요", "인가요", "되나요",
+    "요즘", "지금", "내일", "이번주", "지난주", "작년", "올해", "최근", "오늘", "어제", "소식", "이슈",
+}
+QUERY_ENDINGS = ("줘", "주세요", "나요", "까요", "가요", "니까", "해요", "세요", "는지", "을까", "할까")
+
+
+def looks_like_entity(stem: str) -> bool:
+    """--entity_list가 없을 때 쓰는 기업·기관명 판별 (영문 포함 또는 기관 접미사)"""
+    if any("A" <= ch.upper() <= "Z" for ch in stem):
+        return True
+    return any(stem.endswith(suffix) and len(stem) > len(suffix) for suffix in ENTITY_SUFFIXES)
+
+
+def load_entity_list(path: Path) -> Set[str]:
+    """한 줄에 이름 하나인 개체 목록 파일을 읽습니다 (조사 분리와 같은 기준으로 정규화)."""
+    names = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        name = "".join(WORD_RE.findall(line.strip()))
+        if len(name) >= 2:
+            names.add(name)
+    return names
+
+
+def _terms(text: str) -> Set[str]:
+    """텍스트에서 조사를 뗀 두 글자 이상 어간 집합을 추출합니다."""
+    terms = set()
+    for token in WORD_RE.findall(text):
+        stem, _ = split_josa(token)
+        if len(stem) >= 2 and stem not in STOPWORDS and not stem.isdigit():
+            terms.add(stem)
+    return terms
+
+
+def build_expansion_map(input_dir: Path, min_df: int = 20, min_cooc: int = 5,
+                        max_entities: int = 5000, max_related: int = 5,
+                        entity_names: Optional[Set[str]] = None,
+                        max_common_terms: int = 20000) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    JSONL 코퍼스에서 (개체 → 연관 키워드 사전, 일반어 목록)을 만듭니다.
+
+    제목에 등장한 어간 중 개체(entity_names에 있거나, 없으면 looks_like_entity)를 사전 키로,
+    같은 기사 제목·리드 문단의 어간을 연관어 후보로 봅니다. 개체가 아닌 어간 중 문서 빈도가
+    높은 것은 일반어로 돌려주며, 질문에 나와도 사전에 없는 개체로 보지 않습니다.
+    """
+    documents = []
+    df: Counter = Counter()
+    for jsonl_path in sorted(input_dir.rglob("*.jsonl")):
+        with jsonl_path.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                heads = _terms(record.get("title") or "")
+                context = heads | _terms((record.get("chunk") or "")[:LEAD_CHARS])
+                if heads:
+                    documents.append((heads, context))
+                    df.update(context)
+
+    num_docs = len(documents)
+    is_entity = (lambda term: term in entity_names) if entity_names is not None else looks_like_entity
+    frequent = [term for term, count in df.most_common() if count >= min_df]
+    entities = set([term for term in frequent if is_entity(term)][:max_entities])
+    common_terms = [term for term in frequent if term not in entities][:max_common_terms]
+
+    cooc: Dict[str, Counter] = {}
+    for heads, context in documents:
+        for head in heads & entities:
+            related = cooc.setdefault(head, Counter())
+            related.update(term for term in context if term != head and df[term] >= min_df)
+
+    expansion_map: Dict[str, List[str]] = {}
+    for head, related in cooc.items():
+        scored = []
+        for term, count in related.items():
+            if count < min_cooc:
+                continue
+            pmi = math.log(num_docs * count / (df[head] * df[term]))
+            if pmi > 0:
+                scored.append((count * pmi, term))
+        if scored:
+            scored.sort(reverse=True)
+            expansion_map[head] = [term for _, term in scored[:max_related]]
+
+    return expansion_map, common_terms
+
+
+class EntityExpander:
+    """개체 사전 기반 로컬 검색어 확장기"""
+
+    def __init__(self, expansion_map: Dict[str, List[str]], common_terms: Optional[Set[str]] = None):
+        self.expansion_map = expansion_map
+        self.common_terms = common_terms or set()
+
+    def _is_ignorable(self, token: str, stem: str) -> bool:
+        """개체가 아닌 것으로 보는 질문 어간 (일반어·불용어·질문 표현·숫자로 시작·한 글자)"""
+        return (
+            len(stem) < 2 or stem[0].isdigit()
+            or stem in self.common_terms or token in self.common_terms
+            or stem in STOPWORDS or stem in QUERY_STOPWORDS or token in QUERY_STOPWORDS
+            or token.endswith(QUERY_ENDINGS)
+        )
+
+    def analyze(self, query: str) -> Tuple[List[str], List[str]]:
+        """질문의 (사전 개체, 사전에 없는 개체 후보) 목록 (각각 등장 순서 유지)"""
+        known: List[str] = []
+        unknown: List[str] = []
+        for token in WORD_RE.findall(query):
+            stem, _ = split_josa(token)
+            candidate = next((c for c in (token, stem) if c in self.expansion_map), None)
+            if candidate is not None:
+                if candidate not in known:
+                    known.append(candidate)
+            elif not self._is_ignorable(token, stem) and stem not in unknown:
+                unknown.append(stem)
+        return known, unknown
+
+    def known_entities(self, query: str) -> List[str]:
+        """질문에 등장한 사전 개체 목록 (등장 순서 유지)"""
+        return self.analyze(query)[0]
+
+    def expand(self, query: str, max_terms: int = MAX_EXPANSION_TERMS) -> Optional[str]:
+        """
+        질문의 개체가 모두 사전에 있으면 연관어를 최대 max_terms개 덧붙인 검색어를 반환합니다.
+        사전 개체가 없거나 사전에 없는 개체가 하나라도 있으면 None (LLM 확장 사용).
+        """
+        entities, unknown = self.analyze(query)
+        if not entities or unknown:
+            return None
+
+        added: List[str] = []
+        # 개체별로 번갈아 가며 하나씩 골라 특정 개체에 치우치지 않게 함
+        for rank in range(max(len(self.expansion_map[entity]) for entity in entities)):
+            for entity in entities:
+                related = self.expansion_map[entity]
+                if rank < len(related) and related[rank] not in query and related[rank] not in added:
+                    added.append(related[rank])
+                if len(added) >= max_terms:
+                    return f"{query} {' '.join(added)}"
+
+        return f"{query} {' '.join(added)}" if added else query
+
+
+_expander: Optional[EntityExpander] = None
+_lock = threading.Lock()
+
+
+def get_expander(s3_client) -> EntityExpander:
+    """확장 사전을 지연 로딩합니다. 사전을 읽지 못하면 빈 사전(항상 LLM 사용)으로 동작합니다."""
+    global _expander
+
+    if _expander is not None:
+        return _expander
+
+    with _lock:
+        if _expander is None:
+            expansion_map: Dict[str, List[str]] = {}
+            common_terms: Set[str] = set()
+            try:
+                response = s3_client.get_object(Bucket=NEWS_DATA_BUCKET, Key=ENTITY_EXPANSION_KEY)
+                artifact = json.loads(response["Body"].read())
+                if artifact.get("version", 1) >= 2:
+                    expansion_map = artifact["entities"]
+                    common_terms = set(artifact.get("common_terms", []))
+                else:
+                    # 개체를 빈도만으로 고른 예전 사전은 일반어가 섞여 있으므로 쓰지 않음
+                    logger.warning("Entity expansion map is version 1, rebuild it with entity_expansion.py")
+            except Exception as e:
+                logger.warning(f"Entity expansion map unavailable: {e}")
+            _expander = EntityExpander(expansion_map, common_terms)
+            logger.info(f"Loaded entity expansion map: {len(expansion_map)} entities")
+    return _expander
+
+
+def main():
+    ap = argparse.ArgumentParser(description="news-data-md JSONL → 개체 연관어 확장 사전 빌더")
+    ap.add_argument("--input_dir", required=True, help="news-data-md JSONL 로컬 미러 디렉터리")
+    ap.add_argument("--output", required=True, help="출력 JSON 경로")
+    ap.add_argument("--min_df", type=int, default=20)
+    ap.add_argument("--min_cooc", type=int, default=5)
+    ap.add_argument("--max_entities", type=int, default=5000)
+    ap.add_argument("--max_related", type=int, default=5)
+    ap.add_argument("--max_common_terms", type=int, default=20000)
+    ap.add_argument("--entity_list", help="개체 이름 목록 파일 (한 줄에 하나, 예: KRX 상장회사명). 없으면 이름 꼴로 판별")
+    args = ap.parse_args()
+
+    entity_names = load_entity_list(Path(args.entity_list)) if args.entity_list else None
+    expansion_map, common_terms = build_expansion_map(
+        Path(args.input_dir), args.min_df, args.min_cooc, args.max_entities, args.max_related,
+        entity_names=entity_names, max_common_terms=args.max_common_terms
+    )
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(
+        json.dumps({"version": 2, "entities": expansion_map, "common_terms": common_terms}, ensure_ascii=False),
+        encoding="utf-8"
+    )
+    print(f"[완료] {out_path} 생성: {len(expansion_map)}개 개체, 일반어 {len(common_terms)}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Idempotent POST /chat
+
+API Gateway 재시도, 더블 클릭, 프런트엔드 재연결로 같은 /chat 요청이 다시 들어오면 전체 파이프라인을
+다시 실행하지 않고 첫 요청의 응답을 그대로 돌려줍니다.
+
+키 : 클라이언트 요청 ID(Idempotency-Key 또는 X-Request-Id 헤더)
+     + 정규화한 요청 본문(질문은 normalize_question, 나머지 필드는 키 정렬 JSON)의 해시
+
+클라이언트 요청 ID가 없는 요청은 멱등 처리하지 않고 그대로 처리합니다. 본문만으로 키를 만들면
+같은 질문을 보낸 다른 사용자가 서로의 응답(데이터 버전 관리 밖의 캐시)을 받게 되기 때문입니다.
+프런트엔드는 질문을 보낼 때마다 새 Idempotency-Key를 만들어 재시도에 같은 값을 씁니다.
+
+    1. put_if_absent로 "in_progress" 항목을 만들면 이 요청이 처리하고, 완료 후 응답을 "completed"로 저장
+    2. 이미 "completed" 항목이 있으면 저장된 응답을 반환
+    3. "in_progress"이면 IDEMPOTENCY_WAIT_SECONDS 동안 완료를 기다렸다가 응답을 반환하고,
+       그때까지 끝나지 않으면 409를 반환
+
+200이 아닌 응답은 저장하지 않고 항목을 지워 재시도가 다시 처리되도록 합니다.
+저장소는 CHATBOT_STATE_TABLE(DynamoDB)이 있으면 컨테이너 간에 공유하고, 없으면 프로세스 내 저장소
+(테스트에서는 가짜 저장소)를 사용합니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from metrics import put_metrics
+from singleflight import normalize_question
+from stores import InMemoryStore, get_shared_store
+
+logger = logging.getLogger()
+
+IDEMPOTENCY_ENABLED = os.environ.get("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+# 완료된 응답을 중복 요청에 돌려줄 기간
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "300"))
+# 처리 중 항목의 유지 시간 (처리 요청이 비정상 종료되면 이 시간 뒤 재시도가 다시 처리)
+IDEMPOTENCY_IN_PROGRESS_SECONDS = int(os.environ.get("IDEMPOTENCY_IN_PROGRESS_SECONDS", "120"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", "10"))
+IDEMPOTENCY_POLL_SECONDS = 0.25
+
+CLIENT_REQUEST_ID_HEADERS = ("idempotency-key", "x-request-id")
+
+
+def client_request_id(event: Dict[str, Any]) -> str:
+    headers = event.get("headers") or {}
+    for name, value in headers.items():
+        if name.lower() in CLIENT_REQUEST_ID_HEADERS and value:
+            return str(value)[:128]
+    return ""
+
+
+def fingerprint(event: Dict[str, Any]) -> Optional[str]:
+    """
+    요청 지문을 만듭니다. 클라이언트 요청 ID가 없거나 본문이 JSON 객체가 아니면 None
+    (멱등 처리 없이 그대로 처리, 본문 검증은 handle_chat이 처리).
+    """
+    request_id = client_request_id(event)
+    if not request_id:
+        return None
+
+    body = event.get("body", event)
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return None
+    if not isinstance(body, dict):
+        return None
+
+    normalized = dict(body)
+    if isinstance(normalized.get("question"), str):
+        normalized["question"] = normalize_question(normalized["question"])
+    canonical = json.dumps(normalized, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(f"{request_id}\n{canonical}".encode("utf-8")).hexdigest()
+    return digest[:40]
+
+
+class IdempotencyLayer:
+    """요청 지문별 처리 중/완료 항목을 저장소에 기록하는 멱등 처리기"""
+
+    def __init__(self, store, ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+                 in_progress_seconds: int = IDEMPOTENCY_IN_PROGRESS_SECONDS,
+                 wait_seconds: float = IDEMPOTENCY_WAIT_SECONDS,
+                 poll_seconds: float = IDEMPOTENCY_POLL_SECONDS):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.in_progress_seconds = in_progress_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+
+    def handle(self, event: Dict[str, Any], handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+               conflict_response: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """중복 요청이면 저장된 응답을, 아니면 handler(event)를 실행한 응답을 반환합니다."""
+        request_key = fingerprint(event)
+        if request_key is None:
+            return handler(event)
+        key = f"idem:{request_key}"
+
+        try:
+            acquired = self.store.put_if_absent(key, {"state": "in_progress", "at": time.time()},
+                                                self.in_progress_seconds)
+        except Exception as e:
+            logger.warning(f"Idempotency store unavailable, processing without it: {e}")
+            return handler(event)
+
+        if not acquired:
+            return self._wait_for_completion(key, event, handler, conflict_response)
+
+        response = None
+        try:
+            response = handler(event)
+            return response
+        finally:
+            try:
+                if response is not None and response.get("statusCode") == 200:
+                    self.store.put(key, {"state": "completed", "response": response}, self.ttl_seconds)
+                else:
+                    self.store.delete(key)
+            except Exception as e:
+                logger.warning(f"Idempotency record update failed: {e}")
+
+    def _wait_for_completion(self, key: str, event: Dict[str, Any],
+                             handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+                             conflict_response: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        deadline = time.time() + self.wait_seconds
+        while True:
+            try:
+                record = self.store.get(key)
+            except Exception as e:
+                logger.warning(f"Idempotency poll failed, processing without it: {e}")
+                return handler(event)
+            if record is None:
+                # 먼저 온 요청이 실패해 항목을 지움 → 이 요청이 다시 처리
+                return self.handle(event, handler, conflict_response)
+            if record.get("state") == "completed":
+                logger.info("Returning stored response for duplicate request")
+                put_metrics({"IdempotentReplay": 1})
+                return record["response"]
+            if time.time() >= deadline:
+                break
+            time.sleep(self.poll_seconds)
+
+        logger.info("Duplicate request still in progress")
+        put_metrics({"IdempotentConflict": 1})
+        return conflict_response()
+
+
+_layer: Optional[IdempotencyLayer] = None
+_init_lock = threading.Lock()
+
+
+def get_idempotency_layer() -> Optional[IdempotencyLayer]:
+    """프로세스 전역 멱등 처리기를 지연 생성합니다. 비활성화되어 있으면 None."""
+    global _layer
+
+    if not IDEMPOTENCY_ENABLED:
+        return None
+    if _layer is None:
+        with _init_lock:
+            if _layer is None:
+                _layer = IdempotencyLayer(get_shared_store() or InMemoryStore())
+    return _layer
@@ -4,18 +4,44 @@ Simple News Chatbot Handler
 AWS Lambda Powertools 의존성 없이 기본 라이브러리만 사용하는 버전입니다.
 """
 
+import contextvars
 import json
 import logging
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, Optional, List, Tuple
-from difflib import SequenceMatcher
 from urllib.parse import urlparse
 
+# 모듈 초기화(임포트·클라이언트 생성) 시작 시각 – warm-up 보고서의 init_ms 계산용
+_INIT_STARTED = time.time()
+
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import requests
+from requests.adapters import HTTPAdapter
+
+from kb_shards import failure_stats as shard_failure_stats, load_shard_map, retrieve_from_shards
+from recent_index import get_recent_index, search_recent_articles
+from bm25_index import get_bm25_index, search_bm25, tokenize
+from spell_corrector import SpellCorrection, get_corrector
+from entity_expansion import get_expander
+from singleflight import coalesce, get_singleflight, normalize_question
+from batch import BATCH_MAX_QUESTIONS, memoized, run_batch, seed as seed_memo
+from metrics import put_metrics
+from news_markdown import NewsArticle, parse_articles
+from digest import answer_from_digest, preload_digests
+from answer_cache import get_answer_cache, log_query
+from prewarm import mine_top_questions, observed_hit_rate, record_usage, run_prewarm
+from session import build_session_record, get_session_store, is_follow_up, is_valid_session_id
+from warmup import is_warmup_event, run_warmup
+from idempotency import get_idempotency_layer
+from strategies import StrategyRegistry, record_model_call
 
 # Perplexity API settings
 PERPLEXITY_API_KEY = os.environ.get("PERPLEXITY_API_KEY")
@@ -23,16 +49,40 @@ PPLX_URL = "https://api.perplexity.ai/chat/completions"
 
 # 환경 변수 설정
 KNOWLEDGE_BASE_ID = os.environ.get("KNOWLEDGE_BASE_ID")
+KNOWLEDGE_BASE_SHARDS = os.environ.get("KNOWLEDGE_BASE_SHARDS")
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+# 동시 요청을 처리하는 서버 모드에서는 풀 크기를 동시 처리 수 이상으로 설정
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "10"))
+S3_TEXT_CACHE_SIZE = int(os.environ.get("S3_TEXT_CACHE_SIZE", "256"))
+S3_TEXT_CACHE_TTL_SECONDS = int(os.environ.get("S3_TEXT_CACHE_TTL_SECONDS", "300"))
+CLAUDE_MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+# 원문에 수집 시 계산한 요약이 있으면 프롬프트에 청크 대신 요약 + 질문과 맞는 청크 문장 사용
+PROMPT_USE_SUMMARIES = os.environ.get("PROMPT_USE_SUMMARIES", "true").lower() == "true"
+PROMPT_MATCHED_MAX_CHARS = int(os.environ.get("PROMPT_MATCHED_MAX_CHARS", "160"))
+# 로컬 오타 교정 결과를 그대로 사용할 최소 신뢰도 (미만이면 Perplexity 교정)
+SPELL_CONFIDENCE_THRESHOLD = float(os.environ.get("SPELL_CONFIDENCE_THRESHOLD", "0.75"))
+# KB·최근 기사 계층 결과 병합(Reciprocal Rank Fusion)의 순위 완화 상수
+RRF_K = int(os.environ.get("RRF_K", "60"))
+# 배치 질문 일괄 분석: Haiku 한 번에 묶을 질문 수와 질문당 응답 토큰 (묶음마다 따로 예산을 잡아 배열이 잘리지 않도록)
+BULK_ANALYSIS_GROUP_SIZE = int(os.environ.get("BULK_ANALYSIS_GROUP_SIZE", "10"))
+BULK_ANALYSIS_TOKENS_PER_QUESTION = 300
 
 # 로깅 설정
 logger = logging.getLogger()
 logger.setLevel(getattr(logging, LOG_LEVEL))
 
-# AWS 클라이언트 초기화
-bedrock_runtime = boto3.client("bedrock-runtime")
-bedrock_agent_runtime = boto3.client("bedrock-agent-runtime")
-s3_client = boto3.client("s3")
+# AWS 클라이언트 초기화 (스레드 안전, 프로세스 내 모든 요청이 연결 풀을 공유)
+_client_config = Config(max_pool_connections=AWS_MAX_POOL_CONNECTIONS)
+bedrock_runtime = boto3.client("bedrock-runtime", config=_client_config)
+bedrock_agent_runtime = boto3.client("bedrock-agent-runtime", config=_client_config)
+s3_client = boto3.client("s3", config=_client_config)
+
+# Perplexity 호출용 HTTP 세션 (keep-alive 연결 재사용)
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_maxsize=AWS_MAX_POOL_CONNECTIONS))
+
+# 연도별 Knowledge Base 샤드 맵 (미설정 시 KNOWLEDGE_BASE_ID 단일 인덱스 사용)
+KB_SHARDS = load_shard_map(KNOWLEDGE_BASE_SHARDS)
 
 
 class ChatbotError(Exception):
@@ -40,8 +90,48 @@ class ChatbotError(Exception):
     pass
 
 
+def invoke_claude(prompt: str, max_tokens: int, purpose: str) -> str:
+    """Haiku를 호출해 응답 텍스트를 반환합니다. 호출 목적별 토큰 사용량과 지연 시간을 로그·지표로 남깁니다."""
+    started = time.time()
+    response = bedrock_runtime.invoke_model(
+        modelId=CLAUDE_MODEL_ID,
+        body=json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        })
+    )
+    result = json.loads(response['body'].read())
+    latency_ms = (time.time() - started) * 1000
+
+    usage = result.get("usage", {})
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    record_usage(input_tokens, output_tokens)
+    record_model_call(input_tokens, output_tokens)
+    logger.info(f"Claude {purpose}: input_tokens={input_tokens} output_tokens={output_tokens} latency={latency_ms:.0f}ms")
+    put_metrics(
+        {"InputTokens": input_tokens, "OutputTokens": output_tokens, "InvokeLatency": latency_ms},
+        dimensions={"Purpose": purpose},
+        units={"InvokeLatency": "Milliseconds"}
+    )
+    return result['content'][0]['text'].strip()
+
+
 def expand_query_with_ai(original_query: str) -> str:
-    """AI를 사용하여 검색 질문을 확장합니다."""
+    """검색 질문을 확장합니다. 코퍼스 개체 사전에 있는 개체는 로컬에서, 모르는 개체만 AI로 확장합니다."""
+    return memoized(("expand", normalize_question(original_query)), lambda: _expand_query(original_query))
+
+
+def _expand_query(original_query: str) -> str:
+    try:
+        local_expansion = get_expander(s3_client).expand(original_query)
+        if local_expansion is not None:
+            logger.info(f"Locally expanded query: '{original_query}' -> '{local_expansion}'")
+            return local_expansion
+    except Exception as e:
+        logger.warning(f"Local query expansion failed: {str(e)}")
+
     try:
         current_year = datetime.now().year
         prompt = f"""다음 질문을 뉴스 검색에 더 적합하도록 확장해주세요. 
@@ -56,22 +146,7 @@ def expand_query_with_ai(original_query: str) -> str:
 
 확장된 검색어만 출력하세요 (설명 없이):"""
 
-        response = bedrock_runtime.invoke_model(
-            modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 100,
-                "messages": [
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ]
-            })
-        )
-        
-        result = json.loads(response['body'].read())
-        expanded_query = result['content'][0]['text'].strip()
+        expanded_query = invoke_claude(prompt, max_tokens=100, purpose="expand")
         
         logger.info(f"AI expanded query: '{original_query}' -> '{expanded_query}'")
         return expanded_query
@@ -136,20 +211,21 @@ def needs_external_search(question: str) -> bool:
 # Helper: typo detection & Perplexity-based spell-fix
 # -----------------------
 
+def correct_spelling(question: str) -> SpellCorrection:
+    """자모 단위 SymSpell 사전으로 질문을 로컬 교정합니다 (네트워크 호출 없음)."""
+    return get_corrector(s3_client).correct(question)
+
+
 def is_typo(question: str) -> bool:
-    """간단 휴리스틱: 자음/모음 단독·영문 난독·편집거리로 오타 여부 판단"""
+    """간단 휴리스틱: 자음/모음 단독·영문 난독·코퍼스 사전 기반 교정 여부로 오타 판단"""
     # 한글 자음/모음만 2글자 이상 연속 → 오타 가능성
     if re.search(r"[ㄱ-ㅎㅏ-ㅣ]{2,}", question):
         return True
     # 영문 연속 4자 이상(한국어 맥락에서 흔치 않음)
     if re.search(r"[a-zA-Z]{4,}", question):
         return True
-    # 사전 주요 키워드와 편집거리 확인 (간단 샘플)
-    vocab = ["삼성전자", "금리", "환율", "부동산", "주가", "인플레이션"]
-    for w in vocab:
-        if SequenceMatcher(None, w, question).ratio() > 0.8:
-            return False
-    return False  # 보수적으로 False 반환 (심각 오타만 True)
+    # 뉴스 코퍼스 어휘 기준으로 교정할 단어가 있으면 오타
+    return correct_spelling(question).changed
 
 
 def perplexity_spellfix(question: str) -> Tuple[str, str]:
@@ -205,13 +281,15 @@ def perplexity_refine(question: str) -> Tuple[str, str]:
         raise ChatbotError("Perplexity refine 실패")
 
 
-def orchestrated_news_search(query: str, max_retries: int = 3) -> Dict[str, Any]:
-    """오케스트레이션 기반 뉴스 검색 - 단계별 분석 및 재시도 로직"""
-    
+def analyze_question(query: str) -> Dict[str, Any]:
+    """질문의 목적·시간 맥락·핵심 키워드를 분석해 검색 계획을 세웁니다. 배치 처리 중에는 질문별로 한 번만 호출합니다."""
+    return memoized(("analysis", normalize_question(query)), lambda: _analyze_question(query))
+
+
+def _analyze_question(query: str) -> Dict[str, Any]:
     current_date = datetime.now().strftime('%Y년 %m월 %d일')
     current_year = datetime.now().year
     
-    # Step 1: 질문 분석 및 계획 수립
     analysis_prompt = f"""현재 날짜: {current_date}
 
 다음 사용자 질문을 분석하고 검색 계획을 수립하세요.
@@ -229,17 +307,7 @@ def orchestrated_news_search(query: str, max_retries: int = 3) -> Dict[str, Any]
 }}"""
 
     try:
-        analysis_response = bedrock_runtime.invoke_model(
-            modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 400,
-                "messages": [{"role": "user", "content": analysis_prompt}]
-            })
-        )
-        
-        analysis_result = json.loads(analysis_response['body'].read())
-        analysis_text = analysis_result['content'][0]['text'].strip()
+        analysis_text = invoke_claude(analysis_prompt, max_tokens=400, purpose="analysis")
         
         # JSON 추출
         analysis_data = json.loads(analysis_text)
@@ -253,6 +321,72 @@ def orchestrated_news_search(query: str, max_retries: int = 3) -> Dict[str, Any]
             "key_entities": [query],
             "search_strategy": "basic search"
         }
+    return analysis_data
+
+
+def analyze_questions_bulk(questions: List[str]) -> None:
+    """
+    배치의 질문들을 BULK_ANALYSIS_GROUP_SIZE개씩 묶어 묶음마다 Haiku 한 번으로 일괄 분석해 배치 메모에 등록합니다.
+
+    묶음은 동시에 분석하며, 응답을 해석할 수 없는 묶음은 등록하지 않으므로 그 질문들만
+    analyze_question에서 개별 분석됩니다.
+    """
+    if len(questions) < 2:
+        return
+
+    group_size = max(2, BULK_ANALYSIS_GROUP_SIZE)
+    # 한 개만 남은 묶음은 개별 분석과 호출 수가 같으므로 제외
+    groups = [questions[i:i + group_size] for i in range(0, len(questions), group_size)]
+    groups = [group for group in groups if len(group) > 1]
+    with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="bulk-analysis") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, _analyze_question_group, group) for group in groups]
+        analyzed = 0
+        for group, future in zip(groups, futures):
+            try:
+                future.result()
+                analyzed += len(group)
+            except Exception as e:
+                logger.warning(f"Bulk analysis failed for {len(group)} questions, analyzing individually: {e}")
+    logger.info(f"Bulk analyzed {analyzed}/{len(questions)} questions in {len(groups)} calls")
+
+
+def _analyze_question_group(questions: List[str]) -> None:
+    """질문 묶음 하나를 Haiku 한 번으로 분석해 배치 메모에 등록합니다."""
+    current_date = datetime.now().strftime('%Y년 %m월 %d일')
+    numbered = "\n".join(f"{i + 1}. {question}" for i, question in enumerate(questions))
+    analysis_prompt = f"""현재 날짜: {current_date}
+
+다음 사용자 질문들을 각각 분석하고 검색 계획을 수립하세요.
+
+사용자 질문:
+{numbered}
+
+질문 순서대로 다음 형식의 객체를 담은 JSON 배열만 응답:
+[{{
+    "user_goal": "사용자가 원하는 것",
+    "time_context": "질문의 시간적 맥락 (예: 2025년 6월, 최근, 과거 등)",
+    "target_year_range": ["2024", "2025"],
+    "key_entities": ["핵심 키워드들"],
+    "search_strategy": "검색 전략 설명",
+    "expected_article_timeframe": "기대하는 기사 시간대"
+}}]"""
+
+    analyses = json.loads(invoke_claude(analysis_prompt,
+                                        max_tokens=BULK_ANALYSIS_TOKENS_PER_QUESTION * len(questions),
+                                        purpose="bulk_analysis"))
+    if not isinstance(analyses, list) or len(analyses) != len(questions):
+        raise ValueError(f"expected {len(questions)} analyses, got {type(analyses).__name__}")
+
+    for question, analysis_data in zip(questions, analyses):
+        if isinstance(analysis_data, dict) and analysis_data.get("key_entities"):
+            seed_memo(("analysis", normalize_question(question)), analysis_data)
+
+
+def orchestrated_news_search(query: str, max_retries: int = 3) -> Dict[str, Any]:
+    """오케스트레이션 기반 뉴스 검색 - 단계별 분석 및 재시도 로직"""
+
+    # Step 1: 질문 분석 및 계획 수립
+    analysis_data = analyze_question(query)
 
     # Step 2: 검색 시도 (최대 3회 재시도)
     for attempt in range(max_retries):
@@ -286,23 +420,88 @@ def orchestrated_news_search(query: str, max_retries: int = 3) -> Dict[str, Any]
     return perplexity_fallback_search(query)
 
 
+def retrieve_news_articles(search_query: str, target_years: Optional[List[str]] = None,
+                           number_of_results: int = 5) -> List[Dict[str, Any]]:
+    """
+    기사 청크를 검색합니다.
+
+    Knowledge Base(샤드 맵이 있으면 대상 연도 샤드만 병렬 조회)와 최근 기사 벡터 계층을
+    함께 조회해 순위 기준(RRF)으로 병합합니다. KB 검색이 실패해도 최근 기사 결과가 있으면 그것을 사용합니다.
+    """
+    memo_key = ("retrieve", search_query, tuple(target_years or ()), number_of_results)
+    return memoized(memo_key, lambda: _retrieve_news_articles(search_query, target_years, number_of_results))
+
+
+def _retrieve_news_articles(search_query: str, target_years: Optional[List[str]],
+                            number_of_results: int) -> List[Dict[str, Any]]:
+    recent_results = search_recent_articles(
+        s3_client, bedrock_runtime, search_query, target_years=target_years, top_k=number_of_results
+    )
+
+    try:
+        if KB_SHARDS:
+            kb_results = retrieve_from_shards(
+                bedrock_agent_runtime, KB_SHARDS, search_query,
+                target_years=target_years, number_of_results=number_of_results
+            )
+        else:
+            retrieve_response = bedrock_agent_runtime.retrieve(
+                knowledgeBaseId=KNOWLEDGE_BASE_ID,
+                retrievalQuery={"text": search_query},
+                retrievalConfiguration={
+                    "vectorSearchConfiguration": {
+                        "numberOfResults": number_of_results,
+                        "overrideSearchType": "HYBRID"
+                    }
+                }
+            )
+            kb_results = retrieve_response.get('retrievalResults', [])
+    except Exception as e:
+        if recent_results:
+            logger.warning(f"Knowledge Base retrieve failed, using recent article index only: {e}")
+            return recent_results
+        # KB 장애·스로틀링 시 로컬 BM25 색인으로 대체
+        fallback_results = search_bm25(s3_client, search_query, top_k=number_of_results)
+        if not fallback_results:
+            raise
+        logger.warning(f"Knowledge Base retrieve failed, using local BM25 index: {e}")
+        return fallback_results
+
+    if not recent_results:
+        return kb_results
+
+    return fuse_by_rank([kb_results, recent_results], number_of_results)
+
+
+def fuse_by_rank(result_lists: List[List[Dict[str, Any]]], limit: int) -> List[Dict[str, Any]]:
+    """
+    여러 검색 소스의 결과를 순위로 병합합니다 (Reciprocal Rank Fusion, 1 / (RRF_K + 순위)의 합).
+
+    KB HYBRID 점수와 최근 기사 계층의 코사인 유사도는 척도가 달라 점수를 직접 비교하지 않습니다.
+    같은 청크(원문 URI + 텍스트)가 여러 소스에 있으면 점수를 합치고 먼저 나온 결과를 남깁니다.
+    """
+    fused: Dict[Tuple[str, str], List[Any]] = {}
+    for results in result_lists:
+        for rank, result in enumerate(results, start=1):
+            key = (
+                result.get('location', {}).get('s3Location', {}).get('uri', ''),
+                result.get('content', {}).get('text', '')
+            )
+            entry = fused.setdefault(key, [0.0, result])
+            entry[0] += 1.0 / (RRF_K + rank)
+
+    ranked = sorted(fused.values(), key=lambda entry: entry[0], reverse=True)
+    return [result for _, result in ranked[:limit]]
+
+
 def execute_bedrock_search(search_query: str, analysis_data: Dict) -> Dict[str, Any]:
     """Bedrock Knowledge Base 검색 실행"""
     try:
-        # 검색 실행
-        retrieve_response = bedrock_agent_runtime.retrieve(
-            knowledgeBaseId=KNOWLEDGE_BASE_ID,
-            retrievalQuery={"text": search_query},
-            retrievalConfiguration={
-                "vectorSearchConfiguration": {
-                    "numberOfResults": 5,
-                    "overrideSearchType": "HYBRID"
-                }
-            }
+        # 검색 실행 (분석된 대상 연도에 해당하는 샤드만 조회)
+        retrieval_results = retrieve_news_articles(
+            search_query, target_years=analysis_data.get('target_year_range', [])
         )
         
-        retrieval_results = retrieve_response.get('retrievalResults', [])
-        
         if not retrieval_results:
             raise ChatbotError("No search results found")
             
@@ -343,11 +542,50 @@ def evaluate_search_results(search_result: Dict, analysis_data: Dict, original_q
         return False
 
 
+def select_matching_sentences(query: str, text: str, max_chars: int) -> str:
+    """청크에서 질문과 문자 bigram이 가장 많이 겹치는 문장들을 원문 순서대로 max_chars 안에서 고릅니다."""
+    query_terms = set(tokenize(query))
+    sentences = [sentence.strip() for sentence in re.split(r'(?<=[.!?])\s+', text) if sentence.strip()]
+    scored = sorted(
+        ((len(query_terms & set(tokenize(sentence))), position) for position, sentence in enumerate(sentences)),
+        reverse=True
+    )
+
+    chosen, length = [], 0
+    for overlap, position in scored:
+        if overlap == 0 and chosen:
+            break
+        if length + len(sentences[position]) > max_chars:
+            continue
+        chosen.append(position)
+        length += len(sentences[position])
+    return " ".join(sentences[position] for position in sorted(chosen))
+
+
+def build_article_context(query: str, chunk: str, metadata: Optional[Dict[str, str]]) -> str:
+    """
+    프롬프트에 넣을 기사 내용을 만듭니다.
+
+    수집 시 계산한 요약이 원문에 있으면 기사 중간 조각인 청크 전체 대신
+    "제목 (날짜) + 요약 + 질문과 맞는 청크 문장"을 사용해 입력 토큰을 줄입니다.
+    """
+    summary = (metadata or {}).get("summary")
+    if not PROMPT_USE_SUMMARIES or not summary:
+        return chunk
+
+    lines = [f"{metadata.get('title', '')} ({metadata.get('date', '')})", f"요약: {summary}"]
+    matched = select_matching_sentences(query, chunk, PROMPT_MATCHED_MAX_CHARS)
+    if matched and matched not in summary:
+        lines.append(f"관련 내용: {matched}")
+    return "\n".join(lines)
+
+
 def generate_orchestrated_response(query: str, retrieval_results: List, analysis_data: Dict) -> Dict[str, Any]:
     """오케스트레이션된 응답 생성"""
     # 날짜 필터링 적용된 기사 선별
     target_years = analysis_data.get('target_year_range', [])
     filtered_results = []
+    article_metadata: Dict[int, Dict[str, str]] = {}  # id(result) → 원문 기사 메타데이터 (요약 포함)
     
     for result in retrieval_results[:10]:  # 더 많은 결과에서 필터링
         # S3 URI에서 메타데이터 추출하여 날짜 확인
@@ -358,6 +596,7 @@ def generate_orchestrated_response(query: str, retrieval_results: List, analysis
             try:
                 content = result.get('content', {}).get('text', '')
                 metadata = find_best_matching_article(s3_uri, content)
+                article_metadata[id(result)] = metadata
                 article_date = metadata.get("date", "") if metadata else ""
                 
                 # 날짜가 타겟 년도와 매치되는지 확인
@@ -386,11 +625,11 @@ def generate_orchestrated_response(query: str, retrieval_results: List, analysis
         logger.warning(f"Orchestration: Date filtering left only {len(filtered_results)} articles, using original results")
         filtered_results = retrieval_results[:5]
     
-    # 기사들을 번호로 포맷
+    # 기사들을 번호로 포맷 (요약이 있으면 요약 + 질문과 맞는 청크 문장)
     formatted_articles = []
     for i, result in enumerate(filtered_results[:5], 1):
         content = result.get('content', {}).get('text', '')
-        formatted_articles.append(f"[기사 {i}]\n{content}")
+        formatted_articles.append(f"[기사 {i}]\n{build_article_context(query, content, article_metadata.get(id(result)))}")
     
     articles_text = '\n\n'.join(formatted_articles)
     
@@ -421,17 +660,7 @@ def generate_orchestrated_response(query: str, retrieval_results: List, analysis
 답변 작성:"""
 
     # AI 응답 생성
-    ai_response = bedrock_runtime.invoke_model(
-        modelId="anthropic.claude-3-haiku-20240307-v1:0",
-        body=json.dumps({
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 1000,
-            "messages": [{"role": "user", "content": enhanced_prompt}]
-        })
-    )
-    
-    result = json.loads(ai_response['body'].read())
-    answer = result['content'][0]['text'].strip()
+    answer = invoke_claude(enhanced_prompt, max_tokens=1000, purpose="generate")
     
     # 응답 구조 생성
     response = {
@@ -490,31 +719,22 @@ def retrieve_and_generate_with_references(query: str, max_results: int = 10, ext
         
         logger.info(f"Querying knowledge base with expanded query: {expanded_query}")
         
-        # 1. retrieve API로 정확히 5개 기사 검색
-        retrieve_response = bedrock_agent_runtime.retrieve(
-            knowledgeBaseId=KNOWLEDGE_BASE_ID,
-            retrievalQuery={
-                "text": expanded_query
-            },
-            retrievalConfiguration={
-                "vectorSearchConfiguration": {
-                    "numberOfResults": 5,  # 정확히 5개
-                    "overrideSearchType": "HYBRID"
-                }
-            }
+        # 1. retrieve API로 정확히 5개 기사 검색 (질문에 연도가 있으면 해당 샤드만 조회)
+        retrieval_results = retrieve_news_articles(
+            expanded_query, target_years=re.findall(r"20\d{2}", expanded_query), number_of_results=5
         )
-        
-        retrieval_results = retrieve_response.get('retrievalResults', [])
         logger.info(f"Retrieved {len(retrieval_results)} results from retrieve API")
         
         if not retrieval_results:
             raise ChatbotError("관련 뉴스를 찾을 수 없습니다")
         
-        # 2. 검색된 기사들을 명시적으로 번호를 매겨서 포맷
+        # 2. 검색된 기사들을 명시적으로 번호를 매겨서 포맷 (요약이 있으면 요약 + 질문과 맞는 청크 문장)
         formatted_articles = []
         for i, result in enumerate(retrieval_results[:5], 1):  # 최대 5개만 사용
             content = result.get('content', {}).get('text', '')
-            formatted_articles.append(f"[기사 {i}]\n{content}")
+            s3_uri = result.get('location', {}).get('s3Location', {}).get('uri', '')
+            metadata = find_best_matching_article(s3_uri, content) if PROMPT_USE_SUMMARIES and s3_uri else None
+            formatted_articles.append(f"[기사 {i}]\n{build_article_context(query, content, metadata)}")
         
         articles_text = '\n\n'.join(formatted_articles)
         
@@ -557,22 +777,7 @@ def retrieve_and_generate_with_references(query: str, max_results: int = 10, ext
 답변 작성:"""
 
         # AI 모델 직접 호출
-        ai_response = bedrock_runtime.invoke_model(
-            modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "messages": [
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ]
-            })
-        )
-        
-        result = json.loads(ai_response['body'].read())
-        answer = result['content'][0]['text'].strip()
+        answer = invoke_claude(prompt, max_tokens=1000, purpose="generate")
         
         # 4. 응답 구조 생성 (retrieveAndGenerate와 호환되도록)
         combined_response = {
@@ -618,6 +823,40 @@ def retrieve_and_generate_with_references(query: str, max_results: int = 10, ext
         raise ChatbotError("답변 생성 중 예상치 못한 오류가 발생했습니다")
 
 
+def answer_from_local_index(question: str) -> Optional[Dict[str, Any]]:
+    """Bedrock을 사용할 수 없을 때 로컬 BM25 색인으로 출처가 포함된 추출형 답변을 만듭니다."""
+    results = search_bm25(s3_client, question, top_k=3)
+    if not results:
+        return None
+
+    lines = []
+    sources = []
+    for i, result in enumerate(results, 1):
+        metadata = result.get('metadata', {})
+        text = result.get('content', {}).get('text', '')
+        lead = re.split(r'(?<=[.!?다])\s', text, maxsplit=1)[0][:200]
+        lines.append(f"- {metadata.get('title', '')}: {lead} [{i}]")
+        sources.append({
+            "title": metadata.get('title', ''),
+            "date": metadata.get('date') or "날짜 없음",
+            "author": "",
+            "media": "서울경제",
+            "url": metadata.get('url', ''),
+            "s3_uri": result.get('location', {}).get('s3Location', {}).get('uri', '')
+        })
+
+    answer = "현재 AI 답변 생성이 원활하지 않아 질문과 관련된 서울경제 기사를 안내해 드립니다.\n" + "\n".join(lines)
+    return {
+        "answer": answer,
+        "sources": sources,
+        "question": question,
+        "timestamp": datetime.utcnow().isoformat(),
+        "enhanced_search": False,
+        # 일시적 장애 시의 대체 답변이므로 답변 캐시에 저장하지 않음
+        "cacheable": False
+    }
+
+
 def query_perplexity(question: str, max_tokens: int = 512) -> str:
     """Fallback to Perplexity AI when Knowledge Base returns no result"""
     if not PERPLEXITY_API_KEY:
@@ -634,7 +873,7 @@ def query_perplexity(question: str, max_tokens: int = 512) -> str:
     }
 
     try:
-        resp = requests.post(PPLX_URL, headers=headers, json=body, timeout=30)
+        resp = http_session.post(PPLX_URL, headers=headers, json=body, timeout=30)
         resp.raise_for_status()
         data = resp.json()
         return (
@@ -663,8 +902,65 @@ def validate_request_body(body: Dict[str, Any]) -> str:
     return question
 
 
+# S3 원본 마크다운 캐시: URI → (읽은 시각, 본문). 같은 프로세스의 모든 요청이 공유합니다.
+_s3_article_cache: "OrderedDict[str, Tuple[float, List[NewsArticle], List[str]]]" = OrderedDict()
+_s3_article_cache_lock = threading.Lock()
+
+
+def read_s3_articles(s3_uri: str) -> Tuple[List[NewsArticle], List[str]]:
+    """
+    S3 마크다운 객체를 읽어 (기사 레코드 목록, 기사별 소문자 블록 원문)을 반환합니다.
+    파싱·디코딩은 객체를 읽을 때 한 번만 하고, 최근에 읽은 객체는 그 결과를 LRU 캐시에서 반환합니다.
+    """
+    # 배치 처리 중에는 같은 URI를 동시에 읽지 않도록 배치 메모를 거침
+    return memoized(("s3", s3_uri), lambda: _read_s3_articles(s3_uri))
+
+
+def _read_s3_articles(s3_uri: str) -> Tuple[List[NewsArticle], List[str]]:
+    now = time.time()
+    with _s3_article_cache_lock:
+        cached = _s3_article_cache.get(s3_uri)
+        if cached and now - cached[0] < S3_TEXT_CACHE_TTL_SECONDS:
+            _s3_article_cache.move_to_end(s3_uri)
+            return cached[1], cached[2]
+
+    parsed_uri = urlparse(s3_uri)
+    response = s3_client.get_object(Bucket=parsed_uri.netloc, Key=parsed_uri.path.lstrip('/'))
+    data = response['Body'].read()
+    articles = parse_articles(data)
+    # 관련성 계산용 (요청마다 파일을 다시 나누고 소문자로 바꾸지 않도록 한 번만)
+    texts = [article.text(data).lower() for article in articles]
+
+    with _s3_article_cache_lock:
+        _s3_article_cache[s3_uri] = (now, articles, texts)
+        _s3_article_cache.move_to_end(s3_uri)
+        while len(_s3_article_cache) > S3_TEXT_CACHE_SIZE:
+            _s3_article_cache.popitem(last=False)
+    return articles, texts
+
+
+def article_metadata(article: NewsArticle) -> Dict[str, str]:
+    """기사 레코드를 출처 표시용 메타데이터로 바꿉니다."""
+    # ISO 발행일(2016-04-10T00:00:00.000+09:00 등)은 한국어 날짜로, 그 밖의 표기는 그대로
+    if 'T' in article.published and article.published_at:
+        date = article.published_at.strftime('%Y년 %m월 %d일')
+    else:
+        date = article.published
+    metadata = {
+        "title": article.title,
+        "date": date,
+        "author": article.author,
+        "media": article.media or "서울경제",
+        "url": article.url.split()[0] if article.url else ""
+    }
+    # 수집 시 계산한 추출 요약
+    if article.summary:
+        metadata["summary"] = article.summary
+    return metadata
+
+
 def extract_metadata_from_s3(s3_uri: str) -> Dict[str, str]:
-    """S3 URI에서 원본 .md 파일을 읽어 메타데이터를 추출합니다."""
+    """S3 URI에서 원본 .md 파일을 읽어 첫 번째 기사의 메타데이터를 추출합니다."""
     metadata = {
         "title": "",
         "date": "",
@@ -674,59 +970,12 @@ def extract_metadata_from_s3(s3_uri: str) -> Dict[str, str]:
     }
     
     try:
-        # S3 URI 파싱 (s3://bucket-name/path/to/file.md)
-        parsed_uri = urlparse(s3_uri)
-        bucket_name = parsed_uri.netloc
-        object_key = parsed_uri.path.lstrip('/')
-        
-        logger.info(f"Reading S3 file: bucket={bucket_name}, key={object_key}")
-        
-        # S3에서 파일 읽기
-        response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
-        content = response['Body'].read().decode('utf-8')
+        logger.info(f"Reading S3 file: {s3_uri}")
         
-        # .md 파일에서 기사들을 분리 (--- 구분자 사용)
-        articles = content.split('\n---\n')
-        
-        # 첫 번째 실제 기사에서 메타데이터 추출 (헤더 부분 제외)
-        if len(articles) > 1:
-            first_article = articles[1]  # 첫 번째 기사
-            
-            # 제목 추출 - ### 숫자. 제목 패턴
-            title_match = re.search(r'###\s*\d+\.\s*(.+?)(?:\n|$)', first_article)
-            if title_match:
-                metadata["title"] = title_match.group(1).strip()
-            
-            # 발행일 추출
-            date_match = re.search(r'\*\*발행일:\*\*\s*([^\n]+)', first_article)
-            if date_match:
-                date_str = date_match.group(1).strip()
-                # ISO 날짜를 한국어 형식으로 변환
-                try:
-                    # 2016-04-10T00:00:00.000+09:00 형식 처리
-                    if 'T' in date_str:
-                        dt = datetime.fromisoformat(date_str.replace('T00:00:00.000+09:00', ''))
-                        metadata["date"] = dt.strftime('%Y년 %m월 %d일')
-                    else:
-                        metadata["date"] = date_str
-                except:
-                    metadata["date"] = date_str
-            
-            # 기자 추출
-            author_match = re.search(r'\*\*기자:\*\*\s*([^\n]+)', first_article)
-            if author_match:
-                metadata["author"] = author_match.group(1).strip()
-            
-            # 언론사 추출
-            media_match = re.search(r'\*\*언론사:\*\*\s*([^\n]+)', first_article)
-            if media_match:
-                metadata["media"] = media_match.group(1).strip()
-            
-            # URL 추출
-            url_match = re.search(r'\*\*URL:\*\*\s*([^\n\s]+)', first_article)
-            if url_match:
-                metadata["url"] = url_match.group(1).strip()
-            
+        # S3에서 파일 읽기 (파싱 결과 캐시 사용)
+        articles, _ = read_s3_articles(s3_uri)
+        if articles:
+            metadata = article_metadata(articles[0])
             logger.info(f"Extracted metadata from S3: {metadata}")
         
     except Exception as e:
@@ -738,31 +987,20 @@ def extract_metadata_from_s3(s3_uri: str) -> Dict[str, str]:
 def find_best_matching_article(s3_uri: str, query_chunk: str) -> Dict[str, str]:
     """S3 파일에서 쿼리와 가장 관련성 높은 기사를 찾아 메타데이터를 추출합니다."""
     try:
-        # S3 URI 파싱
-        parsed_uri = urlparse(s3_uri)
-        bucket_name = parsed_uri.netloc
-        object_key = parsed_uri.path.lstrip('/')
-        
-        # S3에서 파일 읽기
-        response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
-        content = response['Body'].read().decode('utf-8')
+        # S3에서 파일 읽기 (파싱 결과 캐시 사용)
+        articles, texts = read_s3_articles(s3_uri)
         
-        # .md 파일에서 기사들을 분리
-        articles = content.split('\n---\n')
-        
-        best_metadata = None
+        best_article = None
         max_relevance = 0
+        query_words = set(query_chunk.lower().split())
         
         # 각 기사에서 관련성 검사
-        for i, article in enumerate(articles[1:], 1):  # 첫 번째는 헤더이므로 제외
-            # 제목 추출
-            title_match = re.search(r'###\s*\d+\.\s*(.+?)(?:\n|$)', article)
-            title = title_match.group(1).strip() if title_match else ""
+        for i, (article, text) in enumerate(zip(articles, texts), 1):
+            title = article.title
             
-            # 기사 본문에서 쿼리 청크와의 관련성 계산
+            # 기사 블록 전체에서 쿼리 청크와의 관련성 계산
             relevance = 0
-            query_words = set(query_chunk.lower().split())
-            article_words = set(article.lower().split())
+            article_words = set(text.split())
             
             # 단어 매칭으로 간단한 관련성 계산
             common_words = query_words.intersection(article_words)
@@ -777,46 +1015,9 @@ def find_best_matching_article(s3_uri: str, query_chunk: str) -> Dict[str, str]:
             
             if relevance > max_relevance:
                 max_relevance = relevance
-                
-                # 해당 기사의 메타데이터 추출
-                metadata = {
-                    "title": title,
-                    "date": "",
-                    "author": "",
-                    "media": "서울경제",
-                    "url": ""
-                }
-                
-                # 발행일 추출
-                date_match = re.search(r'\*\*발행일:\*\*\s*([^\n]+)', article)
-                if date_match:
-                    date_str = date_match.group(1).strip()
-                    try:
-                        if 'T' in date_str:
-                            dt = datetime.fromisoformat(date_str.replace('T00:00:00.000+09:00', ''))
-                            metadata["date"] = dt.strftime('%Y년 %m월 %d일')
-                        else:
-                            metadata["date"] = date_str
-                    except:
-                        metadata["date"] = date_str
-                
-                # 기자 추출
-                author_match = re.search(r'\*\*기자:\*\*\s*([^\n]+)', article)
-                if author_match:
-                    metadata["author"] = author_match.group(1).strip()
-                
-                # 언론사 추출
-                media_match = re.search(r'\*\*언론사:\*\*\s*([^\n]+)', article)
-                if media_match:
-                    metadata["media"] = media_match.group(1).strip()
-                
-                # URL 추출
-                url_match = re.search(r'\*\*URL:\*\*\s*([^\n\s]+)', article)
-                if url_match:
-                    metadata["url"] = url_match.group(1).strip()
-                
-                best_metadata = metadata
+                best_article = article
         
+        best_metadata = article_metadata(best_article) if best_article else None
         logger.info(f"Best matching article metadata: {best_metadata}")
         return best_metadata or extract_metadata_from_s3(s3_uri)
         
@@ -825,49 +1026,149 @@ def find_best_matching_article(s3_uri: str, query_chunk: str) -> Dict[str, str]:
         return extract_metadata_from_s3(s3_uri)
 
 
-def handle_chat(event: Dict[str, Any]) -> Dict[str, Any]:
-    """챗봇 대화 요청을 처리합니다."""
+def answer_from_session(question: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """세션에 보관된 직전 턴의 기사 청크만으로 후속 질문에 답합니다 (KB 검색·S3 조회 없음)."""
+    formatted_articles = []
+    for i, (source, chunk) in enumerate(zip(record["sources"], record["chunks"]), 1):
+        formatted_articles.append(f"[기사 {i}] {source.get('title', '')} ({source.get('date', '')})\n{chunk['text']}")
+    articles_text = '\n\n'.join(formatted_articles)
+
+    prompt = f"""이전 질문: {record.get('question', '')}
+
+후속 질문: {question}
+
+이전 답변에 사용한 뉴스 기사들:
+{articles_text}
+
+**중요 지침:**
+1. 위 기사 내용만 근거로 후속 질문에 답변
+2. 기사에 없는 내용은 추측하지 말고 기사에서 확인되지 않는다고 답변
+3. 각주는 위 기사 번호 [1]~[{len(formatted_articles)}]를 그대로 사용
+
+답변 작성:"""
+
+    answer = invoke_claude(prompt, max_tokens=1000, purpose="session_followup")
+
+    return {
+        "answer": answer,
+        "sources": record["sources"],
+        "question": question,
+        "timestamp": datetime.utcnow().isoformat(),
+        "enhanced_search": False,
+        "_context": record["chunks"]
+    }
+
+
+def orchestrated_response(question: str) -> Dict[str, Any]:
+    """기본 전략: 오케스트레이션 검색, 실패 시 오타 교정·외부 검색 보강 후 수동 검색+생성"""
+    # 오케스트레이션 기반 검색 사용
     try:
-        # API Gateway 이벤트에서 본문 추출
-        if 'body' in event:
-            if isinstance(event['body'], str):
-                request_body = json.loads(event['body'])
+        response = orchestrated_news_search(question)
+        logger.info("Successfully used orchestrated search")
+    except Exception as e:
+        logger.warning(f"Orchestrated search failed: {e}, falling back to traditional approach")
+        # 폴백: 기존 방식 사용
+        if is_typo(question):
+            correction = correct_spelling(question)
+            if correction.changed and correction.confidence >= SPELL_CONFIDENCE_THRESHOLD:
+                logger.info(f"Typo corrected locally: {correction}")
+                corrected_q, extra_ctx = correction.text, ""
             else:
-                request_body = event['body']
-        else:
-            request_body = event
-            
-        question = validate_request_body(request_body)
-        
-        logger.info(f"Processing chat request: {question}")
-        
-        # 오케스트레이션 기반 검색 사용
-        try:
-            response = orchestrated_news_search(question)
-            logger.info("Successfully used orchestrated search")
-        except Exception as e:
-            logger.warning(f"Orchestrated search failed: {e}, falling back to traditional approach")
-            # 폴백: 기존 방식 사용
-            if is_typo(question):
-                logger.info("Typo detected – invoking Perplexity spellfix")
+                logger.info(f"Low-confidence typo ({correction.confidence:.2f}) – invoking Perplexity spellfix")
                 try:
                     corrected_q, extra_ctx = perplexity_spellfix(question)
                 except ChatbotError as ce:
                     logger.warning(f"Spellfix failed: {ce}")
                     corrected_q, extra_ctx = question, ""
-                response = retrieve_and_generate_with_references(corrected_q, extra_context=extra_ctx)
+            response = retrieve_and_generate_with_references(corrected_q, extra_context=extra_ctx)
 
-            elif needs_external_search(question):
-                logger.info("Date-related hard question – invoking Perplexity refine")
-                try:
-                    refined_q, extra_ctx = perplexity_refine(question)
-                except ChatbotError as ce:
-                    logger.warning(f"Refine failed: {ce}")
-                    refined_q, extra_ctx = question, ""
-                response = retrieve_and_generate_with_references(refined_q, extra_context=extra_ctx)
+        elif needs_external_search(question):
+            logger.info("Date-related hard question – invoking Perplexity refine")
+            try:
+                refined_q, extra_ctx = perplexity_refine(question)
+            except ChatbotError as ce:
+                logger.warning(f"Refine failed: {ce}")
+                refined_q, extra_ctx = question, ""
+            response = retrieve_and_generate_with_references(refined_q, extra_context=extra_ctx)
+
+        else:  # easy path
+            response = retrieve_and_generate_with_references(question)
+    return response
+
+
+def kb_retrieve_and_generate(question: str) -> Dict[str, Any]:
+    """관리형 전략: Bedrock retrieveAndGenerate 한 번으로 검색·생성"""
+    if not KNOWLEDGE_BASE_ID:
+        raise ChatbotError("관리형 검색에는 KNOWLEDGE_BASE_ID가 필요합니다")
+    try:
+        expanded_query = expand_query_with_ai(question)
+        logger.info(f"Querying knowledge base (managed RAG) with expanded query: {expanded_query}")
+        response = bedrock_agent_runtime.retrieve_and_generate(
+            input={"text": expanded_query},
+            retrieveAndGenerateConfiguration={
+                "type": "KNOWLEDGE_BASE",
+                "knowledgeBaseConfiguration": {
+                    "knowledgeBaseId": KNOWLEDGE_BASE_ID,
+                    "modelArn": f"arn:aws:bedrock:{bedrock_agent_runtime.meta.region_name}::foundation-model/{CLAUDE_MODEL_ID}",
+                    "retrievalConfiguration": {
+                        "vectorSearchConfiguration": {
+                            "numberOfResults": 5,
+                            "overrideSearchType": "HYBRID"
+                        }
+                    },
+                    "generationConfiguration": {
+                        "promptTemplate": {
+                            "textPromptTemplate": """다음 뉴스 기사들을 참고하여 질문에 답변해주세요.
+
+질문: $query$
+
+뉴스 기사:
+$search_results$
+
+답변 작성 규칙:
+1. 제공된 뉴스 기사의 정보만 사용하여 답변하세요
+2. 중요한 정보나 수치를 언급할 때는 반드시 출처를 명시하세요
+3. 각 문장 끝에 [1], [2] 형태의 각주 번호를 추가하세요
+4. 정확하고 객관적인 정보만 제공하세요
+5. 추측이나 개인적 의견은 포함하지 마세요
+
+답변:"""
+                        }
+                    }
+                }
+            }
+        )
+        # 관리형 생성은 토큰 사용량을 반환하지 않으므로 호출 수만 기록
+        record_model_call()
+        return response
+
+    except ClientError as e:
+        error_message = e.response.get("Error", {}).get("Message", "Unknown error")
+        logger.error(f"Bedrock retrieveAndGenerate error: {error_message}")
+        raise ChatbotError(f"지식 기반 검색 중 오류가 발생했습니다: {error_message}")
+
+
+# 검색·생성 전략 등록부 (STRATEGY_WEIGHTS 비율 또는 X-Chat-Strategy 헤더로 선택)
+strategies = StrategyRegistry()
+strategies.register("orchestrated", orchestrated_response)
+strategies.register("manual_rag", retrieve_and_generate_with_references)
+strategies.register("kb_rag", kb_retrieve_and_generate)
+
+
+def answer_question(question: str, strategy: Optional[str] = None) -> Dict[str, Any]:
+    """
+    질문 하나에 대한 답변과 출처를 생성합니다. 모든 검색 경로가 실패하면 ChatbotError를 발생시킵니다.
+
+    strategy를 주지 않으면 STRATEGY_WEIGHTS 비율에 따라 검색·생성 전략을 고릅니다.
+    """
+    # "오늘 경제 주요 뉴스"류 질문은 수집 시 만들어 둔 다이제스트로 바로 답변
+    digest_result = answer_from_digest(s3_client, question)
+    if digest_result is not None:
+        put_metrics({"DigestAnswers": 1})
+        return digest_result
 
-            else:  # easy path
-                response = retrieve_and_generate_with_references(question)
+    try:
+        response = strategies.run(strategy or strategies.choose(question)[0], question)
         
         answer = response.get("output", {}).get("text", "답변을 생성할 수 없습니다")
         citations = response.get("citations", [])
@@ -1025,8 +1326,99 @@ def handle_chat(event: Dict[str, Any]) -> Dict[str, Any]:
             "timestamp": response.get("sessionId", ""),
             "enhanced_search": used_perplexity
         }
+
+        # 후속 질문 재사용을 위해 출처별 검색 청크를 보관 (응답 본문에서는 제거됨)
+        chunk_texts: Dict[str, str] = {}
+        for citation in citations:
+            for reference in citation.get("retrievedReferences", []):
+                s3_uri = reference.get("location", {}).get("s3Location", {}).get("uri", "")
+                if s3_uri and s3_uri not in chunk_texts:
+                    chunk_texts[s3_uri] = reference.get("content", {}).get("text", "")
+        result["_context"] = [{"s3_uri": source["s3_uri"], "text": chunk_texts.get(source["s3_uri"], "")}
+                              for source in top_sources]
         
         logger.info(f"Generated response with {len(top_sources)} sources")
+        return result
+
+    except ChatbotError as e:
+        local_result = answer_from_local_index(question)
+        if local_result:
+            logger.warning(f"Chatbot error: {str(e)} – answered from local BM25 index")
+            return local_result
+
+        logger.warning(f"Chatbot error: {str(e)} – trying Perplexity fallback")
+        fallback_answer = query_perplexity(question)
+        return {
+            "answer": fallback_answer,
+            "sources": [],  # Perplexity에서 별도 출처 제공하지 않음
+            "question": question,
+            "timestamp": datetime.utcnow().isoformat(),
+            "cacheable": False
+        }
+
+
+def handle_chat(event: Dict[str, Any]) -> Dict[str, Any]:
+    """챗봇 대화 요청을 처리합니다."""
+    try:
+        # API Gateway 이벤트에서 본문 추출
+        if 'body' in event:
+            if isinstance(event['body'], str):
+                request_body = json.loads(event['body'])
+            else:
+                request_body = event['body']
+        else:
+            request_body = event
+            
+        question = validate_request_body(request_body)
+        session_id = request_body.get("sessionId")
+        if session_id is not None and not is_valid_session_id(session_id):
+            raise ChatbotError("sessionId는 128자 이하의 영문, 숫자, '-', '_'만 사용할 수 있습니다")
+        
+        logger.info(f"Processing chat request: {question}")
+
+        result = None
+        if session_id:
+            # 직전 턴의 출처로 답할 수 있는 후속 질문이면 검색 생략
+            record = get_session_store().load(session_id)
+            if is_follow_up(question, record):
+                try:
+                    result = answer_from_session(question, record)
+                    logger.info(f"Answered follow-up from session {session_id} without retrieval")
+                except Exception as e:
+                    logger.warning(f"Session answer failed, running full search: {e}")
+
+        strategy, forced = strategies.choose(question, event.get("headers"))
+        if result is None and forced:
+            # 헤더로 전략을 지정한 비교 요청은 캐시·요청 합치기 없이 해당 전략으로 처리
+            logger.info(f"Using strategy '{strategy}' requested by header")
+            result = answer_question(question, strategy)
+
+        if result is None:
+            # 현재 데이터 버전에서 이미 답한 질문이면 캐시된 답변 사용
+            answer_cache = get_answer_cache()
+            cache_status, version = "bypass", None
+            if answer_cache is not None:
+                version = answer_cache.data_version.current(s3_client)
+                result = answer_cache.get(s3_client, question)
+                if version is not None:
+                    cache_status = "hit" if result is not None else "miss"
+            log_query(question, cache_status, version)
+
+            if result is None:
+                # 같은 질문이 동시에 처리 중이면 그 결과를 공유 (single-flight)
+                result, shared = coalesce(question, lambda: answer_question(question, strategy))
+                if shared:
+                    logger.info("Shared in-flight answer for identical question")
+                elif answer_cache is not None:
+                    answer_cache.put(s3_client, question, result, version=version)
+
+        result = dict(result, question=question)
+        context = result.pop("_context", None)
+        result.pop("cacheable", None)
+        if session_id:
+            if context:
+                get_session_store().save(session_id, build_session_record(question, result["sources"], context))
+            result["sessionId"] = session_id
         
         # API Gateway 응답 형식
         return {
@@ -1035,44 +1427,24 @@ def handle_chat(event: Dict[str, Any]) -> Dict[str, Any]:
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Methods": "POST, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization"
+                "Access-Control-Allow-Headers": "Content-Type, Authorization, Idempotency-Key, X-Request-Id, X-Chat-Strategy"
             },
             "body": json.dumps(result, ensure_ascii=False)
         }
         
     except ChatbotError as e:
-        logger.warning(f"Chatbot error: {str(e)} – trying Perplexity fallback")
-        try:
-            fallback_answer = query_perplexity(question)
-            result = {
-                "answer": fallback_answer,
-                "sources": [],  # Perplexity에서 별도 출처 제공하지 않음
-                "question": question,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            return {
-                "statusCode": 200,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Methods": "POST, OPTIONS",
-                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
-                },
-                "body": json.dumps(result, ensure_ascii=False),
-            }
-        except ChatbotError as pe:
-            # Perplexity도 실패 시 원래 400 응답
-            return {
-                "statusCode": 400,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps({
-                    "error": str(pe),
-                    "type": "validation_error"
-                }, ensure_ascii=False)
-            }
+        # 요청 검증 실패 또는 Perplexity 폴백까지 실패
+        return {
+            "statusCode": 400,
+            "headers": {
+                "Content-Type": "application/json",
+                "Access-Control-Allow-Origin": "*"
+            },
+            "body": json.dumps({
+                "error": str(e),
+                "type": "validation_error"
+            }, ensure_ascii=False)
+        }
         
     except Exception as e:
         logger.error(f"Unexpected error in handle_chat: {str(e)}")
@@ -1089,10 +1461,219 @@ def handle_chat(event: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+def _duplicate_in_progress_response() -> Dict[str, Any]:
+    """같은 요청이 아직 처리 중일 때의 응답"""
+    return {
+        "statusCode": 409,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": "*"
+        },
+        "body": json.dumps({
+            "error": "같은 요청을 처리하고 있습니다. 잠시 후 다시 시도해주세요",
+            "type": "duplicate_in_progress"
+        }, ensure_ascii=False)
+    }
+
+
+def handle_chat_idempotent(event: Dict[str, Any]) -> Dict[str, Any]:
+    """중복 /chat 요청(재시도·더블 클릭)에는 첫 요청의 응답을 돌려줍니다."""
+    layer = get_idempotency_layer()
+    if layer is None:
+        return handle_chat(event)
+    return layer.handle(event, handle_chat, _duplicate_in_progress_response)
+
+
+def _batch_item_error(error: Exception) -> Dict[str, Any]:
+    """배치 항목 하나의 실패를 단건 /chat 오류 응답과 같은 형식으로 변환합니다."""
+    if isinstance(error, ChatbotError):
+        return {"error": str(error), "type": "validation_error"}
+    logger.error(f"Unexpected error in batch item: {str(error)}")
+    return {"error": "서버 내부 오류가 발생했습니다", "type": "internal_error"}
+
+
+def handle_chat_batch(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    여러 질문을 한 번에 처리합니다.
+
+    요청: {"questions": ["질문1", {"question": "질문2"}, ...]}
+    응답: {"results": [...입력 순서, 항목별 answer/sources 또는 error...], "stats": {...}}
+    """
+    try:
+        if isinstance(event.get('body'), str):
+            request_body = json.loads(event['body'])
+        else:
+            request_body = event.get('body', event)
+
+        items = request_body.get("questions") if isinstance(request_body, dict) else None
+        if not isinstance(items, list) or not items:
+            raise ChatbotError("질문 목록(questions) 필드가 필요합니다")
+        if len(items) > BATCH_MAX_QUESTIONS:
+            raise ChatbotError(f"한 번에 최대 {BATCH_MAX_QUESTIONS}개 질문까지 처리할 수 있습니다")
+
+        questions = [
+            validate_request_body(item if isinstance(item, dict) else {"question": item if isinstance(item, str) else ""})
+            for item in items
+        ]
+        logger.info(f"Processing batch chat request: {len(questions)} questions")
+
+        result = run_batch(questions, answer_question, _batch_item_error, prepare_fn=analyze_questions_bulk)
+        for item in result["results"]:
+            item.pop("_context", None)
+
+        return {
+            "statusCode": 200,
+            "headers": {
+                "Content-Type": "application/json",
+                "Access-Control-Allow-Origin": "*",
+                "Access-Control-Allow-Methods": "POST, OPTIONS",
+                "Access-Control-Allow-Headers": "Content-Type, Authorization, Idempotency-Key, X-Request-Id, X-Chat-Strategy"
+            },
+            "body": json.dumps(result, ensure_ascii=False)
+        }
+
+    except ChatbotError as e:
+        return {
+            "statusCode": 400,
+            "headers": {
+                "Content-Type": "application/json",
+                "Access-Control-Allow-Origin": "*"
+            },
+            "body": json.dumps({
+                "error": str(e),
+                "type": "validation_error"
+            }, ensure_ascii=False)
+        }
+
+    except Exception as e:
+        logger.error(f"Unexpected error in handle_chat_batch: {str(e)}")
+        return {
+            "statusCode": 500,
+            "headers": {
+                "Content-Type": "application/json",
+                "Access-Control-Allow-Origin": "*"
+            },
+            "body": json.dumps({
+                "error": "서버 내부 오류가 발생했습니다",
+                "type": "internal_error"
+            }, ensure_ascii=False)
+        }
+
+
+def handle_prewarm(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    답변 캐시 사전 적재 이벤트를 처리합니다 (API Gateway를 거치지 않는 직접 호출).
+
+    {"action": "prewarm", "dataVersion": "<수집 작업 ID>"}  : 인기 질문으로 해당 버전 캐시 채우기
+    {"action": "prewarm_report", "dataVersion": "..."}     : 해당 버전에서 관측된 캐시 적중률
+    dataVersion이 없으면 현재 데이터 버전을 사용합니다.
+    """
+    try:
+        answer_cache = get_answer_cache()
+        version = event.get("dataVersion") or (answer_cache.data_version.current(s3_client) if answer_cache else None)
+        if answer_cache is None or not version:
+            raise ChatbotError("답변 캐시가 비활성화되어 있거나 데이터 버전을 알 수 없습니다")
+
+        if event.get("action") == "prewarm" and not answer_cache.shared:
+            # 공유 저장소(CHATBOT_STATE_TABLE)가 없으면 채운 답변이 이 컨테이너에만 남으므로 건너뜀
+            logger.warning("Skipping prewarm: no shared state store configured")
+            return {
+                "statusCode": 200,
+                "body": json.dumps({"skipped": "no shared state store", "data_version": version}, ensure_ascii=False)
+            }
+
+        logs_client = boto3.client("logs")
+        if event.get("action") == "prewarm_report":
+            report = observed_hit_rate(logs_client, version)
+        else:
+            questions, total_queries = mine_top_questions(logs_client)
+            report = run_prewarm(questions, answer_question, answer_cache, s3_client, version,
+                                 total_queries=total_queries)
+            put_metrics({
+                "PrewarmWarmed": report["warmed"],
+                "PrewarmSkippedBudget": report["skipped_budget"],
+                "PrewarmCostUsd": report["cost_usd"],
+            }, units={"PrewarmCostUsd": "None"})
+
+        return {
+            "statusCode": 200,
+            "body": json.dumps(report, ensure_ascii=False)
+        }
+
+    except Exception as e:
+        logger.error(f"Prewarm failed: {str(e)}")
+        return {
+            "statusCode": 500,
+            "body": json.dumps({
+                "error": "Prewarm failed",
+                "message": str(e)
+            }, ensure_ascii=False)
+        }
+
+
+def _prime_connection(call) -> str:
+    """
+    요청 하나를 보내 연결 풀에 연결(DNS·TLS)을 만들어 둡니다.
+
+    모델 호출·검색 비용이 생기지 않도록 서버에서 거절되는 요청을 보내므로 ClientError가 정상입니다.
+    """
+    try:
+        call()
+    except ClientError as e:
+        return e.response.get("Error", {}).get("Code", "ClientError")
+    return "ok"
+
+
+def _load_entity_expander() -> None:
+    """개체 확장 사전을 S3에서 읽어 둡니다."""
+    get_expander(s3_client)
+
+
+def _init_state_stores() -> None:
+    """싱글플라이트·세션 저장소 클라이언트를 만들어 둡니다."""
+    get_singleflight()
+    get_session_store()
+
+
+def handle_warmup(event: Dict[str, Any]) -> Dict[str, Any]:
+    """keep-warm 이벤트: 클라이언트 연결과 S3 보조 아티팩트를 준비하고 준비 비용을 보고합니다 (모델 호출 없음)."""
+    global _warmed_up
+
+    cold_start = not _warmed_up
+    _warmed_up = True
+    answer_cache = get_answer_cache()
+
+    steps = {
+        # 빈 요청 본문은 모델 호출 전 입력 검증에서 거절됨
+        "bedrock_runtime": lambda: _prime_connection(
+            lambda: bedrock_runtime.invoke_model(modelId=CLAUDE_MODEL_ID, body="{}")
+        ),
+        # 존재하지 않는 KB ID는 검색 전에 거절됨
+        "bedrock_agent_runtime": lambda: _prime_connection(
+            lambda: bedrock_agent_runtime.retrieve(knowledgeBaseId="WARMUP0000", retrievalQuery={"text": "warmup"})
+        ),
+        "recent_index": lambda: len(get_recent_index(s3_client).records) if get_recent_index(s3_client) else 0,
+        "bm25_index": lambda: get_bm25_index(s3_client).num_docs if get_bm25_index(s3_client) else 0,
+        "spell_corrector": lambda: len(get_corrector(s3_client).words),
+        "entity_expander": _load_entity_expander,
+        "digests": lambda: preload_digests(s3_client),
+        "data_version": lambda: answer_cache.data_version.current(s3_client) if answer_cache else None,
+        "state_stores": _init_state_stores,
+    }
+    if PERPLEXITY_API_KEY:
+        steps["perplexity"] = lambda: http_session.head(PPLX_URL, timeout=5).status_code
+
+    report = run_warmup(steps, init_ms=(_INIT_FINISHED - _INIT_STARTED) * 1000, cold_start=cold_start)
+    return {
+        "statusCode": 200,
+        "body": json.dumps(report, ensure_ascii=False)
+    }
+
+
 def health_check(event: Dict[str, Any]) -> Dict[str, Any]:
     """헬스 체크 엔드포인트"""
     try:
-        if not KNOWLEDGE_BASE_ID:
+        if not KNOWLEDGE_BASE_ID and not KB_SHARDS:
             return {
                 "statusCode": 500,
                 "headers": {
@@ -1115,6 +1696,11 @@ def health_check(event: Dict[str, Any]) -> Dict[str, Any]:
                 "status": "healthy",
                 "service": "news-chatbot-simple",
                 "knowledge_base_id": KNOWLEDGE_BASE_ID,
+                "knowledge_base_shards": [shard.knowledge_base_id for shard in KB_SHARDS],
+                "knowledge_base_shard_failures": shard_failure_stats(),
+                "singleflight": get_singleflight().stats(),
+                "answer_cache": get_answer_cache().stats() if get_answer_cache() else None,
+                "strategies": strategies.stats(),
                 "version": "1.0.0"
             }, ensure_ascii=False)
         }
@@ -1136,9 +1722,18 @@ def health_check(event: Dict[str, Any]) -> Dict[str, Any]:
 
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """Lambda 함수의 메인 핸들러"""
+    global _warmed_up
+
     logger.info(f"Processing request: {json.dumps(event, default=str)}")
     
     try:
+        # API Gateway를 거치지 않는 내부 이벤트 (keep-warm 핑, news_fetcher 호출)
+        if is_warmup_event(event):
+            return handle_warmup(event)
+        if event.get("action") in ("prewarm", "prewarm_report"):
+            return handle_prewarm(event)
+        _warmed_up = True
+
         # HTTP 메서드와 경로에 따라 라우팅
         http_method = event.get("httpMethod", "POST")
         path = event.get("path", "/chat")
@@ -1150,14 +1745,16 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                 "headers": {
                     "Access-Control-Allow-Origin": "*",
                     "Access-Control-Allow-Methods": "POST, GET, OPTIONS",
-                    "Access-Control-Allow-Headers": "Content-Type, Authorization"
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization, Idempotency-Key, X-Request-Id, X-Chat-Strategy"
                 },
                 "body": ""
             }
         elif path == "/health" or path.endswith("/health"):
             return health_check(event)
+        elif path.endswith("/chat/batch"):
+            return handle_chat_batch(event)
         elif path == "/chat" or path.endswith("/chat"):
-            return handle_chat(event)
+            return handle_chat_idempotent(event)
         else:
             return {
                 "statusCode": 404,
@@ -1187,4 +1784,8 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
 
 
 # 하위 호환성을 위한 별칭
-handler = lambda_handler
\ No newline at end of file
+handler = lambda_handler
+
+# 이 실행 환경에서 이벤트를 처리한 적이 있는지 (warm-up 보고서의 cold_start 판정)
+_warmed_up = False
+_INIT_FINISHED = time.time()
\ No newline at end of file
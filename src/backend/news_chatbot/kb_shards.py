@@ -0,0 +1,168 @@
+"""
+Year-sharded Knowledge Base Retrieval
+
+연도 구간별로 분리된 Knowledge Base(샤드)를 병렬로 조회하고 점수 기준으로 병합합니다.
+
+샤드 맵은 KNOWLEDGE_BASE_SHARDS 환경 변수에 JSON 배열로 설정합니다.
+
+    [
+        {"knowledge_base_id": "KB16TO20", "from_year": 2016, "to_year": 2020},
+        {"knowledge_base_id": "KB21TO24", "from_year": 2021, "to_year": 2024},
+        {"knowledge_base_id": "KB25ON", "from_year": 2025}
+    ]
+
+to_year 를 생략하면 현재까지 열린 구간으로 취급합니다. 샤드별로 독립적으로
+재색인할 수 있으므로 과거 연도 샤드는 한 번 구축한 뒤 그대로 둘 수 있습니다.
+
+샤드 조회 실패는 샤드별로 세어 KbShardFailures 지표(KnowledgeBaseId 차원)로 내보내고
+헬스 체크(failure_stats)에 보고합니다. 실패한 샤드의 연도 구간은 답변에서 빠지기 때문입니다.
+"""
+
+import json
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from metrics import put_metrics
+
+logger = logging.getLogger()
+
+# 병렬 조회 시 최대 동시 샤드 수
+MAX_PARALLEL_SHARDS = 8
+
+
+class KnowledgeBaseShard:
+    """연도 구간 하나를 담당하는 Knowledge Base 샤드"""
+
+    def __init__(self, knowledge_base_id: str, from_year: int, to_year: Optional[int] = None):
+        self.knowledge_base_id = knowledge_base_id
+        self.from_year = from_year
+        self.to_year = to_year
+
+    def overlaps(self, years: List[int]) -> bool:
+        """주어진 연도 중 하나라도 샤드 구간에 포함되면 True"""
+        upper = self.to_year if self.to_year is not None else datetime.now().year
+        return any(self.from_year <= year <= upper for year in years)
+
+    def __repr__(self) -> str:
+        upper = self.to_year if self.to_year is not None else "now"
+        return f"KnowledgeBaseShard({self.knowledge_base_id}, {self.from_year}-{upper})"
+
+
+def load_shard_map(raw: Optional[str]) -> List[KnowledgeBaseShard]:
+    """환경 변수 JSON 문자열을 샤드 목록으로 변환합니다. 설정 오류 시 빈 목록을 반환합니다."""
+    if not raw:
+        return []
+
+    try:
+        entries = json.loads(raw)
+        shards = [
+            KnowledgeBaseShard(
+                knowledge_base_id=entry["knowledge_base_id"],
+                from_year=int(entry["from_year"]),
+                to_year=int(entry["to_year"]) if entry.get("to_year") is not None else None,
+            )
+            for entry in entries
+        ]
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Invalid KNOWLEDGE_BASE_SHARDS configuration: {e}")
+        return []
+
+    shards.sort(key=lambda shard: shard.from_year)
+    logger.info(f"Loaded knowledge base shard map: {shards}")
+    return shards
+
+
+def parse_years(target_years: Optional[List[str]]) -> List[int]:
+    """'2024', '2025년' 같은 연도 문자열 목록을 정수 목록으로 변환합니다."""
+    years = []
+    for value in target_years or []:
+        digits = "".join(ch for ch in str(value) if ch.isdigit())[:4]
+        if len(digits) == 4:
+            years.append(int(digits))
+    return years
+
+
+def select_shards(shards: List[KnowledgeBaseShard], target_years: Optional[List[str]]) -> List[KnowledgeBaseShard]:
+    """대상 연도와 겹치는 샤드만 선택합니다. 연도 정보가 없으면 전체 샤드를 조회합니다."""
+    years = parse_years(target_years)
+    if not years:
+        return list(shards)
+
+    selected = [shard for shard in shards if shard.overlaps(years)]
+    return selected or list(shards)
+
+
+_failures: Counter = Counter()
+_failures_lock = threading.Lock()
+
+
+def _record_failure(shard: KnowledgeBaseShard, error: Exception) -> None:
+    logger.error(f"Shard {shard.knowledge_base_id} ({shard.from_year}-{shard.to_year or 'now'}) retrieve failed: {error}")
+    with _failures_lock:
+        _failures[shard.knowledge_base_id] += 1
+    put_metrics({"KbShardFailures": 1}, dimensions={"KnowledgeBaseId": shard.knowledge_base_id})
+
+
+def failure_stats() -> Dict[str, int]:
+    """이 프로세스에서 샤드별 누적 조회 실패 수"""
+    with _failures_lock:
+        return dict(_failures)
+
+
+def _retrieve_from_shard(client, shard: KnowledgeBaseShard, query: str, number_of_results: int) -> List[Dict[str, Any]]:
+    response = client.retrieve(
+        knowledgeBaseId=shard.knowledge_base_id,
+        retrievalQuery={"text": query},
+        retrievalConfiguration={
+            "vectorSearchConfiguration": {
+                "numberOfResults": number_of_results,
+                "overrideSearchType": "HYBRID"
+            }
+        }
+    )
+    return response.get("retrievalResults", [])
+
+
+def retrieve_from_shards(client, shards: List[KnowledgeBaseShard], query: str,
+                         target_years: Optional[List[str]] = None,
+                         number_of_results: int = 5) -> List[Dict[str, Any]]:
+    """
+    대상 연도와 겹치는 샤드만 병렬로 조회하고 점수 내림차순으로 병합합니다.
+
+    일부 샤드가 실패해도 나머지 샤드 결과로 응답하며, 모든 샤드가 실패한 경우에만
+    마지막 예외를 그대로 전달합니다.
+    """
+    selected = select_shards(shards, target_years)
+    logger.info(f"Querying {len(selected)}/{len(shards)} knowledge base shards for years {target_years}: {selected}")
+
+    if len(selected) == 1:
+        try:
+            return _retrieve_from_shard(client, selected[0], query, number_of_results)
+        except Exception as e:
+            _record_failure(selected[0], e)
+            raise
+
+    merged: List[Dict[str, Any]] = []
+    last_error: Optional[Exception] = None
+
+    with ThreadPoolExecutor(max_workers=min(len(selected), MAX_PARALLEL_SHARDS)) as executor:
+        futures = {
+            executor.submit(_retrieve_from_shard, client, shard, query, number_of_results): shard
+            for shard in selected
+        }
+        for future, shard in futures.items():
+            try:
+                merged.extend(future.result())
+            except Exception as e:
+                _record_failure(shard, e)
+                last_error = e
+
+    if not merged and last_error is not None:
+        raise last_error
+
+    merged.sort(key=lambda result: result.get("score", 0.0), reverse=True)
+    return merged[:number_of_results]
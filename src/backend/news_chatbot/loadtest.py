@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Lambda 핸들러 vs ASGI 서버 부하 비교 (스텁 백엔드)
+
+Bedrock, Knowledge Base, S3 호출을 지연만 흉내 내는 스텁으로 바꾼 뒤,
+같은 질문 N개를
+  - lambda : 컨테이너 하나가 요청을 하나씩 처리하는 방식 (index.lambda_handler 순차 호출)
+  - asgi   : 한 프로세스가 요청을 동시에 처리하는 방식 (server.app 동시 호출)
+  - batch  : 질문 N개를 /chat/batch 한 번으로 처리하는 방식
+으로 처리해 처리량과 지연 시간을 비교합니다.
+
+사용법 예)
+    # news_markdown 등 공유 모듈은 레이어(src/backend/common/layers/news_shared)에 있으므로 경로 지정
+    export PYTHONPATH=../common/layers/news_shared
+    python loadtest.py --requests 50 --invoke-latency 0.2 --retrieve-latency 0.1
+    python loadtest.py --requests 50 --identical     # 같은 질문 동시 유입 (single-flight 합치기 확인)
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import re
+import statistics
+import time
+from typing import Any, Dict, List
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+os.environ.setdefault("KNOWLEDGE_BASE_ID", "STUBKB")
+os.environ.setdefault("RECENT_INDEX_ENABLED", "false")
+os.environ.setdefault("AWS_MAX_POOL_CONNECTIONS", "64")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+import answer_cache  # noqa: E402
+import idempotency  # noqa: E402
+import index  # noqa: E402
+import server  # noqa: E402
+import session  # noqa: E402
+import singleflight  # noqa: E402
+
+STUB_BUCKET = "stub-news-data"
+STUB_MARKDOWN = """# 2025-07-21 경제 뉴스
+
+---
+
+### 1. 한국은행, 기준금리 연 2.50% 동결
+
+**발행일:** 2025-07-21T00:00:00.000+09:00
+**기자:** 홍길동
+**URL:** https://www.sedaily.com/NewsView/STUB0001
+
+**내용:**
+한국은행 금융통화위원회가 21일 기준금리를 연 2.50%로 동결했다.
+"""
+
+
+class StubBedrockRuntime:
+    """invoke_model 지연만 흉내 내는 Bedrock Runtime 스텁"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> Dict[str, Any]:
+        self.calls += 1
+        time.sleep(self.latency)
+        prompt = json.loads(body)["messages"][0]["content"]
+        analysis = {
+            "user_goal": "기준금리 확인",
+            "time_context": "최근",
+            "target_year_range": ["2025"],
+            "key_entities": ["기준금리"],
+            "search_strategy": "stub"
+        }
+        if "JSON 배열" in prompt:
+            count = len(re.findall(r"^\d+\. ", prompt, flags=re.MULTILINE))
+            text = json.dumps([analysis] * count, ensure_ascii=False)
+        elif '"user_goal"' in prompt:
+            text = json.dumps(analysis, ensure_ascii=False)
+        else:
+            text = "한국은행은 기준금리를 연 2.50%로 동결했습니다 [1]."
+        payload = {"content": [{"text": text}], "usage": {"input_tokens": len(prompt) // 2, "output_tokens": len(text) // 2}}
+        return {"body": io.BytesIO(json.dumps(payload, ensure_ascii=False).encode("utf-8"))}
+
+
+class StubAgentRuntime:
+    """retrieve 지연만 흉내 내는 Bedrock Agent Runtime 스텁"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def retrieve(self, **kwargs) -> Dict[str, Any]:
+        self.calls += 1
+        time.sleep(self.latency)
+        return {"retrievalResults": [{
+            "content": {"text": "한국은행 금융통화위원회가 21일 기준금리를 연 2.50%로 동결했다."},
+            "location": {"type": "S3", "s3Location": {"uri": f"s3://{STUB_BUCKET}/news-data-md/2025/07/21/경제.md"}},
+            "metadata": {},
+            "score": 0.8
+        }]}
+
+
+class StubS3:
+    """마크다운 원본만 제공하는 S3 스텁. 색인 아티팩트는 없는 것으로 취급합니다."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        self.calls += 1
+        time.sleep(self.latency)
+        if Bucket == STUB_BUCKET and Key.endswith(".md"):
+            return {"Body": io.BytesIO(STUB_MARKDOWN.encode("utf-8"))}
+        raise KeyError(f"NoSuchKey: {Key}")
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        raise KeyError(f"NoSuchKey: {Key}")
+
+
+def install_stubs(args) -> Dict[str, Any]:
+    stubs = {
+        "bedrock": StubBedrockRuntime(args.invoke_latency),
+        "kb": StubAgentRuntime(args.retrieve_latency),
+        "s3": StubS3(args.s3_latency),
+    }
+    index.bedrock_runtime = stubs["bedrock"]
+    index.bedrock_agent_runtime = stubs["kb"]
+    index.s3_client = stubs["s3"]
+    return stubs
+
+
+IDENTICAL = False
+
+
+def make_event(i: int) -> Dict[str, Any]:
+    question = "기준금리 동결 배경은?" if IDENTICAL else f"기준금리 동결 배경은? #{i}"
+    return {"httpMethod": "POST", "path": "/chat", "body": json.dumps({"question": question})}
+
+
+def summarize(name: str, latencies: List[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{name:<8} requests={len(latencies):<4} wall={elapsed:6.2f}s  "
+          f"throughput={len(latencies) / elapsed:6.2f} req/s  "
+          f"p50={statistics.median(ordered) * 1000:7.0f}ms  p95={p95 * 1000:7.0f}ms")
+
+
+def run_lambda(n: int) -> None:
+    latencies = []
+    started = time.perf_counter()
+    for i in range(n):
+        t0 = time.perf_counter()
+        response = index.lambda_handler(make_event(i), None)
+        assert response["statusCode"] == 200, response
+        latencies.append(time.perf_counter() - t0)
+    summarize("lambda", latencies, time.perf_counter() - started)
+
+
+async def _asgi_request(i: int) -> float:
+    event = make_event(i)
+    body = event["body"].encode("utf-8")
+    scope = {"type": "http", "method": "POST", "path": "/chat", "headers": [(b"content-type", b"application/json")]}
+    sent: List[Dict[str, Any]] = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    t0 = time.perf_counter()
+    await server.app(scope, receive, send)
+    assert sent[0]["status"] == 200, sent
+    return time.perf_counter() - t0
+
+
+async def run_asgi(n: int) -> None:
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(_asgi_request(i) for i in range(n)))
+    summarize("asgi", list(latencies), time.perf_counter() - started)
+
+
+def run_batch(n: int) -> None:
+    questions = [json.loads(make_event(i)["body"])["question"] for i in range(n)]
+    event = {"httpMethod": "POST", "path": "/chat/batch", "body": json.dumps({"questions": questions})}
+    started = time.perf_counter()
+    response = index.lambda_handler(event, None)
+    elapsed = time.perf_counter() - started
+    assert response["statusCode"] == 200, response
+    body = json.loads(response["body"])
+    assert [item["index"] for item in body["results"]] == list(range(n))
+    # 배치는 모든 질문이 한 번에 끝나므로 항목별 지연 = 배치 전체 시간
+    summarize("batch", [elapsed] * n, elapsed)
+    print(f"{'':<8} batch stats: {body['stats']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Lambda 핸들러 vs ASGI 서버 부하 비교 (스텁 백엔드)")
+    ap.add_argument("--requests", type=int, default=50)
+    ap.add_argument("--invoke-latency", type=float, default=0.2, help="Bedrock invoke_model 지연(초)")
+    ap.add_argument("--retrieve-latency", type=float, default=0.1, help="KB retrieve 지연(초)")
+    ap.add_argument("--s3-latency", type=float, default=0.02, help="S3 get_object 지연(초)")
+    ap.add_argument("--identical", action="store_true", help="모든 요청에 같은 질문 사용")
+    ap.add_argument("--modes", default="lambda,asgi,batch", help="실행할 모드 (쉼표 구분)")
+    args = ap.parse_args()
+
+    global IDENTICAL
+    IDENTICAL = args.identical
+    index.logger.setLevel("CRITICAL")
+
+    runners = {
+        "lambda": lambda: run_lambda(args.requests),
+        "asgi": lambda: asyncio.run(run_asgi(args.requests)),
+        "batch": lambda: run_batch(args.requests),
+    }
+    for name in args.modes.split(","):
+        runner = runners[name.strip()]
+        # 모드마다 프로세스 전역 상태를 비워 앞선 모드의 응답·캐시를 재사용하지 않도록 함
+        index._s3_article_cache.clear()
+        singleflight._singleflight = None
+        idempotency._layer = None
+        answer_cache._answer_cache = None
+        session._session_store = None
+        stubs = install_stubs(args)
+        runner()
+        print(f"{'':<8} stub calls: bedrock={stubs['bedrock'].calls} kb={stubs['kb'].calls} s3={stubs['s3'].calls}")
+        print(f"{'':<8} single-flight: {singleflight.get_singleflight().stats()}")
+
+
+if __name__ == "__main__":
+    main()
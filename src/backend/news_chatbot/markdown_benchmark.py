@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+뉴스 마크다운 파싱 비교 (기존 필드별 정규식 vs news_markdown 한 번 훑기)
+
+큰 카테고리 파일 하나(--input, 없으면 --articles개 기사로 생성)를 두 방식으로 파싱해
+시간을 비교하고, 두 방식이 뽑은 메타데이터가 같은지 확인합니다.
+
+    parse  : 파일(bytes) 전체의 기사별 메타데이터 추출 (제목·발행일·기자·언론사·URL·요약)
+             기존 = 전체 디코딩 → `\n---\n` split → 기사마다 필드별 re.search, 새 방식 = parse_articles 한 번
+    lookup : find_best_matching_article 요청 한 번 (캐시된 파일에서 질문과 가장 맞는 기사 찾기)
+             기존 = 캐시된 파일 문자열을 요청마다 split·소문자 변환·정규식,
+             새 방식 = 캐시된 기사 레코드와 기사별 소문자 원문 사용
+
+기존 방식은 `**발행일:**` 표기만 읽으므로 생성 파일은 이 표기로 쓰고, 수집 도구별 출력처럼
+언론사는 빼고 기자(70%)·요약(50%)은 일부 기사에만 넣습니다 (없는 필드는 기존 방식이 본문 끝까지 검색).
+
+사용법 예)
+    # news_markdown 등 공유 모듈은 레이어(src/backend/common/layers/news_shared)에 있으므로 경로 지정
+    export PYTHONPATH=../common/layers/news_shared
+    python markdown_benchmark.py --articles 5000
+    aws s3 cp s3://seoul-economic-news-data-2025/news-data-md/2025/07/21/경제.md .
+    python markdown_benchmark.py --input 경제.md
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from news_markdown import NewsArticle, parse_articles
+
+SYLLABLES = "가나다라마바사아자차카타파하경제금리수출정부시장"
+FIELD_RES = {
+    "title": re.compile(r'###\s*\d+\.\s*(.+?)(?:\n|$)'),
+    "published": re.compile(r'\*\*발행일:\*\*\s*([^\n]+)'),
+    "author": re.compile(r'\*\*기자:\*\*\s*([^\n]+)'),
+    "media": re.compile(r'\*\*언론사:\*\*\s*([^\n]+)'),
+    "url": re.compile(r'\*\*URL:\*\*\s*([^\n\s]+)'),
+    "summary": re.compile(r'\*\*요약(?::\*\*|\*\*:)\s*([^\n]+)'),
+}
+
+
+def make_category_file(articles: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    word = lambda: "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    sentence = lambda: " ".join(word() for _ in range(rng.randint(6, 12))) + "다."
+    parts = [f"# 2025-07-21 경제 뉴스\n\n**총 기사 수**: {articles}개\n\n"]
+    for i in range(1, articles + 1):
+        # 수집 도구마다 있는 필드가 다름 (언론사 없음, 기자·요약은 있을 때만)
+        fields = [f"**발행일:** 2025-07-21T{i % 24:02d}:{i % 60:02d}:00.000+09:00",
+                  f"**URL:** https://www.sedaily.com/NewsView/{i}",
+                  "**카테고리:** 경제"]
+        if rng.random() < 0.7:
+            fields.append(f"**기자:** {word()} 기자")
+        if rng.random() < 0.5:
+            fields.append(f"**요약:** {sentence()}")
+        parts.append(
+            f"---\n### {i}. {' '.join(word() for _ in range(5))}\n\n" + "\n".join(fields) + "\n\n"
+            f"**내용:**\n{' '.join(sentence() for _ in range(rng.randint(15, 40)))}\n\n"
+        )
+    parts.append("---\n")
+    return "".join(parts).encode("utf-8")
+
+
+def legacy_fields(article: str) -> Dict[str, str]:
+    """기존 방식: 기사 블록을 필드마다 다시 검색"""
+    record = {}
+    for field, pattern in FIELD_RES.items():
+        m = pattern.search(article)
+        record[field] = m.group(1).strip() if m else ""
+    return record
+
+
+def legacy_parse(data: bytes) -> List[Dict[str, str]]:
+    content = data.decode("utf-8")
+    return [legacy_fields(article) for article in content.split("\n---\n")[1:] if article.strip()]
+
+
+def parser_parse(data: bytes) -> List[Dict[str, str]]:
+    return [{field: getattr(article, field) for field in FIELD_RES} for article in parse_articles(data)]
+
+
+def legacy_lookup(content: str, query: str) -> str:
+    """기존 find_best_matching_article: 요청마다 split 후 기사별 제목 검색 + 단어 겹침 + 필드 검색"""
+    query_words = set(query.lower().split())
+    best, best_relevance = "", 0.0
+    for article in content.split("\n---\n")[1:]:
+        m = FIELD_RES["title"].search(article)
+        title = m.group(1).strip() if m else ""
+        relevance = len(query_words & set(article.lower().split())) / len(query_words)
+        if any(word in title.lower() for word in query_words):
+            relevance += 0.3
+        if relevance > best_relevance:
+            best_relevance, best = relevance, legacy_fields(article)["title"]
+    return best
+
+
+def parser_lookup(articles: List[NewsArticle], texts: List[str], query: str) -> str:
+    """새 find_best_matching_article: 캐시된 레코드와 소문자 블록 원문으로 단어 겹침 계산"""
+    query_words = set(query.lower().split())
+    best, best_relevance = "", 0.0
+    for article, text in zip(articles, texts):
+        relevance = len(query_words & set(text.split())) / len(query_words)
+        if any(word in article.title.lower() for word in query_words):
+            relevance += 0.3
+        if relevance > best_relevance:
+            best_relevance, best = relevance, article.title
+    return best
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="뉴스 마크다운 파싱 비교 (필드별 정규식 vs 한 번 훑기)")
+    ap.add_argument("--input", help="비교할 카테고리 마크다운 파일 (없으면 생성)")
+    ap.add_argument("--articles", type=int, default=5000, help="생성할 기사 수")
+    ap.add_argument("--repeat", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    data = Path(args.input).read_bytes() if args.input else make_category_file(args.articles, args.seed)
+
+    legacy, parsed = legacy_parse(data), parser_parse(data)
+    mismatches = sum(1 for a, b in zip(legacy, parsed) if a != b) + abs(len(legacy) - len(parsed))
+    print(f"파일 {len(data) / 1e6:.1f}MB | 기사 {len(parsed)}개 | 메타데이터 불일치 {mismatches}건")
+
+    legacy_seconds = measure(lambda: legacy_parse(data), args.repeat)
+    parser_seconds = measure(lambda: parser_parse(data), args.repeat)
+    print(f"parse  기존 {legacy_seconds * 1000:8.1f}ms | 한 번 훑기 {parser_seconds * 1000:8.1f}ms "
+          f"({legacy_seconds / parser_seconds:.1f}배)")
+
+    # 캐시에 두는 값: 기존 = 디코딩한 파일 문자열, 새 방식 = 기사 레코드 + 기사별 소문자 블록 원문
+    content = data.decode("utf-8")
+    articles = parse_articles(data)
+    texts = [article.text(data).lower() for article in articles]
+    query = " ".join(articles[len(articles) // 2].title.split()[:2]) if articles else "경제"
+    assert legacy_lookup(content, query) == parser_lookup(articles, texts, query)
+    legacy_seconds = measure(lambda: legacy_lookup(content, query), args.repeat)
+    parser_seconds = measure(lambda: parser_lookup(articles, texts, query), args.repeat)
+    print(f"lookup 기존 {legacy_seconds * 1000:8.1f}ms | 한 번 훑기 {parser_seconds * 1000:8.1f}ms "
+          f"({legacy_seconds / parser_seconds:.1f}배, 요청 한 번 · 파싱 결과 캐시)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+CloudWatch Embedded Metric Format (EMF) 출력
+
+표준 출력에 EMF JSON 한 줄을 쓰면 Lambda 로그에서 CloudWatch 지표가 자동 추출됩니다.
+PutMetricData 호출(추가 지연·IAM 권한) 없이 지표를 내보내기 위해 사용합니다.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "NewsChatbot")
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+
+
+def put_metrics(values: Dict[str, float], dimensions: Optional[Dict[str, str]] = None,
+                unit: str = "Count", units: Optional[Dict[str, str]] = None) -> None:
+    """지표 값들을 EMF 레코드 하나로 출력합니다. units에 없는 지표는 unit을 사용합니다."""
+    if not METRICS_ENABLED or not values:
+        return
+
+    dimensions = dimensions or {}
+    units = units or {}
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [sorted(dimensions)] if dimensions else [[]],
+                "Metrics": [{"Name": name, "Unit": units.get(name, unit)} for name in values],
+            }],
+        },
+        **dimensions,
+        **values,
+    }
+    print(json.dumps(record, ensure_ascii=False), flush=True)
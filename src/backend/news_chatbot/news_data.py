@@ -0,0 +1,13 @@
+"""
+News Data Bucket
+
+news_fetcher가 카테고리 마크다운·최근 기사 벡터 계층·다이제스트·data-version.json 등을 쓰는
+S3 버킷입니다. 챗봇의 각 모듈은 이 값을 가져다 씁니다.
+
+배포 시 스택이 news_fetcher 스택의 데이터 버킷(seoul-economic-news-data-2025-{계정 ID})으로
+NEWS_DATA_BUCKET 환경 변수를 설정합니다. 기본값은 로컬 실행·도구용입니다.
+"""
+
+import os
+
+NEWS_DATA_BUCKET = os.environ.get("NEWS_DATA_BUCKET", "seoul-economic-news-data-2025")
@@ -0,0 +1,186 @@
+"""
+Answer Cache Pre-warming
+
+Knowledge Base 동기화가 끝나 데이터 버전이 바뀌면, 인기 질문을 처음 묻는 사용자가 전체 지연을
+부담하지 않도록 최근 질문 로그에서 많이 물은 질문을 골라 미리 답변을 만들어 캐시에 채웁니다.
+
+    news_fetcher ─(수집 작업 완료 확인, 데이터 버전 기록)─▶ {"action": "prewarm", "dataVersion": ...}
+
+1. 질문 로그(answer_cache.log_query가 출력하는 event=chat_query 줄)를 CloudWatch Logs Insights로
+   집계해 최근 PREWARM_LOOKBACK_HOURS시간 동안 많이 물은 정규화 질문 상위 PREWARM_TOP_K개를 고릅니다.
+2. PREWARM_MAX_WORKERS개 스레드로 질문마다 전체 파이프라인을 실행해 새 데이터 버전의 캐시에 저장합니다.
+3. invoke_claude가 보고하는 토큰 사용량을 Haiku 단가로 환산해 PREWARM_MAX_COST_USD에 도달하면
+   남은 질문은 시작하지 않습니다. 이미 실행 중인 질문은 끝까지 실행하므로 최대 (동시 실행 수 × 질문당 비용)
+   만큼 넘을 수 있습니다. Perplexity 호출 비용은 포함하지 않습니다.
+
+보고서의 projected_hit_rate는 조회 구간의 질문이 그대로 반복된다고 가정한 적중률이고,
+{"action": "prewarm_report"}는 해당 데이터 버전에서 실제로 관측된 적중률을 질문 로그로 집계합니다.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger()
+
+PREWARM_TOP_K = int(os.environ.get("PREWARM_TOP_K", "50"))
+PREWARM_LOOKBACK_HOURS = int(os.environ.get("PREWARM_LOOKBACK_HOURS", "24"))
+PREWARM_MAX_WORKERS = int(os.environ.get("PREWARM_MAX_WORKERS", "4"))
+PREWARM_MAX_COST_USD = float(os.environ.get("PREWARM_MAX_COST_USD", "1.0"))
+# 질문 로그가 기록되는 로그 그룹 (기본값: 이 Lambda 함수의 로그 그룹)
+QUERY_LOG_GROUP = os.environ.get(
+    "QUERY_LOG_GROUP", f"/aws/lambda/{os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'news-chatbot-handler')}"
+)
+
+# Claude 3 Haiku 온디맨드 단가 (USD / 1K 토큰)
+HAIKU_INPUT_USD_PER_1K = 0.00025
+HAIKU_OUTPUT_USD_PER_1K = 0.00125
+
+LOGS_QUERY_TIMEOUT_SECONDS = 60
+
+
+class SpendMeter:
+    """사전 적재 중 Haiku 토큰 사용량과 비용 누적"""
+
+    def __init__(self, max_cost_usd: float):
+        self.max_cost_usd = max_cost_usd
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+    @property
+    def cost_usd(self) -> float:
+        return (self.input_tokens * HAIKU_INPUT_USD_PER_1K + self.output_tokens * HAIKU_OUTPUT_USD_PER_1K) / 1000
+
+    def exhausted(self) -> bool:
+        return self.cost_usd >= self.max_cost_usd
+
+
+_current_meter: "contextvars.ContextVar[Optional[SpendMeter]]" = contextvars.ContextVar("prewarm_meter", default=None)
+
+
+def record_usage(input_tokens: int, output_tokens: int) -> None:
+    """사전 적재 중이면 Haiku 호출 토큰 사용량을 비용 한도 계산에 반영합니다."""
+    meter = _current_meter.get()
+    if meter is not None:
+        meter.add(input_tokens, output_tokens)
+
+
+def _run_insights_query(logs_client, query: str, hours: int) -> List[Dict[str, str]]:
+    """Logs Insights 쿼리를 실행하고 결과 행을 {필드: 값} 목록으로 반환합니다."""
+    end = int(time.time())
+    query_id = logs_client.start_query(
+        logGroupName=QUERY_LOG_GROUP,
+        startTime=end - hours * 3600,
+        endTime=end,
+        queryString=query,
+    )["queryId"]
+
+    deadline = time.time() + LOGS_QUERY_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        response = logs_client.get_query_results(queryId=query_id)
+        if response["status"] in ("Complete", "Failed", "Cancelled", "Timeout"):
+            if response["status"] != "Complete":
+                raise RuntimeError(f"Logs Insights query {response['status']}")
+            return [{field["field"]: field["value"] for field in row} for row in response["results"]]
+        time.sleep(1)
+    raise RuntimeError("Logs Insights query timed out")
+
+
+def mine_top_questions(logs_client, hours: int = PREWARM_LOOKBACK_HOURS,
+                       top_k: int = PREWARM_TOP_K) -> Tuple[List[Tuple[str, int]], int]:
+    """최근 hours시간 질문 로그에서 (정규화 질문, 질문 수) 상위 top_k개와 전체 질문 수를 반환합니다."""
+    rows = _run_insights_query(
+        logs_client,
+        'filter event = "chat_query" and ispresent(question) '
+        f'| stats count(*) as asked by question | sort asked desc | limit {top_k}',
+        hours,
+    )
+    totals = _run_insights_query(logs_client, 'filter event = "chat_query" | stats count(*) as total', hours)
+    total = int(totals[0]["total"]) if totals else 0
+    return [(row["question"], int(row["asked"])) for row in rows if row.get("question")], total
+
+
+def run_prewarm(questions: List[Tuple[str, int]], answer_fn: Callable[[str], Dict[str, Any]],
+                cache, s3_client, version: str, total_queries: int = 0,
+                max_workers: int = PREWARM_MAX_WORKERS,
+                max_cost_usd: float = PREWARM_MAX_COST_USD) -> Dict[str, Any]:
+    """
+    질문들의 답변을 만들어 version 캐시에 저장하고 보고서를 반환합니다.
+
+    Args:
+        questions: (질문, 조회 구간 질문 수) 목록. 많이 물은 순서대로 실행합니다.
+        total_queries: 조회 구간 전체 질문 수 (projected_hit_rate 계산용)
+    """
+    meter = SpendMeter(max_cost_usd)
+    outcomes: Dict[str, List[str]] = {"warmed": [], "cached": [], "skipped": [], "failed": []}
+    lock = threading.Lock()
+    started = time.time()
+
+    def warm(question: str) -> str:
+        if cache.store.get(cache.key(version, question)) is not None:
+            return "cached"
+        if meter.exhausted():
+            return "skipped"
+        _current_meter.set(meter)
+        try:
+            result = answer_fn(question)
+        except Exception as e:
+            logger.warning(f"Prewarm failed for '{question}': {e}")
+            return "failed"
+        return "warmed" if cache.put(s3_client, question, result, version=version) else "failed"
+
+    def run(question: str) -> None:
+        outcome = warm(question)
+        with lock:
+            outcomes[outcome].append(question)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for question, _ in questions:
+            executor.submit(contextvars.copy_context().run, run, question)
+
+    covered = set(outcomes["warmed"] + outcomes["cached"])
+    covered_queries = sum(count for question, count in questions if question in covered)
+    report = {
+        "data_version": version,
+        "candidates": len(questions),
+        "warmed": len(outcomes["warmed"]),
+        "already_cached": len(outcomes["cached"]),
+        "skipped_budget": len(outcomes["skipped"]),
+        "failed": len(outcomes["failed"]),
+        "input_tokens": meter.input_tokens,
+        "output_tokens": meter.output_tokens,
+        "cost_usd": round(meter.cost_usd, 4),
+        "max_cost_usd": max_cost_usd,
+        "elapsed_seconds": round(time.time() - started, 1),
+        "total_queries": total_queries,
+        "projected_hit_rate": round(covered_queries / total_queries, 4) if total_queries else 0.0,
+    }
+    logger.info(f"Prewarm report: {report}")
+    return report
+
+
+def observed_hit_rate(logs_client, version: str, hours: int = PREWARM_LOOKBACK_HOURS) -> Dict[str, Any]:
+    """질문 로그에서 version 데이터의 캐시 적중/실패 수와 적중률을 집계합니다."""
+    rows = _run_insights_query(
+        logs_client,
+        f'filter event = "chat_query" and data_version = "{version}" | stats count(*) as n by cache',
+        hours,
+    )
+    counts = {row["cache"]: int(row["n"]) for row in rows if row.get("cache")}
+    looked_up = counts.get("hit", 0) + counts.get("miss", 0)
+    return {
+        "data_version": version,
+        "hit": counts.get("hit", 0),
+        "miss": counts.get("miss", 0),
+        "hit_rate": round(counts.get("hit", 0) / looked_up, 4) if looked_up else 0.0,
+    }
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+프롬프트 기사 컨텍스트 크기 비교 (청크 원문 vs 요약 + 질문과 맞는 청크 문장)
+
+수집 시 요약(`**요약**:` 줄)이 기록된 news-data-md 마크다운 로컬 미러에서 기사를 뽑아,
+기사 제목을 질문으로 삼고 본문 중간 청크(700바이트)를 검색 결과로 가정해
+generate 단계 프롬프트의 기사 부분을 두 방식으로 만들어 비교합니다.
+
+--invoke를 주면 Bedrock Haiku를 실제로 호출해 입력 토큰 수와 응답 지연을 측정합니다.
+
+사용법 예)
+    # news_markdown 등 공유 모듈은 레이어(src/backend/common/layers/news_shared)에 있으므로 경로 지정
+    export PYTHONPATH=../common/layers/news_shared
+    aws s3 sync s3://seoul-economic-news-data-2025/news-data-md/2025/07/ corpus/ --exclude "*" --include "*.md"
+    python prompt_benchmark.py --input_dir corpus --samples 200
+    python prompt_benchmark.py --input_dir corpus --samples 40 --invoke
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+import index  # noqa: E402
+from news_markdown import iter_articles  # noqa: E402
+
+ARTICLES_PER_PROMPT = 5
+CHUNK_BYTES = 700
+
+
+def mid_article_chunk(body: str) -> str:
+    """본문을 CHUNK_BYTES 단위로 나눈 뒤 (가능하면) 두 번째 청크를 반환합니다."""
+    chunks, current, size = [], [], 0
+    for word in body.split():
+        size += len(word.encode("utf-8")) + 1
+        current.append(word)
+        if size >= CHUNK_BYTES:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append(" ".join(current))
+    return chunks[1] if len(chunks) > 1 else (chunks[0] if chunks else "")
+
+
+def load_samples(input_dir: Path, samples: int, seed: int) -> List[Dict[str, Any]]:
+    articles = []
+    for md_path in sorted(input_dir.rglob("*.md")):
+        data = md_path.read_bytes()
+        for article in iter_articles(data):
+            if not (article.title and article.summary and article.body_start is not None):
+                continue
+            articles.append({
+                "question": article.title,
+                "chunk": mid_article_chunk(article.body(data)),
+                "metadata": {
+                    "title": article.title,
+                    "date": article.date,
+                    "summary": article.summary,
+                },
+            })
+    random.Random(seed).shuffle(articles)
+    return articles[:samples]
+
+
+def build_prompt(question: str, contexts: List[str]) -> str:
+    articles_text = "\n\n".join(f"[기사 {i}]\n{context}" for i, context in enumerate(contexts, 1))
+    return f"사용자 질문: {question}\n\n검색된 뉴스 기사들:\n{articles_text}\n\n답변 작성:"
+
+
+def invoke(prompt: str) -> Dict[str, float]:
+    started = time.time()
+    response = index.bedrock_runtime.invoke_model(
+        modelId=index.CLAUDE_MODEL_ID,
+        body=json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 400,
+            "messages": [{"role": "user", "content": prompt}]
+        })
+    )
+    usage = json.loads(response["body"].read()).get("usage", {})
+    return {"input_tokens": usage.get("input_tokens", 0), "latency": time.time() - started}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="프롬프트 기사 컨텍스트 크기 비교 (청크 vs 요약)")
+    ap.add_argument("--input_dir", required=True, help="요약 줄이 포함된 news-data-md 마크다운 로컬 미러")
+    ap.add_argument("--samples", type=int, default=200, help="비교할 기사 수")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--invoke", action="store_true", help="Bedrock을 호출해 입력 토큰·지연 측정")
+    args = ap.parse_args()
+
+    articles = load_samples(Path(args.input_dir), args.samples, args.seed)
+    if not articles:
+        print("[오류] 요약 줄이 있는 기사를 찾지 못했습니다")
+        return
+
+    results = {"chunk": [], "summary": []}
+    for start in range(0, len(articles) - ARTICLES_PER_PROMPT + 1, ARTICLES_PER_PROMPT):
+        group = articles[start:start + ARTICLES_PER_PROMPT]
+        question = group[0]["question"]
+        prompts = {
+            "chunk": build_prompt(question, [article["chunk"] for article in group]),
+            "summary": build_prompt(question, [
+                index.build_article_context(question, article["chunk"], article["metadata"]) for article in group
+            ]),
+        }
+        for mode, prompt in prompts.items():
+            measured = {"chars": len(prompt)}
+            if args.invoke:
+                measured.update(invoke(prompt))
+            results[mode].append(measured)
+
+    print(f"기사 {len(articles)}개, 프롬프트 {len(results['chunk'])}개 (프롬프트당 기사 {ARTICLES_PER_PROMPT}개)")
+    for mode, rows in results.items():
+        line = f"{mode:<8} chars/prompt={statistics.mean(row['chars'] for row in rows):8.0f}"
+        if args.invoke:
+            line += (f"  input_tokens/prompt={statistics.mean(row['input_tokens'] for row in rows):7.0f}"
+                     f"  latency p50={statistics.median(row['latency'] for row in rows) * 1000:6.0f}ms")
+        print(line)
+    ratio = statistics.mean(r["chars"] for r in results["summary"]) / statistics.mean(r["chars"] for r in results["chunk"])
+    print(f"summary/chunk 프롬프트 크기 비율: {ratio:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Recent Articles Vector Tier
+
+news_fetcher가 매 실행 후 S3에 기록하는 최근 N일 기사 임베딩 아티팩트를
+/tmp에 내려받아 메모리 매핑하고, 고정 크기 행 블록 단위 행렬 곱으로 검색합니다.
+
+Knowledge Base 수집(ingestion)이 news_fetcher 실행보다 늦기 때문에 오늘/어제
+기사는 KB에 아직 없을 수 있습니다. 이 계층은 그 공백을 메우기 위해 KB 검색과
+함께 조회되고, 순위 기준(RRF)으로 KB 결과와 병합됩니다.
+
+아티팩트 구성 (s3://{NEWS_DATA_BUCKET}/{RECENT_INDEX_PREFIX}/)
+    embeddings.npy  : float16 (N, EMBEDDING_DIM) 행렬
+    metadata.json   : {"manifest": {...}, "records": [...]} – records[i]가 i번째 행에 대응
+
+두 파일은 따로 업로드되므로 news_fetcher가 manifest의 build_id를 embeddings.npy 객체 메타데이터
+(build-id)에도 기록합니다. 로딩 시 head_object로 확인한 ETag로 임베딩을 고정(IfMatch)해 받고 두 build_id가
+다르면(업로드 도중) 새 아티팩트를 쓰지 않고 기존 인덱스를 유지합니다.
+
+임베딩은 Knowledge Base와 같은 Bedrock 임베딩 모델(Titan Text Embeddings V2)로 만듭니다.
+news_fetcher/recent_index.py와 모델·차원이 같아야 하며, manifest의 embedder 값으로 확인합니다.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from news_data import NEWS_DATA_BUCKET
+
+logger = logging.getLogger()
+
+RECENT_INDEX_PREFIX = os.environ.get("RECENT_INDEX_PREFIX", "news-index/recent")
+RECENT_INDEX_ENABLED = os.environ.get("RECENT_INDEX_ENABLED", "true").lower() == "true"
+RECENT_INDEX_REFRESH_SECONDS = int(os.environ.get("RECENT_INDEX_REFRESH_SECONDS", "300"))
+RECENT_INDEX_MIN_SCORE = float(os.environ.get("RECENT_INDEX_MIN_SCORE", "0.25"))
+RECENT_INDEX_LOCAL_DIR = os.environ.get("RECENT_INDEX_LOCAL_DIR", "/tmp/recent_index")
+# 한 번에 float32로 올려 곱하는 행 수 (행렬 전체를 복사하지 않도록 블록 단위로 계산)
+RECENT_INDEX_BLOCK_ROWS = int(os.environ.get("RECENT_INDEX_BLOCK_ROWS", "4096"))
+
+# Knowledge Base 임베딩 모델과 동일 (news_fetcher/recent_index.py와 같아야 함)
+EMBEDDING_MODEL_ID = os.environ.get("RECENT_INDEX_EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0")
+EMBEDDING_DIM = int(os.environ.get("RECENT_INDEX_EMBEDDING_DIM", "1024"))
+EMBEDDER_NAME = f"bedrock:{EMBEDDING_MODEL_ID}:{EMBEDDING_DIM}"
+
+try:
+    import numpy as np
+except ImportError:  # numpy 레이어가 없는 배포에서는 계층 비활성화
+    np = None
+
+
+def embed_text(bedrock_client, text: str):
+    """Bedrock 임베딩 모델로 L2 정규화된 float32 벡터를 만듭니다."""
+    response = bedrock_client.invoke_model(
+        modelId=EMBEDDING_MODEL_ID,
+        body=json.dumps({"inputText": text, "dimensions": EMBEDDING_DIM, "normalize": True})
+    )
+    embedding = json.loads(response["body"].read())["embedding"]
+    return np.asarray(embedding, dtype=np.float32)
+
+
+class RecentArticleIndex:
+    """메모리 매핑된 최근 기사 임베딩 행렬과 병렬 메타데이터 배열"""
+
+    def __init__(self, embeddings, records: List[Dict[str, Any]], manifest: Dict[str, Any], etag: str = ""):
+        self.embeddings = embeddings
+        self.records = records
+        self.manifest = manifest
+        self.etag = etag
+
+    @classmethod
+    def load(cls, directory: str, etag: str = "", build_id: Optional[str] = None) -> "RecentArticleIndex":
+        embeddings = np.load(os.path.join(directory, "embeddings.npy"), mmap_mode="r")
+        with open(os.path.join(directory, "metadata.json"), encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        manifest = metadata.get("manifest", {})
+        records = metadata.get("records", [])
+        if manifest.get("embedder") != EMBEDDER_NAME or embeddings.shape[1] != EMBEDDING_DIM:
+            raise ValueError(f"Incompatible recent index embedder: {manifest.get('embedder')}")
+        if manifest.get("build_id") != build_id:
+            raise ValueError(
+                f"Recent index metadata build {manifest.get('build_id')} does not match embeddings build {build_id}"
+            )
+        if embeddings.shape[0] != len(records):
+            raise ValueError("Recent index embeddings and metadata are misaligned")
+        return cls(embeddings, records, manifest, etag)
+
+    def covers(self, target_years: Optional[List[str]]) -> bool:
+        """대상 연도가 이 계층의 날짜 범위와 겹치는지 확인합니다."""
+        if not target_years:
+            return True
+        min_year = str(self.manifest.get("min_date", ""))[:4]
+        max_year = str(self.manifest.get("max_date", ""))[:4]
+        return any(min_year <= str(year)[:4] <= max_year for year in target_years)
+
+    def scores(self, query_vector) -> "np.ndarray":
+        """
+        모든 행과 질문 벡터의 내적(코사인 유사도)을 계산합니다.
+
+        float16 행렬 곱은 BLAS 경로를 타지 않으므로 RECENT_INDEX_BLOCK_ROWS행씩만 float32로
+        올려 곱합니다. 메모리 매핑된 행렬 전체를 힙에 복사하지 않습니다.
+        """
+        scores = np.empty(len(self.records), dtype=np.float32)
+        for start in range(0, len(scores), RECENT_INDEX_BLOCK_ROWS):
+            block = self.embeddings[start:start + RECENT_INDEX_BLOCK_ROWS]
+            np.dot(block.astype(np.float32), query_vector, out=scores[start:start + len(block)])
+        return scores
+
+    def search(self, query_vector, top_k: int = 5, min_score: float = RECENT_INDEX_MIN_SCORE) -> List[Dict[str, Any]]:
+        """질문 벡터와 유사도가 높은 상위 top_k 결과를 반환합니다."""
+        if not self.records:
+            return []
+
+        scores = self.scores(query_vector)
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for row in top:
+            score = float(scores[row])
+            if score < min_score:
+                break
+            record = self.records[row]
+            results.append({
+                "content": {"text": record.get("text", "")},
+                "location": {"type": "S3", "s3Location": {"uri": record.get("s3_uri", "")}},
+                "metadata": {
+                    "title": record.get("title", ""),
+                    "date": record.get("date", ""),
+                    "url": record.get("url", ""),
+                    "category": record.get("category", ""),
+                    "source": "recent-index"
+                },
+                "score": score
+            })
+        return results
+
+
+_index: Optional[RecentArticleIndex] = None
+_last_checked = 0.0
+_lock = threading.Lock()
+
+
+def _download_artifact(s3_client, etag: str, build_id: Optional[str]) -> RecentArticleIndex:
+    """
+    S3 아티팩트를 임시 디렉터리에 받아 확인한 뒤 교체(rename)해 부분 파일 노출을 막습니다.
+
+    임베딩은 head_object에서 확인한 ETag로만 받고(IfMatch, 그 사이 바뀌면 412),
+    메타데이터의 build_id가 임베딩과 다르면 교체하지 않습니다.
+    """
+    staging_dir = f"{RECENT_INDEX_LOCAL_DIR}.staging"
+    os.makedirs(staging_dir, exist_ok=True)
+    response = s3_client.get_object(Bucket=NEWS_DATA_BUCKET, Key=f"{RECENT_INDEX_PREFIX}/embeddings.npy", IfMatch=etag)
+    with open(os.path.join(staging_dir, "embeddings.npy"), "wb") as f:
+        shutil.copyfileobj(response["Body"], f)
+    s3_client.download_file(NEWS_DATA_BUCKET, f"{RECENT_INDEX_PREFIX}/metadata.json",
+                            os.path.join(staging_dir, "metadata.json"))
+    index = RecentArticleIndex.load(staging_dir, etag, build_id)
+
+    # rename은 같은 inode를 옮기므로 이미 매핑한 행렬은 그대로 유효
+    os.makedirs(RECENT_INDEX_LOCAL_DIR, exist_ok=True)
+    for name in ("embeddings.npy", "metadata.json"):
+        os.replace(os.path.join(staging_dir, name), os.path.join(RECENT_INDEX_LOCAL_DIR, name))
+    return index
+
+
+def get_recent_index(s3_client) -> Optional[RecentArticleIndex]:
+    """최근 기사 인덱스를 지연 로딩합니다. RECENT_INDEX_REFRESH_SECONDS마다 S3 ETag로 갱신 여부를 확인합니다."""
+    global _index, _last_checked
+
+    if not RECENT_INDEX_ENABLED or np is None:
+        return None
+
+    now = time.time()
+    if _index is not None and now - _last_checked < RECENT_INDEX_REFRESH_SECONDS:
+        return _index
+
+    with _lock:
+        if _index is not None and now - _last_checked < RECENT_INDEX_REFRESH_SECONDS:
+            return _index
+        _last_checked = now
+        try:
+            head = s3_client.head_object(Bucket=NEWS_DATA_BUCKET, Key=f"{RECENT_INDEX_PREFIX}/embeddings.npy")
+            etag = head.get("ETag", "")
+            if _index is None or _index.etag != etag:
+                started = time.time()
+                _index = _download_artifact(s3_client, etag, head.get("Metadata", {}).get("build-id"))
+                logger.info(
+                    f"Loaded recent article index: {len(_index.records)} articles "
+                    f"({_index.manifest.get('min_date')}~{_index.manifest.get('max_date')}) "
+                    f"in {(time.time() - started) * 1000:.0f}ms"
+                )
+        except Exception as e:
+            logger.warning(f"Recent article index unavailable: {e}")
+    return _index
+
+
+def search_recent_articles(s3_client, bedrock_client, query: str, target_years: Optional[List[str]] = None,
+                           top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    최근 기사 계층을 검색합니다. 계층이 없거나 대상 연도와 겹치지 않으면 임베딩 모델을
+    호출하지 않고 빈 목록을 반환합니다.
+    """
+    index = get_recent_index(s3_client)
+    if index is None or not index.covers(target_years):
+        return []
+
+    try:
+        results = index.search(embed_text(bedrock_client, query), top_k=top_k)
+        logger.info(f"Recent article index returned {len(results)} results")
+        return results
+    except Exception as e:
+        logger.warning(f"Recent article index search failed: {e}")
+        return []
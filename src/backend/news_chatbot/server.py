@@ -0,0 +1,99 @@
+"""
+News Chatbot ASGI Server
+
+Lambda 밖에서 상시 트래픽을 처리하기 위한 ASGI 진입점입니다. Lambda 핸들러와 같은
+/chat, /health 라우트를 제공하며, 한 프로세스가 여러 요청을 동시에 처리합니다.
+
+- 요청은 스레드 풀(executor)에서 index.lambda_handler로 실행되므로 Bedrock, S3,
+  Perplexity 호출이 요청 간에 동시에 진행됩니다.
+- 캐시(S3 원본, 최근 기사/BM25 색인, 오타 교정 사전 등)와 연결 풀은 모듈 전역이므로
+  프로세스 내 모든 요청이 공유합니다.
+
+실행 예)
+    pip install -r requirements.txt -r requirements-server.txt
+    # news_markdown 등 공유 모듈은 레이어(src/backend/common/layers/news_shared)에 있으므로 경로 지정
+    export PYTHONPATH=../common/layers/news_shared
+    AWS_MAX_POOL_CONNECTIONS=64 uvicorn server:app --host 0.0.0.0 --port 8080
+"""
+
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import index
+
+logger = logging.getLogger()
+
+# 동시에 파이프라인을 실행할 최대 요청 수 (초과 요청은 대기)
+SERVER_MAX_CONCURRENCY = int(os.environ.get("SERVER_MAX_CONCURRENCY", "64"))
+
+_executor = ThreadPoolExecutor(max_workers=SERVER_MAX_CONCURRENCY, thread_name_prefix="chat")
+
+
+def build_event(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """ASGI HTTP scope를 API Gateway 프록시 이벤트 형식으로 변환합니다."""
+    headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+    return {
+        "httpMethod": scope.get("method", "POST"),
+        "path": scope.get("path", "/chat"),
+        "headers": headers,
+        "queryStringParameters": None,
+        "body": body.decode("utf-8") if body else None,
+    }
+
+
+def _response_headers(response: Dict[str, Any]) -> List[Tuple[bytes, bytes]]:
+    headers = response.get("headers") or {}
+    return [(key.lower().encode("latin-1"), str(value).encode("latin-1")) for key, value in headers.items()]
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    """ASGI 애플리케이션"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    event = build_event(scope, await _read_body(receive))
+    loop = asyncio.get_running_loop()
+    try:
+        response = await loop.run_in_executor(_executor, index.lambda_handler, event, None)
+    except Exception as e:
+        logger.error(f"Unhandled error in ASGI app: {str(e)}")
+        response = {
+            "statusCode": 500,
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps({"error": "서버 내부 오류가 발생했습니다", "type": "internal_error"}, ensure_ascii=False)
+        }
+
+    body = response.get("body") or ""
+    await send({
+        "type": "http.response.start",
+        "status": response.get("statusCode", 200),
+        "headers": _response_headers(response),
+    })
+    await send({"type": "http.response.body", "body": body.encode("utf-8")})
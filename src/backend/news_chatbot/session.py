@@ -0,0 +1,138 @@
+"""
+Session-scoped Retrieval Reuse
+
+/chat 요청에 sessionId가 있으면 직전 턴에서 확정한 출처와 기사 청크를 세션 저장소에 보관합니다.
+"그 기사에서 언급된 금리는?" 같은 후속 질문이 보관된 청크로 답할 수 있는 질문이면
+질문 분석·KB 검색·S3 원본 조회 없이 보관된 청크로 바로 답변을 생성합니다.
+
+저장소는 CHATBOT_STATE_TABLE(DynamoDB)이 설정되어 있으면 컨테이너 간에 공유하고, 아니면
+프로세스 내 저장소를 사용합니다. 세션 항목은 SESSION_TTL_SECONDS 후 만료됩니다.
+
+후속 질문 판정은 LLM 호출 없이 문자 bigram 겹침으로 계산합니다.
+  - 질문 내용어(조사·지시어 제외) bigram 중 보관 청크·제목에 등장하는 비율(coverage)이 SESSION_REUSE_MIN_COVERAGE 이상이면 재사용
+  - "그 기사", "해당", "방금" 같은 지시 표현이 있으면 더 낮은 기준(SESSION_REFERENCE_MIN_COVERAGE) 적용
+  - 보관 출처에 없는 연도를 질문이 명시하면 새 검색
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from bm25_index import tokenize
+from spell_corrector import WORD_RE, split_josa
+from stores import InMemoryStore, get_shared_store
+
+logger = logging.getLogger()
+
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", "1800"))
+SESSION_REUSE_MIN_COVERAGE = float(os.environ.get("SESSION_REUSE_MIN_COVERAGE", "0.6"))
+SESSION_REFERENCE_MIN_COVERAGE = float(os.environ.get("SESSION_REFERENCE_MIN_COVERAGE", "0.2"))
+
+# 세션에 보관할 청크 수와 청크당 최대 글자 수 (DynamoDB 항목 크기 제한 고려)
+SESSION_MAX_CHUNKS = 5
+SESSION_CHUNK_MAX_CHARS = 1500
+
+SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_\-]{1,128}$")
+REFERENCE_RE = re.compile(r"(그|해당|위|앞|방금|이전|아까)\s*(기사|뉴스|내용|보도|말한|언급)|거기|그럼|그러면|그중|그 중")
+YEAR_RE = re.compile(r"20\d{2}")
+
+# 후속 질문에서 내용어가 아닌 지시·질문 표현 (coverage 계산에서 제외)
+FOLLOW_UP_STOPWORDS = {
+    "그", "이", "저", "그럼", "그러면", "거기", "해당", "위", "앞서", "방금", "아까", "이전", "기사", "뉴스",
+    "내용", "보도", "언급된", "언급한", "말한", "나온", "나왔던", "관련", "대해", "대해서", "무엇", "뭐", "뭔가",
+    "어떻게", "어떤", "왜", "얼마", "얼마나", "알려줘", "알려주세요", "설명해줘", "자세히", "좀", "더",
+}
+
+
+def is_valid_session_id(session_id: Any) -> bool:
+    return isinstance(session_id, str) and bool(SESSION_ID_RE.match(session_id))
+
+
+def build_session_record(question: str, sources: List[Dict[str, Any]],
+                         chunks: List[Dict[str, str]]) -> Dict[str, Any]:
+    """직전 턴의 질문·출처·청크로 세션 항목을 만듭니다."""
+    return {
+        "question": question,
+        "sources": sources[:SESSION_MAX_CHUNKS],
+        "chunks": [
+            {"s3_uri": chunk.get("s3_uri", ""), "text": (chunk.get("text") or "")[:SESSION_CHUNK_MAX_CHARS]}
+            for chunk in chunks[:SESSION_MAX_CHUNKS]
+        ],
+        "updated_at": int(time.time()),
+    }
+
+
+def _content_terms(question: str) -> set:
+    stems = []
+    for token in WORD_RE.findall(question):
+        stem, _ = split_josa(token)
+        if token not in FOLLOW_UP_STOPWORDS and stem not in FOLLOW_UP_STOPWORDS:
+            stems.append(stem)
+    return set(tokenize(" ".join(stems)))
+
+
+def follow_up_coverage(question: str, record: Dict[str, Any]) -> float:
+    """질문 내용어 bigram 중 세션의 청크·제목에 등장하는 비율"""
+    terms = _content_terms(question)
+    if not terms:
+        return 0.0
+    context = " ".join(
+        [chunk.get("text", "") for chunk in record.get("chunks", [])]
+        + [source.get("title", "") for source in record.get("sources", [])]
+    )
+    context_terms = set(tokenize(context))
+    return len(terms & context_terms) / len(terms)
+
+
+def is_follow_up(question: str, record: Optional[Dict[str, Any]]) -> bool:
+    """세션에 보관된 청크만으로 답할 수 있는 후속 질문인지 판정합니다."""
+    if not record or not record.get("chunks"):
+        return False
+
+    source_dates = " ".join(source.get("date", "") for source in record.get("sources", []))
+    if any(year not in source_dates for year in YEAR_RE.findall(question)):
+        return False
+
+    coverage = follow_up_coverage(question, record)
+    threshold = SESSION_REFERENCE_MIN_COVERAGE if REFERENCE_RE.search(question) else SESSION_REUSE_MIN_COVERAGE
+    logger.info(f"Session follow-up coverage {coverage:.2f} (threshold {threshold})")
+    return coverage >= threshold
+
+
+class SessionStore:
+    """세션 ID → 직전 턴 컨텍스트 저장소"""
+
+    def __init__(self, store, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.store.get(f"session:{session_id}")
+        except Exception as e:
+            logger.warning(f"Session load failed for {session_id}: {e}")
+            return None
+
+    def save(self, session_id: str, record: Dict[str, Any]) -> None:
+        try:
+            self.store.put(f"session:{session_id}", record, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Session save failed for {session_id}: {e}")
+
+
+_session_store: Optional[SessionStore] = None
+_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """공유 테이블이 있으면 DynamoDB, 없으면 프로세스 내 저장소를 쓰는 세션 저장소"""
+    global _session_store
+
+    if _session_store is None:
+        with _lock:
+            if _session_store is None:
+                _session_store = SessionStore(get_shared_store() or InMemoryStore())
+    return _session_store
@@ -0,0 +1,192 @@
+"""
+Single-flight Request Coalescing
+
+속보 직후처럼 같은 질문이 동시에 몰릴 때, 같은 키의 요청 중 첫 요청(leader)만 분석·검색·생성을
+수행하고 나머지(follower)는 그 결과를 기다렸다가 공유합니다.
+
+- 프로세스 내 : 서버 모드·배치 처리에서 동시에 들어온 같은 질문을 스레드 간에 합칩니다.
+- 컨테이너 간 : CHATBOT_STATE_TABLE(DynamoDB)이 설정되어 있으면 조건부 쓰기 리스로 leader를
+  정하고, 다른 컨테이너의 follower는 결과 항목이 생길 때까지 폴링합니다. 리스가 만료되면
+  (leader 실패·타임아웃) follower가 직접 계산합니다.
+
+키는 정규화한 질문과 날짜 버킷(당일)으로 만듭니다. "오늘", "최근" 같은 상대 표현의 의미가
+날짜에 따라 달라지므로 날짜가 바뀌면 같은 질문이라도 합치지 않습니다.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from metrics import put_metrics
+from stores import get_shared_store
+
+logger = logging.getLogger()
+
+SINGLEFLIGHT_ENABLED = os.environ.get("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+# 컨테이너 간 리스 유지 시간 (leader가 이 시간 안에 끝내지 못하면 follower가 직접 계산)
+SINGLEFLIGHT_LEASE_SECONDS = int(os.environ.get("SINGLEFLIGHT_LEASE_SECONDS", "30"))
+# leader 결과를 공유 저장소에 남겨 두는 시간 (늦게 도착한 follower용)
+SINGLEFLIGHT_RESULT_TTL_SECONDS = int(os.environ.get("SINGLEFLIGHT_RESULT_TTL_SECONDS", "60"))
+SINGLEFLIGHT_POLL_SECONDS = float(os.environ.get("SINGLEFLIGHT_POLL_SECONDS", "0.25"))
+
+_PUNCT_RE = re.compile(r"[\s?!.,~…]+")
+
+
+def normalize_question(question: str) -> str:
+    """공백·문장부호·대소문자·유니코드 표기 차이를 없앤 질문 문자열"""
+    text = unicodedata.normalize("NFKC", question).lower()
+    return _PUNCT_RE.sub(" ", text).strip()
+
+
+def coalesce_key(question: str, now: Optional[datetime] = None) -> str:
+    """정규화한 질문 + 날짜 버킷으로 합치기 키를 만듭니다."""
+    bucket = (now or datetime.now()).strftime("%Y-%m-%d")
+    digest = hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()[:32]
+    return f"{bucket}:{digest}"
+
+
+class _Call:
+    """진행 중인 leader 계산"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """키별로 동시 계산을 하나로 합치는 실행기"""
+
+    def __init__(self, shared_store=None, lease_seconds: int = SINGLEFLIGHT_LEASE_SECONDS,
+                 result_ttl_seconds: int = SINGLEFLIGHT_RESULT_TTL_SECONDS,
+                 poll_seconds: float = SINGLEFLIGHT_POLL_SECONDS):
+        self.shared_store = shared_store
+        self.lease_seconds = lease_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.poll_seconds = poll_seconds
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leader": 0, "follower": 0, "remote_follower": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        같은 키의 계산이 진행 중이면 그 결과를, 아니면 fn()을 실행한 결과를 반환합니다.
+
+        Returns:
+            (결과, 다른 요청의 결과를 공유했는지 여부)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            self._record("follower")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result, shared = self._run_with_lease(key, fn)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        self._record("remote_follower" if shared else "leader")
+        return call.result, shared
+
+    def _run_with_lease(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """공유 저장소가 있으면 컨테이너 간 리스를 잡고 계산합니다."""
+        store = self.shared_store
+        if store is None:
+            return fn(), False
+
+        lease_key, result_key = f"sf:lease:{key}", f"sf:result:{key}"
+        try:
+            cached = store.get(result_key)
+            if cached is not None:
+                return cached, True
+            acquired = store.put_if_absent(lease_key, {"at": time.time()}, self.lease_seconds)
+        except Exception as e:
+            logger.warning(f"Single-flight lease unavailable, computing locally: {e}")
+            return fn(), False
+
+        if not acquired:
+            deadline = time.time() + self.lease_seconds
+            while time.time() < deadline:
+                time.sleep(self.poll_seconds)
+                try:
+                    cached = store.get(result_key)
+                    if cached is not None:
+                        return cached, True
+                    if store.get(lease_key) is None:
+                        break  # leader가 결과 없이 리스를 놓음 (실패)
+                except Exception as e:
+                    logger.warning(f"Single-flight poll failed, computing locally: {e}")
+                    break
+            return fn(), False
+
+        try:
+            result = fn()
+            try:
+                store.put(result_key, result, self.result_ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Single-flight result publish failed: {e}")
+            return result, False
+        finally:
+            try:
+                store.delete(lease_key)
+            except Exception as e:
+                logger.warning(f"Single-flight lease release failed: {e}")
+
+    def _record(self, role: str) -> None:
+        with self._lock:
+            self._stats[role] += 1
+        put_metrics({
+            "SingleFlightLeader": 1 if role == "leader" else 0,
+            "SingleFlightFollower": 1 if role == "follower" else 0,
+            "SingleFlightRemoteFollower": 1 if role == "remote_follower" else 0,
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        """누적 leader/follower 수와 합치기 비율 (합쳐진 요청 / 전체 요청)"""
+        with self._lock:
+            stats = dict(self._stats)
+        total = sum(stats.values())
+        coalesced = stats["follower"] + stats["remote_follower"]
+        stats["coalesce_ratio"] = round(coalesced / total, 4) if total else 0.0
+        return stats
+
+
+_singleflight: Optional[SingleFlight] = None
+_init_lock = threading.Lock()
+
+
+def get_singleflight() -> SingleFlight:
+    """프로세스 전역 SingleFlight 인스턴스를 지연 생성합니다."""
+    global _singleflight
+
+    if _singleflight is None:
+        with _init_lock:
+            if _singleflight is None:
+                _singleflight = SingleFlight(shared_store=get_shared_store())
+    return _singleflight
+
+
+def coalesce(question: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+    """질문 단위로 계산을 합칩니다. 비활성화되어 있으면 fn()을 그대로 실행합니다."""
+    if not SINGLEFLIGHT_ENABLED:
+        return fn(), False
+    return get_singleflight().do(coalesce_key(question), fn)
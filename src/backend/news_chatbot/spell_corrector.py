@@ -0,0 +1,298 @@
+"""
+Jamo-level SymSpell Spelling Corrector
+
+한글을 자모 단위로 분해한 뒤 SymSpell 방식의 삭제(deletion) 색인으로 오타를 교정합니다.
+어휘는 뉴스 코퍼스(기업명, 경제 용어, 인명 등)에서 오프라인으로 추출한 빈도 사전입니다.
+
+- 교정은 네트워크 호출 없이 1ms 미만에 끝나며, 신뢰도(confidence)를 함께 반환합니다.
+- 신뢰도가 낮을 때만 Perplexity 기반 교정(perplexity_spellfix)을 호출하도록 index.py에서 사용합니다.
+
+오프라인 어휘 구축 예)
+    python spell_corrector.py --input_dir corpus --output spell_vocab.json
+    aws s3 cp spell_vocab.json s3://seoul-economic-news-data-2025/news-index/spell/spell_vocab.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from news_data import NEWS_DATA_BUCKET
+
+logger = logging.getLogger()
+
+SPELL_VOCAB_KEY = os.environ.get("SPELL_VOCAB_KEY", "news-index/spell/spell_vocab.json")
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+# 어휘 파일이 없을 때 사용하는 기본 어휘
+SEED_VOCABULARY = {"삼성전자": 100, "금리": 100, "환율": 100, "부동산": 100, "주가": 100, "인플레이션": 100}
+
+# 어간 뒤에 붙는 조사 (긴 것부터 검사)
+JOSA_SUFFIXES = sorted([
+    "은", "는", "이", "가", "을", "를", "의", "에", "에서", "으로", "로", "와", "과", "도", "만",
+    "까지", "부터", "에게", "께서", "보다", "처럼", "이랑", "랑", "하고", "이나", "나", "이란", "란"
+], key=len, reverse=True)
+
+WORD_RE = re.compile(r"[0-9A-Za-z가-힣]+")
+
+# 교정하지 않는 서술어·요청 어미 ("알려줘"가 코퍼스의 "알려져"로 바뀌는 것을 막음)
+PREDICATE_SUFFIX_RE = re.compile(
+    r"(줘|세요|해요|어요|아요|예요|에요|나요|까요|가요|니까|는지|인지|인가|어때|할래|"
+    r"했어|됐어|있어|없어|였어|했나|됐나|있나|없나|했니|있니|이야|거야|뭐야|까|냐|죠)$"
+)
+
+# 교정하지 않는 의문사·요청 표현
+QUERY_WORDS = {
+    "어떻게", "어떤", "무엇", "무슨", "뭐", "왜", "언제", "누구", "얼마", "어디", "얼마나", "좀", "요즘", "최근",
+}
+
+# 두 글자 이하 어간의 편집거리 1 교정은 최선 후보 빈도가 다음 후보의 이 배수 이상일 때만 적용
+SHORT_STEM_MARGIN = float(os.environ.get("SPELL_SHORT_STEM_MARGIN", "3"))
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+             "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+             "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 낱자로 입력된 겹모음/겹받침도 키보드 입력 순서대로 분해
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 자모(초성·중성·종성) 문자열로 분해합니다. 그 외 문자는 소문자로 유지합니다."""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(CHOSEONG[code // 588])
+            out.append(JUNGSEONG[(code % 588) // 28])
+            out.append(JONGSEONG[code % 28])
+        else:
+            out.append(COMPOUND_JAMO.get(ch, ch.lower()))
+    return "".join(out)
+
+
+def split_josa(word: str) -> Tuple[str, str]:
+    """단어를 (어간, 조사)로 나눕니다. 어간이 두 글자 미만이 되면 나누지 않습니다."""
+    for suffix in JOSA_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)], suffix
+    return word, ""
+
+
+def _deletes(term: str, max_distance: int) -> Set[str]:
+    """term에서 문자를 최대 max_distance개 삭제한 문자열 집합 (자기 자신 포함)"""
+    results = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for candidate in frontier:
+            if len(candidate) <= 1:
+                continue
+            for i in range(len(candidate)):
+                deleted = candidate[:i] + candidate[i + 1:]
+                if deleted not in results:
+                    next_frontier.add(deleted)
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """인접 전치를 포함한 제한 편집거리(OSA). max_distance를 넘으면 max_distance + 1을 반환합니다."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(prev[j] + 1, current[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], prev2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, current
+    return prev[-1] if prev[-1] <= max_distance else max_distance + 1
+
+
+class SpellCorrection:
+    """질문 교정 결과"""
+
+    def __init__(self, text: str, confidence: float, corrections: List[Tuple[str, str]]):
+        self.text = text
+        self.confidence = confidence
+        self.corrections = corrections
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.corrections)
+
+    def __repr__(self) -> str:
+        return f"SpellCorrection({self.text!r}, confidence={self.confidence:.2f}, corrections={self.corrections})"
+
+
+class SymSpellCorrector:
+    """자모 단위 SymSpell 교정기"""
+
+    def __init__(self, vocabulary: Dict[str, int], max_edit_distance: int = MAX_EDIT_DISTANCE,
+                 prefix_length: int = PREFIX_LENGTH):
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.words: Dict[str, Tuple[str, int]] = {}   # 자모 문자열 → (원래 단어, 빈도)
+        self.deletes: Dict[str, List[str]] = {}       # 삭제 문자열 → 자모 문자열 목록
+
+        for word, count in vocabulary.items():
+            jamo = to_jamo(word)
+            if jamo in self.words and self.words[jamo][1] >= count:
+                continue
+            self.words[jamo] = (word, count)
+            for deleted in _deletes(jamo[:prefix_length], max_edit_distance):
+                self.deletes.setdefault(deleted, []).append(jamo)
+
+    def lookup(self, word: str) -> List[Tuple[str, int, int]]:
+        """단어의 교정 후보 (단어, 편집거리, 빈도)를 편집거리 오름차순·빈도 내림차순으로 반환합니다."""
+        jamo = to_jamo(word)
+        if jamo in self.words:
+            original, count = self.words[jamo]
+            return [(original, 0, count)]
+
+        # 짧은 단어는 편집거리 1만 허용해 과교정을 막음
+        max_distance = 1 if len(jamo) < 6 else self.max_edit_distance
+        candidates: Set[str] = set()
+        for deleted in _deletes(jamo[:self.prefix_length], max_distance):
+            candidates.update(self.deletes.get(deleted, ()))
+
+        suggestions = []
+        for candidate in candidates:
+            distance = edit_distance(jamo, candidate, max_distance)
+            if distance <= max_distance:
+                original, count = self.words[candidate]
+                suggestions.append((original, distance, count))
+
+        suggestions.sort(key=lambda item: (item[1], -item[2]))
+        return suggestions
+
+    def correct(self, text: str) -> SpellCorrection:
+        """
+        문장 단위 교정. 사전에 없는 한글 명사·개체 어간만 교정하며 조사는 원래대로 다시 붙입니다.
+        서술어·요청 어미로 끝나는 단어와 의문사는 교정하지 않고, 두 글자 이하 어간은 최선 후보의
+        빈도가 다음 후보보다 SHORT_STEM_MARGIN배 이상일 때만 교정합니다.
+
+        신뢰도는 교정한 단어들 중 가장 낮은 값이며, 단어별 신뢰도는
+        (1 - 편집거리 / 자모 길이) × (최선 후보 빈도 / 동일 거리 후보 빈도 합) 입니다.
+        """
+        corrections: List[Tuple[str, str]] = []
+        confidence = 1.0
+
+        def replace(match: "re.Match") -> str:
+            nonlocal confidence
+            token = match.group(0)
+            if not re.search(r"[가-힣]", token):
+                return token
+
+            stem, josa = split_josa(token)
+            if to_jamo(stem) in self.words or to_jamo(token) in self.words:
+                return token
+            if token in QUERY_WORDS or stem in QUERY_WORDS or PREDICATE_SUFFIX_RE.search(token):
+                return token
+
+            suggestions = self.lookup(stem)
+            if not suggestions:
+                return token
+
+            best, distance, count = suggestions[0]
+            if len(stem) <= 2 and len(suggestions) > 1 and count < SHORT_STEM_MARGIN * suggestions[1][2]:
+                return token
+            tied_total = sum(c for _, d, c in suggestions if d == distance)
+            token_confidence = (1 - distance / max(len(to_jamo(stem)), 1)) * (count / tied_total)
+            confidence = min(confidence, token_confidence)
+            corrections.append((stem, best))
+            return best + josa
+
+        corrected = WORD_RE.sub(replace, text)
+        return SpellCorrection(corrected, confidence if corrections else 1.0, corrections)
+
+
+# ---------------------------------------------------------------------------
+# Offline vocabulary build
+# ---------------------------------------------------------------------------
+
+def build_vocabulary(input_dir: Path, min_count: int = 5, max_words: int = 20000) -> Dict[str, int]:
+    """JSONL 코퍼스의 제목과 본문에서 한글 어간 빈도 사전을 만듭니다."""
+    counter: Counter = Counter()
+    for jsonl_path in sorted(input_dir.rglob("*.jsonl")):
+        with jsonl_path.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                text = f"{record.get('title') or ''} {record.get('chunk') or ''}"
+                for token in WORD_RE.findall(text):
+                    if re.search(r"[가-힣]", token):
+                        stem, _ = split_josa(token)
+                        if len(stem) >= 2:
+                            counter[stem] += 1
+
+    return {word: count for word, count in counter.most_common(max_words) if count >= min_count}
+
+
+# ---------------------------------------------------------------------------
+# Lambda-side loading
+# ---------------------------------------------------------------------------
+
+_corrector: Optional[SymSpellCorrector] = None
+_lock = threading.Lock()
+
+
+def get_corrector(s3_client) -> SymSpellCorrector:
+    """교정기를 지연 로딩합니다. 어휘 파일을 읽지 못하면 기본 어휘로 동작합니다."""
+    global _corrector
+
+    if _corrector is not None:
+        return _corrector
+
+    with _lock:
+        if _corrector is None:
+            vocabulary = dict(SEED_VOCABULARY)
+            try:
+                response = s3_client.get_object(Bucket=NEWS_DATA_BUCKET, Key=SPELL_VOCAB_KEY)
+                vocabulary.update(json.loads(response["Body"].read())["words"])
+            except Exception as e:
+                logger.warning(f"Spell vocabulary unavailable, using seed vocabulary: {e}")
+            _corrector = SymSpellCorrector(vocabulary)
+            logger.info(f"Loaded spell corrector: {len(_corrector.words)} words, {len(_corrector.deletes)} deletes")
+    return _corrector
+
+
+def main():
+    ap = argparse.ArgumentParser(description="news-data-md JSONL → 자모 SymSpell 어휘 사전 빌더")
+    ap.add_argument("--input_dir", required=True, help="news-data-md JSONL 로컬 미러 디렉터리")
+    ap.add_argument("--output", required=True, help="출력 어휘 JSON 경로")
+    ap.add_argument("--min_count", type=int, default=5)
+    ap.add_argument("--max_words", type=int, default=20000)
+    args = ap.parse_args()
+
+    vocabulary = build_vocabulary(Path(args.input_dir), args.min_count, args.max_words)
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps({"version": 1, "words": vocabulary}, ensure_ascii=False), encoding="utf-8")
+    print(f"[완료] {out_path} 생성: {len(vocabulary)}개 단어")
+
+
+if __name__ == "__main__":
+    main()
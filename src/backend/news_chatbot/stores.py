@@ -0,0 +1,116 @@
+"""
+Shared Key-Value Stores
+
+요청 간에 공유해야 하는 작은 상태(single-flight 리스, 세션, 답변 캐시 등)를 저장하는 저장소입니다.
+
+- InMemoryStore : 프로세스 내 저장소. 로컬 실행·서버 모드 단일 프로세스용이며 테스트용 가짜 저장소로도 씁니다.
+- DynamoDBStore : 컨테이너 간 공유 저장소. 파티션 키 "pk"(S) 하나와 TTL 속성 "expires_at"(N)을 쓰는 테이블.
+
+값은 JSON 직렬화 가능한 객체이며 모든 항목은 TTL을 가집니다. DynamoDB TTL 삭제는 지연되므로
+읽을 때 expires_at을 다시 확인합니다.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger()
+
+# 비어 있으면 DynamoDB를 쓰지 않고 프로세스 내 저장소만 사용
+CHATBOT_STATE_TABLE = os.environ.get("CHATBOT_STATE_TABLE", "")
+
+
+class InMemoryStore:
+    """TTL을 지원하는 스레드 안전 프로세스 내 저장소"""
+
+    def __init__(self):
+        self._items: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.time():
+                del self._items[key]
+                return None
+            return value
+
+    def put(self, key: str, value: Any, ttl_seconds: int) -> None:
+        with self._lock:
+            self._items[key] = (value, time.time() + ttl_seconds)
+
+    def put_if_absent(self, key: str, value: Any, ttl_seconds: int) -> bool:
+        """키가 없거나 만료된 경우에만 저장하고 True를 반환합니다."""
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[1] > now:
+                return False
+            self._items[key] = (value, now + ttl_seconds)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+
+class DynamoDBStore:
+    """DynamoDB 테이블 기반 공유 저장소"""
+
+    def __init__(self, table_name: str, dynamodb_resource=None):
+        if dynamodb_resource is None:
+            import boto3
+            dynamodb_resource = boto3.resource("dynamodb")
+        self.table_name = table_name
+        self.table = dynamodb_resource.Table(table_name)
+
+    def get(self, key: str) -> Optional[Any]:
+        response = self.table.get_item(Key={"pk": key}, ConsistentRead=True)
+        item = response.get("Item")
+        if not item or int(item.get("expires_at", 0)) <= time.time():
+            return None
+        return json.loads(item["value"])
+
+    def put(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self.table.put_item(Item={
+            "pk": key,
+            "value": json.dumps(value, ensure_ascii=False),
+            "expires_at": int(time.time() + ttl_seconds),
+        })
+
+    def put_if_absent(self, key: str, value: Any, ttl_seconds: int) -> bool:
+        """조건부 쓰기로 키가 없거나 만료된 경우에만 저장하고 True를 반환합니다."""
+        now = int(time.time())
+        try:
+            self.table.put_item(
+                Item={
+                    "pk": key,
+                    "value": json.dumps(value, ensure_ascii=False),
+                    "expires_at": now + ttl_seconds,
+                },
+                ConditionExpression="attribute_not_exists(pk) OR expires_at <= :now",
+                ExpressionAttributeValues={":now": now},
+            )
+            return True
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+
+    def delete(self, key: str) -> None:
+        self.table.delete_item(Key={"pk": key})
+
+
+def get_shared_store() -> Optional[DynamoDBStore]:
+    """CHATBOT_STATE_TABLE이 설정되어 있으면 DynamoDB 저장소를, 아니면 None을 반환합니다."""
+    if not CHATBOT_STATE_TABLE:
+        return None
+    try:
+        return DynamoDBStore(CHATBOT_STATE_TABLE)
+    except Exception as e:
+        logger.warning(f"Shared state table unavailable: {e}")
+        return None
@@ -0,0 +1,206 @@
+"""
+Pipeline Strategy Registry
+
+검색·생성 방식(전략)을 한 핸들러 안에 등록해 두고 요청마다 하나를 골라 실행합니다.
+핸들러 사본을 따로 재배포하며 비교하는 대신 운영 트래픽에서 전략별 지연·호출 수·토큰 사용량을 비교할 수 있습니다.
+
+전략은 질문을 받아 retrieveAndGenerate 형식 응답({"output": {"text"}, "citations": [...]})을 반환하는
+함수입니다. 출처 추출·날짜 필터링 등 후처리는 전략과 무관하게 공통으로 적용됩니다.
+
+전략 선택
+    - 요청 헤더 X-Chat-Strategy: 등록된 전략 이름이면 그 전략을 사용 (운영자 비교·디버깅용).
+      답변 캐시와 single-flight를 건너뛰므로 STRATEGY_OVERRIDE_TOKEN이 설정되어 있고
+      X-Chat-Strategy-Token 헤더가 일치할 때만 적용됩니다. 토큰이 없으면 헤더는 무시됩니다.
+    - STRATEGY_WEIGHTS: "orchestrated=90,manual_rag=10" 형식의 비율. 정규화한 질문의 해시로 나누므로
+      같은 질문은 항상 같은 전략으로 처리됩니다 (답변 캐시·single-flight와 일관성 유지).
+
+전략별 지표 (EMF, Strategy 차원)
+    StrategyRequests, StrategyErrors, StrategyLatency, ModelCalls, InputTokens, OutputTokens
+    Bedrock 관리형 retrieveAndGenerate는 토큰 사용량을 반환하지 않으므로 호출 수만 집계됩니다.
+"""
+
+import contextvars
+import hashlib
+import hmac
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from metrics import put_metrics
+from singleflight import normalize_question
+
+logger = logging.getLogger()
+
+STRATEGY_WEIGHTS = os.environ.get("STRATEGY_WEIGHTS", "orchestrated=100")
+STRATEGY_HEADER = "x-chat-strategy"
+STRATEGY_TOKEN_HEADER = "x-chat-strategy-token"
+# 비어 있으면 X-Chat-Strategy 헤더를 무시 (공개 호출자가 비싼 경로를 강제하지 못하도록)
+STRATEGY_OVERRIDE_TOKEN = os.environ.get("STRATEGY_OVERRIDE_TOKEN", "")
+# /health에 보고할 전략별 최근 지연 시간 표본 수
+STRATEGY_LATENCY_WINDOW = 500
+
+
+class _StrategyRun:
+    """전략 실행 하나 동안의 모델 호출 수·토큰 사용량"""
+
+    def __init__(self):
+        self.model_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self.model_calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+
+_current_run: "contextvars.ContextVar[Optional[_StrategyRun]]" = contextvars.ContextVar("strategy_run", default=None)
+
+
+def record_model_call(input_tokens: int = 0, output_tokens: int = 0) -> None:
+    """전략 실행 중이면 모델 호출 하나와 토큰 사용량을 기록합니다."""
+    run = _current_run.get()
+    if run is not None:
+        run.add(input_tokens, output_tokens)
+
+
+def parse_weights(spec: str) -> Dict[str, int]:
+    """"이름=비율,이름=비율" 문자열을 {이름: 비율}로 바꿉니다."""
+    weights = {}
+    for part in (spec or "").split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() and weight.strip().isdigit() and int(weight) > 0:
+            weights[name.strip()] = int(weight)
+    return weights
+
+
+class _StrategyStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.model_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latencies: Deque[float] = deque(maxlen=STRATEGY_LATENCY_WINDOW)
+
+
+class StrategyRegistry:
+    """이름 → 전략 함수 등록부와 트래픽 분배기"""
+
+    def __init__(self, weights_spec: str = STRATEGY_WEIGHTS):
+        self.weights_spec = weights_spec
+        self._strategies: Dict[str, Callable[[str], Dict[str, Any]]] = {}
+        self._stats: Dict[str, _StrategyStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, fn: Callable[[str], Dict[str, Any]]) -> None:
+        self._strategies[name] = fn
+        self._stats[name] = _StrategyStats()
+
+    def weights(self) -> Dict[str, int]:
+        """등록된 전략만 남긴 비율. 유효한 비율이 없으면 처음 등록한 전략 100%."""
+        weights = {name: weight for name, weight in parse_weights(self.weights_spec).items()
+                   if name in self._strategies}
+        if not weights and self._strategies:
+            weights = {next(iter(self._strategies)): 100}
+        return weights
+
+    def choose(self, question: str, headers: Optional[Dict[str, str]] = None) -> Tuple[str, bool]:
+        """
+        질문에 사용할 전략을 고릅니다.
+
+        Returns:
+            (전략 이름, 헤더로 지정되었는지 여부)
+        """
+        forced = self._forced_strategy(headers)
+        if forced:
+            return forced, True
+
+        weights = self.weights()
+        bucket = int(hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()[:8], 16)
+        point = bucket % sum(weights.values())
+        for name, weight in weights.items():
+            if point < weight:
+                return name, False
+            point -= weight
+        return next(iter(weights)), False
+
+    def _forced_strategy(self, headers: Optional[Dict[str, str]]) -> Optional[str]:
+        """운영자 토큰이 일치할 때만 X-Chat-Strategy 헤더의 전략을 반환합니다."""
+        if not STRATEGY_OVERRIDE_TOKEN:
+            return None
+        lowered = {header.lower(): value for header, value in (headers or {}).items()}
+        value = lowered.get(STRATEGY_HEADER)
+        if value not in self._strategies:
+            return None
+        token = lowered.get(STRATEGY_TOKEN_HEADER) or ""
+        if not hmac.compare_digest(token.encode("utf-8"), STRATEGY_OVERRIDE_TOKEN.encode("utf-8")):
+            logger.warning(f"X-Chat-Strategy 헤더 무시 (운영자 토큰 불일치): {value}")
+            return None
+        return value
+
+    def run(self, name: str, question: str) -> Dict[str, Any]:
+        """전략을 실행하고 지연·호출 수·토큰 사용량을 기록합니다."""
+        run = _StrategyRun()
+        token = _current_run.set(run)
+        started = time.time()
+        failed = False
+        try:
+            return self._strategies[name](question)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _current_run.reset(token)
+            latency_ms = (time.time() - started) * 1000
+            self._record(name, run, latency_ms, failed)
+
+    def _record(self, name: str, run: _StrategyRun, latency_ms: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats[name]
+            stats.requests += 1
+            stats.errors += int(failed)
+            stats.model_calls += run.model_calls
+            stats.input_tokens += run.input_tokens
+            stats.output_tokens += run.output_tokens
+            stats.latencies.append(latency_ms)
+        logger.info(
+            f"Strategy {name}: latency={latency_ms:.0f}ms model_calls={run.model_calls} "
+            f"input_tokens={run.input_tokens} output_tokens={run.output_tokens} failed={failed}"
+        )
+        put_metrics(
+            {
+                "StrategyRequests": 1,
+                "StrategyErrors": int(failed),
+                "StrategyLatency": latency_ms,
+                "ModelCalls": run.model_calls,
+                "InputTokens": run.input_tokens,
+                "OutputTokens": run.output_tokens,
+            },
+            dimensions={"Strategy": name},
+            units={"StrategyLatency": "Milliseconds"}
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """전략별 누적 요청·오류 수, 최근 지연 p50/p95, 요청당 평균 모델 호출·토큰 수"""
+        report = {"weights": self.weights(), "strategies": {}}
+        with self._lock:
+            for name, stats in self._stats.items():
+                latencies = sorted(stats.latencies)
+                requests = stats.requests or 1
+                report["strategies"][name] = {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "latency_p50_ms": round(statistics.median(latencies)) if latencies else None,
+                    "latency_p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]) if latencies else None,
+                    "model_calls_per_request": round(stats.model_calls / requests, 2),
+                    "input_tokens_per_request": round(stats.input_tokens / requests),
+                    "output_tokens_per_request": round(stats.output_tokens / requests),
+                }
+        return report
@@ -0,0 +1,75 @@
+"""
+Warm-up Event Handling
+
+EventBridge 예약 이벤트(keep-warm 핑)나 {"action": "warmup"} 직접 호출을 일반 /chat 요청으로
+처리하지 않고, 첫 실제 질문이 부담할 준비 작업만 미리 수행합니다.
+
+- AWS 클라이언트 생성과 Bedrock·S3 연결 풀 연결 (DNS 조회·TLS 핸드셰이크)
+- S3 보조 아티팩트 적재 (최근 기사 벡터 계층, BM25 색인, 오타 교정 어휘, 개체 확장 사전)
+- 오늘·어제 카테고리 다이제스트와 답변 캐시 데이터 버전 적재
+
+모델은 호출하지 않습니다. 단계별 소요 시간과 콜드 스타트의 모듈 초기화 시간을 보고해
+프로비저닝된 동시성 크기를 정하는 근거로 사용합니다.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from metrics import put_metrics
+
+logger = logging.getLogger()
+
+WARMUP_MAX_WORKERS = int(os.environ.get("WARMUP_MAX_WORKERS", "8"))
+
+
+def is_warmup_event(event: Dict[str, Any]) -> bool:
+    """keep-warm 핑(EventBridge 예약 이벤트) 또는 명시적 warm-up 호출인지 확인합니다."""
+    if event.get("action") == "warmup":
+        return True
+    return event.get("source") == "aws.events" and event.get("detail-type") == "Scheduled Event"
+
+
+def run_warmup(steps: Dict[str, Callable[[], Any]], init_ms: float, cold_start: bool) -> Dict[str, Any]:
+    """
+    준비 단계들을 병렬로 실행하고 보고서를 반환합니다. 실패한 단계는 오류만 기록합니다.
+
+    Args:
+        steps: 단계 이름 → 준비 함수. 반환값은 보고서의 해당 단계 detail로 들어갑니다.
+        init_ms: 모듈 초기화(임포트·클라이언트 생성) 소요 시간
+        cold_start: 이 실행 환경의 첫 이벤트인지 여부
+    """
+    started = time.time()
+
+    def timed(fn: Callable[[], Any]) -> Dict[str, Any]:
+        step_started = time.time()
+        try:
+            detail = fn()
+            outcome = {"ok": True}
+            if detail is not None:
+                outcome["detail"] = detail
+        except Exception as e:
+            outcome = {"ok": False, "error": str(e)}
+        outcome["ms"] = round((time.time() - step_started) * 1000)
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=WARMUP_MAX_WORKERS) as executor:
+        futures = {name: executor.submit(timed, fn) for name, fn in steps.items()}
+        results = {name: future.result() for name, future in futures.items()}
+
+    warmup_ms = round((time.time() - started) * 1000)
+    report = {
+        "cold_start": cold_start,
+        "init_ms": round(init_ms) if cold_start else 0,
+        "warmup_ms": warmup_ms,
+        "steps": results,
+    }
+    logger.info(f"Warm-up report: {report}")
+    put_metrics(
+        {"InitDuration": report["init_ms"], "WarmupDuration": warmup_ms},
+        dimensions={"ColdStart": str(cold_start).lower()},
+        unit="Milliseconds"
+    )
+    return report
@@ -23,6 +23,16 @@ const env = {
 const knowledgeBaseId =
   app.node.tryGetContext("knowledgeBaseId") || "PGQV3JXPET";
 
+// news_fetcher 데이터 버킷 (컨텍스트로 지정하지 않으면 스택 기본값 사용)
+const newsDataBucketName = app.node.tryGetContext("newsDataBucket");
+
+// 연도별 KB 샤드 맵 (선택). 예: -c knowledgeBaseShards='[{"knowledgeBaseId":"KB1","fromYear":2016,"toYear":2020}]'
+const knowledgeBaseShardsContext = app.node.tryGetContext("knowledgeBaseShards");
+const knowledgeBaseShards =
+  typeof knowledgeBaseShardsContext === "string"
+    ? JSON.parse(knowledgeBaseShardsContext)
+    : knowledgeBaseShardsContext;
+
 // 뉴스 챗봇 스택 생성
 const newsChatbotStack = new NewsChatbotStandaloneStack(
   app,
@@ -30,6 +40,8 @@ const newsChatbotStack = new NewsChatbotStandaloneStack(
   {
     env: env,
     knowledgeBaseId: knowledgeBaseId,
+    newsDataBucketName: newsDataBucketName,
+    knowledgeBaseShards: knowledgeBaseShards,
     description: "News Chatbot API using Bedrock Knowledge Base",
     stackName: "NewsChatbotStack",
   }
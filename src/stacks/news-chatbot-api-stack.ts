@@ -23,7 +23,7 @@ import * as apigateway from "aws-cdk-lib/aws-apigateway";
 import * as iam from "aws-cdk-lib/aws-iam";
 import * as lambda from "aws-cdk-lib/aws-lambda";
 import * as logs from "aws-cdk-lib/aws-logs";
-import { PythonFunction } from "@aws-cdk/aws-lambda-python-alpha";
+import { PythonFunction, PythonLayerVersion } from "@aws-cdk/aws-lambda-python-alpha";
 import { NagSuppressions } from "cdk-nag";
 import { Construct } from "constructs";
 import { CommonStack } from "./common-stack";
@@ -69,6 +69,12 @@ export class NewsChatbotApiStack extends Stack {
       },
     });
 
+    // src/backend/common/layers/news_shared (news_markdown 파서)
+    const newsSharedLayer = new PythonLayerVersion(this, "NewsSharedLayer", {
+      entry: path.join(__dirname, "../backend/common/layers/news_shared"),
+      compatibleRuntimes: [lambda.Runtime.PYTHON_3_11],
+    });
+
     // Lambda function for chatbot logic
     this.chatbotFunction = new PythonFunction(this, "ChatbotFunction", {
       entry: path.join(__dirname, "../backend/news_chatbot"),
@@ -89,6 +95,7 @@ export class NewsChatbotApiStack extends Stack {
       layers: [
         props.commonStack.LAYER_BOTO,
         props.commonStack.LAYER_POWERTOOLS,
+        newsSharedLayer,
       ],
       logRetention: logs.RetentionDays.ONE_WEEK,
     });
@@ -9,6 +9,7 @@
  * - Lambda Function: 챗봇 로직 처리
  * - API Gateway: REST API 엔드포인트
  * - IAM Role: Bedrock 및 S3 접근 권한
+ * - DynamoDB Table: 컨테이너 간 공유 상태 (멱등성·답변 캐시·세션·single-flight)
  * - CloudWatch Logs: 로깅
  */
 
@@ -22,17 +23,38 @@ import {
 } from "aws-cdk-lib";
 import * as apigateway from "aws-cdk-lib/aws-apigateway";
 import * as cloudfront from "aws-cdk-lib/aws-cloudfront";
+import * as dynamodb from "aws-cdk-lib/aws-dynamodb";
+import * as events from "aws-cdk-lib/aws-events";
+import * as targets from "aws-cdk-lib/aws-events-targets";
 import * as iam from "aws-cdk-lib/aws-iam";
 import * as lambda from "aws-cdk-lib/aws-lambda";
 import * as logs from "aws-cdk-lib/aws-logs";
 import * as s3 from "aws-cdk-lib/aws-s3";
 import * as s3deploy from "aws-cdk-lib/aws-s3-deployment";
-import { PythonFunction } from "@aws-cdk/aws-lambda-python-alpha";
+import { PythonFunction, PythonLayerVersion } from "@aws-cdk/aws-lambda-python-alpha";
 import { NagSuppressions } from "cdk-nag";
 import { Construct } from "constructs";
 
+/** 연도 구간 하나를 담당하는 Knowledge Base 샤드 (kb_shards.py) */
+export interface KnowledgeBaseShard {
+  readonly knowledgeBaseId: string;
+  readonly fromYear: number;
+  /** 생략하면 현재까지 열린 구간 */
+  readonly toYear?: number;
+}
+
 export interface NewsChatbotStandaloneStackProps extends StackProps {
   readonly knowledgeBaseId: string;
+  /**
+   * 연도별 Knowledge Base 샤드 맵. 지정하면 KNOWLEDGE_BASE_SHARDS 환경 변수를 설정하고
+   * 각 샤드 KB에 검색 권한을 부여합니다.
+   */
+  readonly knowledgeBaseShards?: KnowledgeBaseShard[];
+  /**
+   * news_fetcher가 기사·인덱스 아티팩트·data-version.json을 쓰는 버킷
+   * (기본값: seoul-economic-news-data-2025-{계정 ID}, NewsChatbotStack(news_fetcher 스택)의 데이터 버킷)
+   */
+  readonly newsDataBucketName?: string;
 }
 
 export class NewsChatbotStandaloneStack extends Stack {
@@ -47,6 +69,17 @@ export class NewsChatbotStandaloneStack extends Stack {
   ) {
     super(scope, id, props);
 
+    const newsDataBucketName =
+      props.newsDataBucketName ?? `seoul-economic-news-data-2025-${this.account}`;
+    const knowledgeBaseShards = props.knowledgeBaseShards ?? [];
+    const knowledgeBaseArns = [
+      props.knowledgeBaseId,
+      ...knowledgeBaseShards.map((shard) => shard.knowledgeBaseId),
+    ].map(
+      (knowledgeBaseId) =>
+        `arn:aws:bedrock:${this.region}:${this.account}:knowledge-base/${knowledgeBaseId}`
+    );
+
     // IAM Role for Lambda function to access Bedrock and S3
     const chatbotLambdaRole = new iam.Role(this, "ChatbotLambdaRole", {
       assumedBy: new iam.ServicePrincipal("lambda.amazonaws.com"),
@@ -67,7 +100,7 @@ export class NewsChatbotStandaloneStack extends Stack {
                 "bedrock:InvokeModel",
               ],
               resources: [
-                `arn:aws:bedrock:${this.region}:${this.account}:knowledge-base/${props.knowledgeBaseId}`,
+                ...knowledgeBaseArns,
                 "arn:aws:bedrock:*::foundation-model/*",
               ],
             }),
@@ -80,13 +113,39 @@ export class NewsChatbotStandaloneStack extends Stack {
               ],
               resources: [
                 "arn:aws:s3:::seoul-economic-news-data-2025/*",
+                `arn:aws:s3:::${newsDataBucketName}/*`,
+              ],
+            }),
+            // 답변 캐시 사전 적재: 질문 로그 집계 (CloudWatch Logs Insights)
+            new iam.PolicyStatement({
+              effect: iam.Effect.ALLOW,
+              actions: [
+                "logs:StartQuery",
+                "logs:GetQueryResults",
               ],
+              resources: ["*"],
             }),
           ],
         }),
       },
     });
 
+    // 챗봇과 데이터 전처리 도구가 함께 쓰는 모듈 (news_markdown 등)
+    const newsSharedLayer = new PythonLayerVersion(this, "NewsSharedLayer", {
+      entry: path.join(__dirname, "../backend/common/layers/news_shared"),
+      compatibleRuntimes: [lambda.Runtime.PYTHON_3_11],
+      description: "Shared news markdown parser",
+    });
+
+    // 컨테이너 간 공유 상태 저장소 (stores.py DynamoDBStore: 파티션 키 pk, TTL expires_at)
+    const stateTable = new dynamodb.Table(this, "ChatbotStateTable", {
+      partitionKey: { name: "pk", type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      timeToLiveAttribute: "expires_at",
+      removalPolicy: RemovalPolicy.DESTROY,
+    });
+    stateTable.grantReadWriteData(chatbotLambdaRole);
+
     // Lambda function for chatbot logic
     this.chatbotFunction = new PythonFunction(this, "ChatbotFunction", {
       entry: path.join(__dirname, "../backend/news_chatbot"),
@@ -102,10 +161,35 @@ export class NewsChatbotStandaloneStack extends Stack {
         KNOWLEDGE_BASE_ID: props.knowledgeBaseId,
         LOG_LEVEL: "INFO",
         PERPLEXITY_API_KEY: process.env.PERPLEXITY_API_KEY || "", // 환경 변수에서 가져오기
+        NEWS_DATA_BUCKET: newsDataBucketName,
+        CHATBOT_STATE_TABLE: stateTable.tableName,
+        ...(knowledgeBaseShards.length > 0
+          ? {
+              KNOWLEDGE_BASE_SHARDS: JSON.stringify(
+                knowledgeBaseShards.map((shard) => ({
+                  knowledge_base_id: shard.knowledgeBaseId,
+                  from_year: shard.fromYear,
+                  to_year: shard.toYear,
+                }))
+              ),
+            }
+          : {}),
       },
+      layers: [newsSharedLayer],
       logRetention: logs.RetentionDays.ONE_WEEK,
     });
 
+    // Keep-warm ping: 모델 호출 없이 클라이언트 연결·S3 인덱스만 준비 (warm-up 이벤트)
+    new events.Rule(this, "ChatbotWarmupRule", {
+      schedule: events.Schedule.rate(Duration.minutes(5)),
+      targets: [
+        new targets.LambdaFunction(this.chatbotFunction, {
+          event: events.RuleTargetInput.fromObject({ action: "warmup" }),
+        }),
+      ],
+      description: "Keep the chatbot Lambda warm and preload its S3 indexes",
+    });
+
     // API Gateway for REST API
     this.api = this.chatbotApi = new apigateway.RestApi(this, "ChatbotApi", {
       restApiName: "News Chatbot API",
@@ -132,6 +216,8 @@ export class NewsChatbotStandaloneStack extends Stack {
           "Authorization",
           "X-Api-Key",
           "X-Amz-Security-Token",
+          "Idempotency-Key",
+          "X-Request-Id",
         ],
       },
     });
@@ -148,6 +234,10 @@ export class NewsChatbotStandaloneStack extends Stack {
     const chatResource = this.chatbotApi.root.addResource("chat");
     chatResource.addMethod("POST", lambdaIntegration);
 
+    // Batch chat endpoint (여러 질문 일괄 처리)
+    const chatBatchResource = chatResource.addResource("batch");
+    chatBatchResource.addMethod("POST", lambdaIntegration);
+
     // Health check endpoint
     const healthResource = this.chatbotApi.root.addResource("health");
     healthResource.addMethod("GET", lambdaIntegration);
@@ -241,6 +331,13 @@ export class NewsChatbotStandaloneStack extends Stack {
       },
     ]);
 
+    NagSuppressions.addResourceSuppressions(stateTable, [
+      {
+        id: "AwsSolutions-DDB3",
+        reason: "The table only holds short-lived request state with TTL; point-in-time recovery is not needed",
+      },
+    ]);
+
     NagSuppressions.addResourceSuppressions(this.chatbotApi, [
       {
         id: "AwsSolutions-APIG2",